@@ -0,0 +1,211 @@
+"""
+Offline benchmark of the department agent pipeline.
+
+Runs the compiled department agent with the scripted fake model
+(src/agents/fake_llm.py) instead of Gemini, against the database in
+DATABASE_URL, and splits the time of every run into:
+  model   time inside model calls, i.e. the scripted latency plus LangChain's model wrapper
+  tools   time inside tool calls, including their database queries
+  db      database time of the queries the tools ran
+  graph   everything else: LangGraph scheduling, state merging, callbacks
+
+Run from backend/ against a local database (benchmarks.generate_data):
+  python -m benchmarks.bench_agent --runs 200
+  python -m benchmarks.bench_agent --latency-ms 800 --concurrency 20 --runs 400
+  python -m benchmarks.bench_agent --no-tool-cache --question "list all departments"
+  python -m benchmarks.bench_agent --baseline benchmarks/baselines/agent.json
+
+To load test /api/agent/query offline, start the server with AGENT_LLM=fake
+(and AGENT_FAKE_LLM_LATENCY_MS) and run benchmarks.load_test.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+from uuid import UUID
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.messages import HumanMessage
+from src.config.settings import settings
+
+settings.AGENT_LLM = "fake"
+
+from src.agents.department_agent import get_department_agent, get_llm  # noqa: E402
+from src.config.database import connect_db, disconnect_db  # noqa: E402
+from src.utils.query_stats import track_queries  # noqa: E402
+from src.utils.tool_cache import tool_cache  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+PARTS = ("total", "model", "tools", "db", "graph")
+
+
+class Timings(AsyncCallbackHandler):
+    """Wall time spent in model and tool calls of one run"""
+
+    def __init__(self):
+        self.model_ms = 0.0
+        self.tool_ms = 0.0
+        self.model_calls = 0
+        self.tool_calls = 0
+        self._started: Dict[UUID, float] = {}
+
+    def _stop(self, run_id: UUID) -> float:
+        started = self._started.pop(run_id, None)
+        return (time.perf_counter() - started) * 1000 if started is not None else 0.0
+
+    async def on_chat_model_start(self, serialized: Any, messages: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    async def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self.model_ms += self._stop(run_id)
+        self.model_calls += 1
+
+    async def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self.model_ms += self._stop(run_id)
+
+    async def on_tool_start(self, serialized: Any, input_str: str, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    async def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self.tool_ms += self._stop(run_id)
+        self.tool_calls += 1
+
+    async def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self.tool_ms += self._stop(run_id)
+
+
+async def run_once(agent: Any, question: str) -> Dict[str, float]:
+    timings = Timings()
+    with track_queries() as stats:
+        started = time.perf_counter()
+        await agent.ainvoke({"messages": [HumanMessage(content=question)]}, config={"callbacks": [timings]})
+        total = (time.perf_counter() - started) * 1000
+    return {
+        "total": total,
+        "model": timings.model_ms,
+        "tools": timings.tool_ms,
+        "db": stats.db_ms,
+        "graph": total - timings.model_ms - timings.tool_ms,
+        "model_calls": timings.model_calls,
+        "tool_calls": timings.tool_calls,
+        "queries": stats.queries,
+    }
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    return {
+        "mean": round(statistics.fmean(ordered), 3),
+        "p50": round(ordered[len(ordered) // 2], 3),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+    }
+
+
+async def run(questions: List[str], runs: int, concurrency: int, warmup: int) -> Dict[str, Any]:
+    await connect_db()
+    try:
+        started_build = time.perf_counter()
+        agent = get_department_agent()
+        build_ms = (time.perf_counter() - started_build) * 1000
+
+        for i in range(warmup):
+            await run_once(agent, questions[i % len(questions)])
+
+        samples: List[Dict[str, float]] = []
+        limit = asyncio.Semaphore(concurrency)
+
+        async def one(i: int) -> None:
+            async with limit:
+                samples.append(await run_once(agent, questions[i % len(questions)]))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(runs)))
+        elapsed = time.perf_counter() - started
+    finally:
+        await disconnect_db()
+
+    return {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "questions": questions,
+        "runs": runs,
+        "concurrency": concurrency,
+        "latency_ms": get_llm().latency_ms,
+        "tool_cache": tool_cache.ttl > 0,
+        "build_ms": round(build_ms, 3),
+        "runs_per_sec": round(runs / elapsed, 2),
+        "per_run_ms": {part: _summary([sample[part] for sample in samples]) for part in PARTS},
+        "per_run": {
+            key: round(statistics.fmean(sample[key] for sample in samples), 2)
+            for key in ("model_calls", "tool_calls", "queries")
+        },
+    }
+
+
+def report(result: Dict[str, Any]) -> str:
+    lines = [
+        f"{result['runs']} runs, concurrency {result['concurrency']}, model latency {result['latency_ms']} ms, "
+        f"tool cache {'on' if result['tool_cache'] else 'off'}",
+        f"agent built in {result['build_ms']:.1f} ms, {result['runs_per_sec']:.1f} runs/s, per run "
+        + ", ".join(f"{value} {key.replace('_', ' ')}" for key, value in result["per_run"].items()),
+        "",
+        f"  {'ms per run':<10} {'mean':>10} {'p50':>10} {'p95':>10}",
+    ]
+    for part in PARTS:
+        stats = result["per_run_ms"][part]
+        lines.append(f"  {part:<10} {stats['mean']:>10.2f} {stats['p50']:>10.2f} {stats['p95']:>10.2f}")
+    return "\n".join(lines)
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    lines = []
+    for part in PARTS:
+        before = baseline.get("per_run_ms", {}).get(part)
+        if not before:
+            continue
+        now = result["per_run_ms"][part]
+        lines.append(f"  {part:<10} p50 {before['p50']:>8.2f} -> {now['p50']:>8.2f} ms   "
+                     f"p95 {before['p95']:>8.2f} -> {now['p95']:>8.2f} ms")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Scripted model latency per call")
+    parser.add_argument("--question", action="append", help="Questions to cycle through (default: list and help)")
+    parser.add_argument("--no-tool-cache", action="store_true", help="Let every tool call reach the database")
+    parser.add_argument("--out", help="Result path (default benchmarks/results/agent-<time>.json)")
+    parser.add_argument("--baseline", help="Compare against this saved result")
+    parser.add_argument("--save-baseline", help="Also save this result as a baseline at this path")
+    args = parser.parse_args()
+
+    settings.AGENT_FAKE_LLM_LATENCY_MS = args.latency_ms
+    if args.no_tool_cache:
+        tool_cache.ttl = 0
+    questions = args.question or ["List all departments", "What can you do?"]
+    result = asyncio.run(run(questions, args.runs, args.concurrency, args.warmup))
+    print(report(result))
+
+    out = args.out or os.path.join(RESULTS_DIR, f"agent-{result['started_at'].replace(':', '')}.json")
+    for path in filter(None, (out, args.save_baseline)):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(result, f, indent=2)
+    print(f"\n📄 {out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"\nAgainst {args.baseline} ({baseline.get('started_at')}):")
+        print("\n".join(compare(result, baseline)) or "  nothing in common")
+
+
+if __name__ == "__main__":
+    main()
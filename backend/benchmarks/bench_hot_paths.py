@@ -0,0 +1,380 @@
+"""
+Microbenchmarks for the pure-Python hot paths of the services.
+
+Each case runs real service code against in-memory Prisma rows (a fake
+client answers find_many), so the numbers cover only the Python work:
+  parse_time_to_period      ScheduleService._parse_time_to_period, per batch of times
+  timetable_fill            ScheduleService.get_full_timetable grid fill
+  student_attendance_stats  AttendanceService.get_all_students_attendance aggregation
+  teacher_attendance_stats  AttendanceService.get_all_teachers_attendance aggregation
+  response_validation       FastAPI-style validate + dump of List[StudentAttendanceRead]
+  response_fast_path        the same rows through serialization.dumps
+
+Reports ops/sec and peak allocated memory per operation, and stores every
+run in benchmarks/results/ so optimizations can be compared over time.
+
+Run from backend/:
+  python -m benchmarks.bench_hot_paths
+  python -m benchmarks.bench_hot_paths --case timetable_fill --sizes 100,1000
+  python -m benchmarks.bench_hot_paths --save-baseline benchmarks/baselines/hot_paths.json
+  python -m benchmarks.bench_hot_paths --baseline benchmarks/baselines/hot_paths.json
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Union
+from prisma.models import ClassSession, Course, Enrollment, Schedule, Student, StudentAttendance, Teacher, \
+    TeacherAttendance, User
+from src.models.schemas import StudentAttendanceRead
+from src.services.attendance_service import AttendanceService
+from src.services.schedule_service import ScheduleService
+from src.utils.serialization import adapter_for, dumps
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+COURSES_PER_STUDENT = 5
+SESSIONS_PER_COURSE = 15
+COURSES_PER_TEACHER = 3
+STUDENTS_PER_COURSE = 60
+DAYS = ["MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY"]
+TIMES = ["09:00", "10:00", "11:15", "1:30 PM", "02:30 PM", "12:00 PM", "8:00 AM", "not a time"]
+STATUSES = ["PRESENT", "PRESENT", "PRESENT", "LATE", "ABSENT"]
+
+NOW = datetime(2025, 1, 6, 9, 0)
+
+Op = Callable[[], Union[Any, Awaitable[Any]]]
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+# Rows are built with model_construct: the services only read attributes,
+# and validating a million nested rows would dominate the setup time.
+
+class _Delegate:
+    def __init__(self, rows: List[Any]):
+        self.rows = rows
+
+    async def find_many(self, **kwargs: Any) -> List[Any]:
+        return self.rows
+
+
+class FakeDb:
+    """Stands in for Prisma; reader_for returns any non-shared client unchanged"""
+
+    def __init__(self, **delegates: List[Any]):
+        for name, rows in delegates.items():
+            setattr(self, name, _Delegate(rows))
+
+
+def _user(i: int, role: str) -> User:
+    return User.model_construct(
+        id=f"usr{i:08d}", email=f"user{i}@college.edu", password="x", role=role,
+        name=f"User {i}", createdAt=NOW, updatedAt=NOW
+    )
+
+
+def _course(i: int, teacher_id: Optional[str] = None, **relations: Any) -> Course:
+    return Course.model_construct(
+        id=f"crs{i:06d}", courseCode=f"CS{i:04d}", courseName=f"Course {i}", credits=4,
+        semester=i % 8 + 1, departmentId="dep000", teacherId=teacher_id, isActive=True,
+        createdAt=NOW, updatedAt=NOW, **relations
+    )
+
+
+def _teacher(i: int, **relations: Any) -> Teacher:
+    return Teacher.model_construct(
+        id=f"tch{i:06d}", userId=f"usr{i:08d}", teacherId=f"TCH{i:04d}", department="CSE",
+        designation="Professor", createdAt=NOW, updatedAt=NOW, user=_user(i, "TEACHER"), **relations
+    )
+
+
+def _session(i: int, course_id: str, teacher_id: str) -> ClassSession:
+    return ClassSession.model_construct(
+        id=f"ses{i:08d}", courseId=course_id, teacherId=teacher_id, date=NOW + timedelta(days=i % 90),
+        startTime="09:00", endTime="10:00", status="CONDUCTED", createdAt=NOW, updatedAt=NOW
+    )
+
+
+def schedules(n: int) -> List[Schedule]:
+    teacher = _teacher(0)
+    courses = [_course(i) for i in range(40)]
+    return [
+        Schedule.model_construct(
+            id=f"sch{i:08d}", courseId=courses[i % 40].id, teacherId=teacher.id, dayOfWeek=DAYS[i % 5],
+            startTime=TIMES[i % 6], endTime="10:00", room=f"R{i % 30}", type="LECTURE", isActive=True,
+            effectiveFrom=NOW, createdAt=NOW, updatedAt=NOW, course=courses[i % 40], teacher=teacher
+        )
+        for i in range(n)
+    ]
+
+
+def students_with_attendance(n: int) -> List[Student]:
+    courses = [_course(i) for i in range(COURSES_PER_STUDENT * 8)]
+    rows = []
+    for i in range(n):
+        taken = [courses[(i + k) % len(courses)] for k in range(COURSES_PER_STUDENT)]
+        attendances = [
+            StudentAttendance.model_construct(
+                id=f"sat{i:07d}{k:03d}", sessionId=f"ses{k:08d}", studentId=f"stu{i:08d}",
+                courseId=course.id, status=STATUSES[(i + k) % len(STATUSES)], markedById="tch000000",
+                markedAt=NOW, updatedAt=NOW, course=course,
+                session=_session(k, course.id, "tch000000")
+            )
+            for k, course in enumerate(c for c in taken for _ in range(SESSIONS_PER_COURSE))
+        ]
+        enrollments = [
+            Enrollment.model_construct(
+                id=f"enr{i:07d}{k}", studentId=f"stu{i:08d}", courseId=course.id, status="ACTIVE",
+                enrolledAt=NOW, createdAt=NOW, updatedAt=NOW, course=course
+            )
+            for k, course in enumerate(taken)
+        ]
+        rows.append(Student.model_construct(
+            id=f"stu{i:08d}", userId=f"usr{i:08d}", studentId=f"ST{i:07d}", department="CSE",
+            semester=i % 8 + 1, batch="2024", createdAt=NOW, updatedAt=NOW, user=_user(i, "STUDENT"),
+            attendances=attendances, enrollments=enrollments
+        ))
+    return rows
+
+
+def teachers_with_attendance(n: int) -> List[Teacher]:
+    enrollments = [
+        Enrollment.model_construct(
+            id=f"enr{k:07d}", studentId=f"stu{k:08d}", courseId="", status="ACTIVE",
+            enrolledAt=NOW, createdAt=NOW, updatedAt=NOW
+        )
+        for k in range(STUDENTS_PER_COURSE)
+    ]
+    rows = []
+    for i in range(n):
+        teacher_id = f"tch{i:06d}"
+        courses = [
+            _course(i * COURSES_PER_TEACHER + k, teacher_id, enrollments=enrollments)
+            for k in range(COURSES_PER_TEACHER)
+        ]
+        attendances = [
+            TeacherAttendance.model_construct(
+                id=f"tat{i:06d}{k:04d}", sessionId=f"ses{k:08d}", teacherId=teacher_id, courseId=course.id,
+                status=STATUSES[k % len(STATUSES)], markedById="adm000", markedAt=NOW, updatedAt=NOW,
+                course=course, session=_session(k, course.id, teacher_id)
+            )
+            for k, course in enumerate(c for c in courses for _ in range(SESSIONS_PER_COURSE))
+        ]
+        rows.append(_teacher(i, teacherAttendances=attendances, coursesTeaching=courses))
+    return rows
+
+
+def attendance_rows(n: int) -> List[StudentAttendance]:
+    """Student attendance with the relations the list endpoints include"""
+    teacher = _teacher(0)
+    courses = [_course(i) for i in range(20)]
+    students = [
+        Student.model_construct(
+            id=f"stu{i:08d}", userId=f"usr{i:08d}", studentId=f"ST{i:07d}", department="CSE",
+            semester=3, batch="2024", createdAt=NOW, updatedAt=NOW, user=_user(i, "STUDENT")
+        )
+        for i in range(100)
+    ]
+    return [
+        StudentAttendance.model_construct(
+            id=f"sat{i:010d}", sessionId=f"ses{i % 500:08d}", studentId=students[i % 100].id,
+            courseId=courses[i % 20].id, status=STATUSES[i % len(STATUSES)], markedById=teacher.id,
+            markedAt=NOW, updatedAt=NOW, student=students[i % 100], course=courses[i % 20],
+            markedBy=teacher, session=_session(i % 500, courses[i % 20].id, teacher.id)
+        )
+        for i in range(n)
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Cases
+# ---------------------------------------------------------------------------
+
+def parse_time_to_period(size: int) -> Op:
+    service = ScheduleService(FakeDb())
+    times = [TIMES[i % len(TIMES)] for i in range(size)]
+
+    def op():
+        for value in times:
+            service._parse_time_to_period(value)
+    return op
+
+
+def timetable_fill(size: int) -> Op:
+    service = ScheduleService(FakeDb(schedule=schedules(size)))
+    return service.get_full_timetable
+
+
+def student_attendance_stats(size: int) -> Op:
+    db = FakeDb(student=students_with_attendance(size))
+    return lambda: AttendanceService.get_all_students_attendance(db)
+
+
+def teacher_attendance_stats(size: int) -> Op:
+    db = FakeDb(teacher=teachers_with_attendance(size))
+    return lambda: AttendanceService.get_all_teachers_attendance(db)
+
+
+def response_validation(size: int) -> Op:
+    rows = attendance_rows(size)
+    adapter = adapter_for(List[StudentAttendanceRead])
+    # What FastAPI does with a returned list and a response_model
+    return lambda: adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+
+def response_fast_path(size: int) -> Op:
+    rows = attendance_rows(size)
+    return lambda: dumps(rows, List[StudentAttendanceRead])
+
+
+# name -> (setup(size) returning the operation, default sizes)
+CASES: Dict[str, Tuple[Callable[[int], Op], Sequence[int]]] = {
+    "parse_time_to_period": (parse_time_to_period, (100, 1_000, 10_000)),
+    "timetable_fill": (timetable_fill, (50, 500, 5_000)),
+    "student_attendance_stats": (student_attendance_stats, (10, 100, 1_000)),
+    "teacher_attendance_stats": (teacher_attendance_stats, (10, 100, 1_000)),
+    "response_validation": (response_validation, (100, 1_000, 10_000)),
+    "response_fast_path": (response_fast_path, (100, 1_000, 10_000)),
+}
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+class Runner:
+    """Times sync and async operations on one event loop"""
+
+    def __init__(self, min_time: float, rounds: int):
+        self.loop = asyncio.new_event_loop()
+        self.min_time = min_time
+        self.rounds = rounds
+
+    def _timed(self, op: Op, number: int, is_async: bool) -> float:
+        async def run_async() -> float:
+            started = time.perf_counter()
+            for _ in range(number):
+                await op()
+            return time.perf_counter() - started
+
+        if is_async:
+            return self.loop.run_until_complete(run_async())
+        started = time.perf_counter()
+        for _ in range(number):
+            op()
+        return time.perf_counter() - started
+
+    def measure(self, op: Op) -> Dict[str, float]:
+        # Warm up caches and find out whether op returns a coroutine
+        first = op()
+        is_async = asyncio.iscoroutine(first)
+        if is_async:
+            self.loop.run_until_complete(first)
+
+        # Grow the batch until one round takes at least min_time
+        number = 1
+        while True:
+            elapsed = self._timed(op, number, is_async)
+            if elapsed >= self.min_time or number >= 1_000_000:
+                break
+            number = min(1_000_000, max(number * 2, int(number * self.min_time * 1.1 / max(elapsed, 1e-9))))
+
+        per_op = sorted(self._timed(op, number, is_async) / number for _ in range(self.rounds))
+
+        tracemalloc.start()
+        try:
+            baseline = tracemalloc.get_traced_memory()[0]
+            self._timed(op, 1, is_async)
+            peak = tracemalloc.get_traced_memory()[1] - baseline
+        finally:
+            tracemalloc.stop()
+
+        return {
+            "ops_per_sec": round(1 / per_op[0], 2),
+            "best_us": round(per_op[0] * 1e6, 2),
+            "median_us": round(statistics.median(per_op) * 1e6, 2),
+            "peak_kib": round(peak / 1024, 1),
+            "number": number,
+        }
+
+    def close(self) -> None:
+        self.loop.close()
+
+
+def run(cases: List[str], sizes: Optional[List[int]], min_time: float, rounds: int) -> Dict[str, Any]:
+    runner = Runner(min_time, rounds)
+    results: Dict[str, Dict[str, Any]] = {}
+    # The services print per row; measure that work without flooding the terminal
+    with open(os.devnull, "w") as devnull:
+        try:
+            for name in cases:
+                setup, default_sizes = CASES[name]
+                for size in sizes or default_sizes:
+                    op = setup(size)
+                    with contextlib.redirect_stdout(devnull):
+                        stats = runner.measure(op)
+                    results.setdefault(name, {})[str(size)] = stats
+                    print(f"  {name:<26} {size:>7}  {stats['ops_per_sec']:>12,.1f} ops/s  "
+                          f"{stats['best_us']:>12,.1f} us  {stats['peak_kib']:>10,.1f} KiB")
+        finally:
+            runner.close()
+    return {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cases": results,
+    }
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    lines = []
+    for name, sizes in result["cases"].items():
+        for size, stats in sizes.items():
+            before = baseline.get("cases", {}).get(name, {}).get(size)
+            if not before:
+                continue
+            speed = stats["ops_per_sec"] / before["ops_per_sec"]
+            memory = stats["peak_kib"] - before["peak_kib"]
+            lines.append(f"  {name:<26} {size:>7}  {speed:>6.2f}x speed  {memory:>+10,.1f} KiB peak")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--case", action="append", choices=list(CASES), help="Run only these cases")
+    parser.add_argument("--sizes", help="Comma separated sizes instead of each case's defaults")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per timing round")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--out", help="Result path (default benchmarks/results/hot_paths-<time>.json)")
+    parser.add_argument("--baseline", help="Compare against this saved result")
+    parser.add_argument("--save-baseline", help="Also save this result as a baseline at this path")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")] if args.sizes else None
+    print(f"  {'case':<26} {'size':>7}  {'best ops/s':>18}  {'per op':>15}  {'peak alloc':>14}")
+    result = run(args.case or list(CASES), sizes, args.min_time, args.rounds)
+
+    out = args.out or os.path.join(RESULTS_DIR, f"hot_paths-{result['started_at'].replace(':', '')}.json")
+    for path in filter(None, (out, args.save_baseline)):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(result, f, indent=2)
+    print(f"\n📄 {out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"\nAgainst {args.baseline} ({baseline.get('started_at')}):")
+        print("\n".join(compare(result, baseline)) or "  no cases in common")
+
+
+if __name__ == "__main__":
+    main()
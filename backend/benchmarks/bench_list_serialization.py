@@ -0,0 +1,119 @@
+"""
+Compare the old and the fast serialization path of list endpoints.
+
+Serves in-memory Prisma rows through two routes per model, so the numbers
+cover FastAPI's response handling and not the database:
+  before - service re-wraps rows, FastAPI validates against response_model
+  after  - rows encoded once with a precompiled TypeAdapter and orjson
+
+Run from backend/:  python -m benchmarks.bench_list_serialization --rows 10000
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import List
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+from prisma.models import Schedule, User
+from src.models.schemas import ScheduleResponse, UserOut, UserResponse
+from src.utils.serialization import json_response
+
+
+def make_users(n: int) -> List[User]:
+    now = datetime.now()
+    return [
+        User(
+            id=f"user{i:08d}",
+            email=f"user{i}@college.edu",
+            password="$2b$12$" + "x" * 53,
+            role="STUDENT",
+            name=f"User {i}",
+            createdAt=now,
+            updatedAt=now
+        )
+        for i in range(n)
+    ]
+
+
+def make_schedules(n: int) -> List[Schedule]:
+    now = datetime.now()
+    return [
+        Schedule(
+            id=f"sched{i:08d}",
+            courseId=f"course{i % 200:04d}",
+            teacherId=f"teacher{i % 50:04d}",
+            dayOfWeek="MONDAY",
+            startTime="09:00",
+            endTime="10:00",
+            room=f"R{i % 40}",
+            building="Main",
+            type="LECTURE",
+            isActive=True,
+            effectiveFrom=now,
+            effectiveTo=now + timedelta(days=120),
+            createdAt=now,
+            updatedAt=now
+        )
+        for i in range(n)
+    ]
+
+
+def build_app(users: List[User], schedules: List[Schedule]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/before/users", response_model=List[UserResponse])
+    async def users_before():
+        return [UserOut.from_orm(user) for user in users]
+
+    @app.get("/after/users", response_model=List[UserResponse])
+    async def users_after(response: Response):
+        return json_response(response, users, List[UserResponse])
+
+    @app.get("/before/schedules", response_model=List[ScheduleResponse])
+    async def schedules_before():
+        return [ScheduleResponse.model_validate(schedule) for schedule in schedules]
+
+    @app.get("/after/schedules", response_model=List[ScheduleResponse])
+    async def schedules_after(response: Response):
+        return json_response(response, schedules, List[ScheduleResponse])
+
+    return app
+
+
+def measure(client: TestClient, path: str, repeat: int) -> List[float]:
+    client.get(path)  # warm up adapters and caches
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(path)
+        timings.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    client = TestClient(build_app(make_users(args.rows), make_schedules(args.rows)))
+
+    print(f"{args.rows} rows, {args.repeat} requests each (median / p95 ms)")
+    for name in ("users", "schedules"):
+        before = client.get(f"/before/{name}").json()
+        after = client.get(f"/after/{name}").json()
+        assert before == after, f"{name}: fast path output differs"
+
+        results = {}
+        for variant in ("before", "after"):
+            timings = sorted(measure(client, f"/{variant}/{name}", args.repeat))
+            results[variant] = statistics.median(timings)
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            print(f"  {name:<10} {variant:<7} {results[variant]:8.1f} / {p95:8.1f}")
+        print(f"  {name:<10} speedup {results['before'] / results['after']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+"""
+Generate a production-sized, deterministic dataset for load testing.
+
+Scale 1.0 is roughly one college-sized tenant:
+  50k students, 2k teachers, 400 courses, 250k enrollments,
+  a 15 week semester of sessions (18k) and ~11M student attendance rows.
+
+Rows are generated column-wise in batches from a seeded RNG with ids derived
+from row numbers, so the same --seed and --scale always produce the same
+database. Every user shares one precomputed bcrypt hash of --password.
+
+Run from backend/:
+  python -m benchmarks.generate_data --scale 0.1 --reset
+  python -m benchmarks.generate_data --scale 1 --method create_many
+"""
+import argparse
+import asyncio
+import csv
+import io
+import random
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+from urllib.parse import urlsplit, urlunsplit
+from src.config.settings import settings
+from src.services.partition_service import PARENT, PartitionService, add_months, create_partition_sql, month_start
+from src.utils.password import hash_password
+
+BATCH_SIZE = 50_000
+
+DEPARTMENTS = ["CSE", "ECE", "ISE", "BT", "AIML", "DS", "ME", "CV", "CY"]
+SEMESTERS = list(range(1, 9))
+DAYS = ["MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY"]
+SLOTS = [("09:00", "10:00"), ("10:00", "11:00"), ("11:15", "12:15"), ("13:30", "14:30"), ("14:30", "15:30")]
+ATTENDANCE_STATUS = ["PRESENT", "ABSENT", "LATE", "EXCUSED", "MEDICAL_LEAVE"]
+ATTENDANCE_WEIGHTS = [80, 12, 5, 2, 1]
+DESIGNATIONS = ["Professor", "Associate Professor", "Assistant Professor", "Lecturer"]
+FIRST_NAMES = ["Aarav", "Diya", "Ishaan", "Ananya", "Kabir", "Meera", "Rohan", "Saanvi", "Vihaan", "Zara",
+               "Arjun", "Kavya", "Nikhil", "Priya", "Rahul", "Sneha", "Tanvi", "Varun", "Yash", "Aditi"]
+LAST_NAMES = ["Sharma", "Iyer", "Reddy", "Nair", "Gupta", "Rao", "Patel", "Menon", "Das", "Kulkarni",
+              "Joshi", "Bhat", "Shetty", "Pillai", "Verma"]
+
+COURSES_PER_STUDENT = 5
+SCHEDULES_PER_COURSE = 3
+SEMESTER_WEEKS = 15
+
+Rows = List[Tuple[Any, ...]]
+
+# Prisma tables in dependency order: (table, columns)
+TABLES: Dict[str, Sequence[str]] = {
+    "Department": ("id", "code", "name", "createdAt", "updatedAt"),
+    "User": ("id", "email", "password", "role", "name", "createdAt", "updatedAt"),
+    "Student": ("id", "userId", "studentId", "department", "semester", "batch", "createdAt", "updatedAt"),
+    "Teacher": ("id", "userId", "teacherId", "department", "designation", "createdAt", "updatedAt"),
+    "Admin": ("id", "userId", "adminId", "createdAt", "updatedAt"),
+    "Course": ("id", "courseCode", "courseName", "credits", "semester", "departmentId", "teacherId",
+               "isActive", "createdAt", "updatedAt"),
+    "Enrollment": ("id", "studentId", "courseId", "status", "enrolledAt", "createdAt", "updatedAt"),
+    "Schedule": ("id", "courseId", "teacherId", "dayOfWeek", "startTime", "endTime", "room", "type",
+                 "isActive", "effectiveFrom", "createdAt", "updatedAt"),
+    "ClassSession": ("id", "courseId", "scheduleId", "teacherId", "date", "startTime", "endTime",
+                     "status", "createdAt", "updatedAt"),
+    "StudentAttendance": ("id", "sessionId", "studentId", "courseId", "status", "markedById",
+                          "markedAt", "updatedAt"),
+    "TeacherAttendance": ("id", "sessionId", "teacherId", "courseId", "status", "markedById",
+                          "markedAt", "updatedAt"),
+}
+
+
+class Plan:
+    """Row counts for a scale factor"""
+
+    def __init__(self, scale: float):
+        self.students = max(10, int(50_000 * scale))
+        self.teachers = max(5, int(2_000 * scale))
+        self.admins = max(1, int(20 * scale))
+        # Enough courses for every department/semester to offer a full course load
+        self.courses = max(len(DEPARTMENTS) * len(SEMESTERS) * COURSES_PER_STUDENT, int(400 * scale))
+
+
+class Generator:
+    def __init__(self, scale: float, seed: int, password: str, start: datetime):
+        self.plan = Plan(scale)
+        self.rng = random.Random(seed)
+        self.start = start
+        self.password_hash = hash_password(password)
+        # Filled while generating, used by later tables
+        self.student_group: List[Tuple[int, int]] = []
+        self.course_teacher: List[str] = []
+        self.course_group: List[Tuple[int, int]] = []
+        self.group_courses: Dict[Tuple[int, int], List[int]] = {}
+        self.course_students: List[List[str]] = []
+
+    def _batches(self, total: int, make) -> Iterator[Rows]:
+        for offset in range(0, total, BATCH_SIZE):
+            yield make(offset, min(BATCH_SIZE, total - offset))
+
+    def _names(self, n: int) -> List[str]:
+        first = self.rng.choices(FIRST_NAMES, k=n)
+        last = self.rng.choices(LAST_NAMES, k=n)
+        return [f"{a} {b}" for a, b in zip(first, last)]
+
+    def departments(self) -> Iterator[Rows]:
+        now = self.start
+        yield [(f"dep{i:03d}", code, f"Department of {code}", now, now) for i, code in enumerate(DEPARTMENTS)]
+
+    def users(self) -> Iterator[Rows]:
+        plan, now = self.plan, self.start
+
+        def make(role: str, prefix: str, count: int):
+            def rows(offset: int, n: int) -> Rows:
+                names = self._names(n)
+                return [
+                    (f"usr{prefix}{offset + i:08d}", f"{prefix}{offset + i}@college.edu", self.password_hash,
+                     role, names[i], now, now)
+                    for i in range(n)
+                ]
+            return self._batches(count, rows)
+
+        yield from make("STUDENT", "s", plan.students)
+        yield from make("TEACHER", "t", plan.teachers)
+        yield from make("ADMIN", "a", plan.admins)
+
+    def students(self) -> Iterator[Rows]:
+        now = self.start
+
+        def rows(offset: int, n: int) -> Rows:
+            departments = self.rng.choices(range(len(DEPARTMENTS)), k=n)
+            semesters = self.rng.choices(SEMESTERS, k=n)
+            self.student_group.extend(zip(departments, semesters))
+            return [
+                (f"stu{offset + i:08d}", f"usrs{offset + i:08d}", f"ST{offset + i:07d}",
+                 DEPARTMENTS[departments[i]], semesters[i], str(self.start.year - (semesters[i] - 1) // 2),
+                 now, now)
+                for i in range(n)
+            ]
+        return self._batches(self.plan.students, rows)
+
+    def teachers(self) -> Iterator[Rows]:
+        now = self.start
+
+        def rows(offset: int, n: int) -> Rows:
+            designations = self.rng.choices(DESIGNATIONS, k=n)
+            return [
+                (f"tch{offset + i:08d}", f"usrt{offset + i:08d}", f"TCH{offset + i:07d}",
+                 DEPARTMENTS[(offset + i) % len(DEPARTMENTS)], designations[i], now, now)
+                for i in range(n)
+            ]
+        return self._batches(self.plan.teachers, rows)
+
+    def admins(self) -> Iterator[Rows]:
+        now = self.start
+        yield [(f"adm{i:08d}", f"usra{i:08d}", f"ADM{i:07d}", now, now) for i in range(self.plan.admins)]
+
+    def courses(self) -> Iterator[Rows]:
+        now = self.start
+        groups = [(d, s) for d in range(len(DEPARTMENTS)) for s in SEMESTERS]
+        rows = []
+        for i in range(self.plan.courses):
+            department, semester = groups[i % len(groups)]
+            # Spread courses evenly over the teachers
+            teacher = f"tch{(i * len(DEPARTMENTS) + department) % self.plan.teachers:08d}"
+            self.course_teacher.append(teacher)
+            self.course_group.append((department, semester))
+            self.group_courses.setdefault((department, semester), []).append(i)
+            rows.append((
+                f"crs{i:06d}", f"{DEPARTMENTS[department]}{semester}{i:04d}",
+                f"{DEPARTMENTS[department]} Course {i}", self.rng.choice([2, 3, 4]), semester,
+                f"dep{department:03d}", teacher, True, now, now
+            ))
+        self.course_students = [[] for _ in range(self.plan.courses)]
+        yield rows
+
+    def enrollments(self) -> Iterator[Rows]:
+        """Each student takes up to COURSES_PER_STUDENT courses of their department and semester"""
+        now = self.start
+        rows: Rows = []
+        enrolled = 0
+        for index, group in enumerate(self.student_group):
+            student = f"stu{index:08d}"
+            courses = self.group_courses.get(group, [])
+            for course in self.rng.sample(courses, min(COURSES_PER_STUDENT, len(courses))):
+                self.course_students[course].append(student)
+                rows.append((f"enr{enrolled:09d}", student, f"crs{course:06d}", "ACTIVE", now, now, now))
+                enrolled += 1
+            if len(rows) >= BATCH_SIZE:
+                yield rows
+                rows = []
+        if rows:
+            yield rows
+
+    def schedules(self) -> Iterator[Rows]:
+        now = self.start
+        rows = []
+        for course in range(self.plan.courses):
+            days = self.rng.sample(range(len(DAYS)), SCHEDULES_PER_COURSE)
+            slot = SLOTS[course % len(SLOTS)]
+            for k, day in enumerate(sorted(days)):
+                rows.append((
+                    f"sch{course:06d}{k}", f"crs{course:06d}", self.course_teacher[course], DAYS[day],
+                    slot[0], slot[1], f"R{course % 120:03d}", "LAB" if k == 2 else "LECTURE",
+                    True, now, now, now
+                ))
+        self._schedules = rows
+        yield rows
+
+    def sessions(self) -> Iterator[Rows]:
+        rows = []
+        for sch_id, course_id, teacher, day, start_time, end_time, *_ in self._schedules:
+            for week in range(SEMESTER_WEEKS):
+                session_date = self.start + timedelta(weeks=week, days=DAYS.index(day))
+                rows.append((
+                    f"ses{sch_id[3:]}{week:02d}", course_id, sch_id, teacher, session_date, start_time, end_time,
+                    "CONDUCTED", session_date, session_date
+                ))
+        self._sessions = rows
+        yield rows
+
+    def student_attendance(self) -> Iterator[Rows]:
+        rows: Rows = []
+        for session_id, course_id, _, teacher, session_date, *_ in self._sessions:
+            students = self.course_students[int(course_id[3:])]
+            if not students:
+                continue
+            statuses = self.rng.choices(ATTENDANCE_STATUS, ATTENDANCE_WEIGHTS, k=len(students))
+            marked_at = session_date + timedelta(hours=10)
+            rows.extend(
+                (f"sat{session_id[3:]}{j:05d}", session_id, student, course_id, statuses[j], teacher,
+                 marked_at, marked_at)
+                for j, student in enumerate(students)
+            )
+            if len(rows) >= BATCH_SIZE:
+                yield rows
+                rows = []
+        if rows:
+            yield rows
+
+    def teacher_attendance(self) -> Iterator[Rows]:
+        statuses = self.rng.choices(ATTENDANCE_STATUS[:3], [95, 3, 2], k=len(self._sessions))
+        yield [
+            (f"tat{session_id[3:]}", session_id, teacher, course_id, statuses[i],
+             f"adm{i % self.plan.admins:08d}", session_date, session_date)
+            for i, (session_id, course_id, _, teacher, session_date, *_) in enumerate(self._sessions)
+        ]
+
+    def last_day(self) -> date:
+        """Last day with sessions and attendance"""
+        return (self.start + timedelta(weeks=SEMESTER_WEEKS)).date()
+
+    def tables(self) -> Iterator[Tuple[str, Iterator[Rows]]]:
+        yield "Department", self.departments()
+        yield "User", self.users()
+        yield "Student", self.students()
+        yield "Teacher", self.teachers()
+        yield "Admin", self.admins()
+        yield "Course", self.courses()
+        yield "Enrollment", self.enrollments()
+        yield "Schedule", self.schedules()
+        yield "ClassSession", self.sessions()
+        yield "StudentAttendance", self.student_attendance()
+        yield "TeacherAttendance", self.teacher_attendance()
+
+
+class CopySink:
+    """Streams batches into Postgres with COPY ... FROM STDIN"""
+
+    def __init__(self, url: str):
+        import psycopg2
+        # psycopg2 rejects Prisma-only URL parameters such as ?schema= and connection_limit=
+        self.conn = psycopg2.connect(urlunsplit(urlsplit(url)._replace(query="")))
+        with self.conn.cursor() as cur:
+            cur.execute("SET synchronous_commit = off")
+
+    async def reset(self) -> None:
+        tables = ", ".join(f'"{table}"' for table in TABLES)
+        with self.conn.cursor() as cur:
+            cur.execute(f'TRUNCATE {tables}, "ChatMessage" CASCADE')
+        self.conn.commit()
+
+    async def ensure_partitions(self, first: date, last: date) -> None:
+        """Create the monthly StudentAttendance partitions the data needs, when the table is partitioned"""
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", (f'"{PARENT}"',))
+            row = cur.fetchone()
+            if row and row[0] == "p":
+                month = month_start(first)
+                while month <= last:
+                    cur.execute(create_partition_sql(month))
+                    month = add_months(month, 1)
+        self.conn.commit()
+
+    async def write(self, table: str, rows: Rows) -> None:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(value.isoformat() if isinstance(value, datetime) else value for value in row)
+        buffer.seek(0)
+        columns = ", ".join(f'"{column}"' for column in TABLES[table])
+        await asyncio.to_thread(self._copy, f'COPY "{table}" ({columns}) FROM STDIN WITH (FORMAT csv)', buffer)
+
+    def _copy(self, sql: str, buffer: io.StringIO) -> None:
+        with self.conn.cursor() as cur:
+            cur.copy_expert(sql, buffer)
+        self.conn.commit()
+
+    async def close(self) -> None:
+        self.conn.close()
+
+
+class PrismaSink:
+    """Loads batches with create_many, slower than COPY but needs only the Prisma client"""
+
+    def __init__(self, url: str):
+        from prisma import Prisma
+        self.db = Prisma(datasource={"url": url})
+
+    async def reset(self) -> None:
+        await self._connect()
+        for table in ["ChatMessage"] + list(reversed(list(TABLES))):
+            await getattr(self.db, table.lower()).delete_many()
+
+    async def ensure_partitions(self, first: date, last: date) -> None:
+        await self._connect()
+        service = PartitionService(self.db)
+        if await service.is_partitioned():
+            await service.ensure_partitions(first, last)
+
+    async def write(self, table: str, rows: Rows) -> None:
+        await self._connect()
+        columns = TABLES[table]
+        delegate = getattr(self.db, table.lower())
+        for chunk in range(0, len(rows), 5_000):
+            await delegate.create_many(data=[dict(zip(columns, row)) for row in rows[chunk:chunk + 5_000]])
+
+    async def _connect(self) -> None:
+        if not self.db.is_connected():
+            await self.db.connect()
+
+    async def close(self) -> None:
+        if self.db.is_connected():
+            await self.db.disconnect()
+
+
+async def generate(args: argparse.Namespace) -> None:
+    generator = Generator(args.scale, args.seed, args.password, datetime.fromisoformat(args.start))
+    sink = CopySink(settings.DATABASE_URL) if args.method == "copy" else PrismaSink(settings.DATABASE_URL)
+    started = time.perf_counter()
+    total = 0
+    try:
+        if args.reset:
+            await sink.reset()
+        # Without them every generated attendance row would land in the default partition
+        await sink.ensure_partitions(generator.start.date(), generator.last_day())
+        for table, batches in generator.tables():
+            table_started, count = time.perf_counter(), 0
+            for rows in batches:
+                await sink.write(table, rows)
+                count += len(rows)
+            elapsed = time.perf_counter() - table_started
+            total += count
+            print(f"  {table:<18} {count:>11,} rows  {elapsed:7.1f}s  {count / max(elapsed, 1e-9):>10,.0f} rows/s")
+    finally:
+        await sink.close()
+    elapsed = time.perf_counter() - started
+    print(f"✅ {total:,} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0, help="1.0 = 50k students and ~11M attendance rows")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--method", choices=["copy", "create_many"], default="copy")
+    parser.add_argument("--reset", action="store_true", help="Empty every table first")
+    parser.add_argument("--password", default="password123", help="Password of every generated user")
+    parser.add_argument("--start", default="2025-01-06", help="Monday the semester starts on")
+    args = parser.parse_args()
+
+    plan = Plan(args.scale)
+    attendance = plan.students * COURSES_PER_STUDENT * SCHEDULES_PER_COURSE * SEMESTER_WEEKS
+    print(f"Scale {args.scale}: {plan.students:,} students, {plan.teachers:,} teachers, "
+          f"{plan.courses:,} courses, ~{attendance:,} attendance rows")
+    asyncio.run(generate(args))
+
+
+if __name__ == "__main__":
+    main()
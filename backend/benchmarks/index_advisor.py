@@ -0,0 +1,368 @@
+"""
+Suggest indexes from the query shapes the API actually runs.
+
+1. Record shapes: start the server with QUERY_SHAPES_DIR set and drive it,
+   e.g. with benchmarks.load_test. Every worker writes
+   QUERY_SHAPES_DIR/shapes-<pid>.json.
+2. Run the advisor against a local copy of the database:
+     python -m benchmarks.index_advisor --shapes /tmp/shapes
+
+For every shape it EXPLAINs (ANALYZE, BUFFERS) the recorded sample as plain
+SQL, derives the index that would serve it (equality columns, most selective
+first, then IN columns, then the sort or the range column) and skips shapes an
+existing index already covers. Suggestions are ranked by the database time of
+the shapes they serve and printed as @@index lines to paste into
+prisma/schema.prisma. Indexes with no scans since the last stats reset are
+listed as candidates for removal.
+
+Relations loaded with include run as separate queries inside Prisma's engine
+and are not part of the recorded shapes.
+"""
+import argparse
+import json
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit, urlunsplit
+from src.config.settings import settings
+from src.utils.query_shapes import load_snapshots
+
+_OPERATORS = {"equals": "=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<=", "not": "<>"}
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+# ---------------------------------------------------------------------------
+# Database
+# ---------------------------------------------------------------------------
+
+class Catalog:
+    """Indexes, column statistics and index usage of the current schema"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.indexes: Dict[str, List[Tuple[str, List[str]]]] = defaultdict(list)
+        self.distinct: Dict[Tuple[str, str], float] = {}
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT t.relname, i.relname,
+                       array(SELECT a.attname::text
+                             FROM unnest(ix.indkey) WITH ORDINALITY AS k(attnum, n)
+                             JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = k.attnum
+                             ORDER BY k.n)
+                FROM pg_index ix
+                JOIN pg_class i ON i.oid = ix.indexrelid
+                JOIN pg_class t ON t.oid = ix.indrelid
+                JOIN pg_namespace ns ON ns.oid = t.relnamespace
+                WHERE ns.nspname = current_schema() AND NOT t.relispartition
+            """)
+            for table, index, columns in cur.fetchall():
+                self.indexes[table].append((index, columns))
+
+            # Negative n_distinct is a fraction of the row count
+            cur.execute("""
+                SELECT s.tablename, s.attname::text,
+                       CASE WHEN s.n_distinct < 0 THEN -s.n_distinct * greatest(c.reltuples, 1) ELSE s.n_distinct END
+                FROM pg_stats s
+                JOIN pg_class c ON c.relname = s.tablename
+                JOIN pg_namespace ns ON ns.oid = c.relnamespace AND ns.nspname = s.schemaname
+                WHERE s.schemaname = current_schema()
+            """)
+            for table, column, distinct in cur.fetchall():
+                self.distinct[(table, column)] = max(self.distinct.get((table, column), 0), float(distinct))
+
+    def covered_by(self, table: str, columns: List[str], equality: int) -> Optional[str]:
+        """An existing index that starts with the equality columns in any order, then the rest in order"""
+        for index, existing in self.indexes.get(table, []):
+            if len(existing) < len(columns):
+                continue
+            if set(existing[:equality]) == set(columns[:equality]) and existing[equality:len(columns)] == columns[equality:]:
+                return index
+        return None
+
+    def unused_indexes(self) -> List[Dict[str, Any]]:
+        """Non-unique indexes without a single scan; partition indexes count towards their parent"""
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                SELECT coalesce(parent.relname, s.indexrelname),
+                       coalesce(parent_table.relname, s.relname),
+                       sum(s.idx_scan),
+                       sum(pg_relation_size(s.indexrelid))
+                FROM pg_stat_user_indexes s
+                JOIN pg_index ix ON ix.indexrelid = s.indexrelid
+                LEFT JOIN pg_inherits inh ON inh.inhrelid = s.indexrelid
+                LEFT JOIN pg_class parent ON parent.oid = inh.inhparent
+                LEFT JOIN pg_index parent_ix ON parent_ix.indexrelid = inh.inhparent
+                LEFT JOIN pg_class parent_table ON parent_table.oid = parent_ix.indrelid
+                WHERE s.schemaname = current_schema() AND NOT ix.indisunique AND NOT ix.indisprimary
+                GROUP BY 1, 2
+                HAVING sum(s.idx_scan) = 0
+                ORDER BY 4 DESC
+            """)
+            rows = cur.fetchall()
+            cur.execute("SELECT stats_reset FROM pg_stat_database WHERE datname = current_database()")
+            reset = cur.fetchone()[0]
+        columns = {index: cols for table in self.indexes.values() for index, cols in table}
+        return [
+            {"index": index, "table": table, "columns": columns.get(index, []), "bytes": int(size),
+             "since": reset.isoformat() if reset else "the database was created"}
+            for index, table, _, size in rows
+        ]
+
+    def explain(self, shape: Dict[str, Any], analyze: bool) -> Dict[str, Any]:
+        """Run the shape's sample as SQL and summarize the plan; nothing is committed"""
+        sql, params = sample_sql(shape)
+        if sql is None:
+            return {"error": "sample uses filters that cannot be rebuilt as SQL"}
+        options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute(f"EXPLAIN ({options}) {sql}", params)
+                plan = cur.fetchone()[0][0]
+        except Exception as e:
+            return {"error": str(e).strip().splitlines()[0], "sql": sql}
+        finally:
+            self.conn.rollback()
+
+        scans: List[str] = []
+
+        def walk(node: Dict[str, Any]) -> None:
+            if node.get("Node Type") in ("Seq Scan", "Index Scan", "Index Only Scan", "Bitmap Heap Scan"):
+                scans.append(f"{node['Node Type']} on {node.get('Relation Name')}"
+                             + (f" using {node['Index Name']}" if node.get("Index Name") else ""))
+            for child in node.get("Plans", []):
+                walk(child)
+
+        walk(plan["Plan"])
+        root = plan["Plan"]
+        return {
+            "sql": sql,
+            "ms": plan.get("Execution Time"),
+            "buffers": (root.get("Shared Hit Blocks", 0) + root.get("Shared Read Blocks", 0)) if analyze else None,
+            "rows": root.get("Actual Rows", root.get("Plan Rows")),
+            "seq_scan": any(scan.startswith("Seq Scan") for scan in scans),
+            "scans": sorted(set(scans)),
+        }
+
+
+def _condition(column: str, value: Any, params: List[Any]) -> Optional[str]:
+    if not isinstance(value, dict):
+        if value is None:
+            return f"{_quote(column)} IS NULL"
+        params.append(value)
+        return f"{_quote(column)} = %s"
+    parts = []
+    for op, operand in value.items():
+        if op == "mode":
+            continue
+        if op in ("in", "not_in"):
+            if not operand:
+                return None
+            params.append(tuple(operand))
+            parts.append(f"{_quote(column)} {'NOT IN' if op == 'not_in' else 'IN'} %s")
+        elif op in _OPERATORS:
+            params.append(operand)
+            parts.append(f"{_quote(column)} {_OPERATORS[op]} %s")
+        elif op in ("contains", "startswith", "endswith"):
+            pattern = {"contains": "%{}%", "startswith": "{}%", "endswith": "%{}"}[op].format(operand)
+            params.append(pattern)
+            parts.append(f"{_quote(column)} {'ILIKE' if value.get('mode') == 'insensitive' else 'LIKE'} %s")
+        else:
+            return None
+    return " AND ".join(parts) or None
+
+
+def _conditions(where: Dict[str, Any], params: List[Any]) -> Optional[List[str]]:
+    conditions = []
+    for key, value in (where or {}).items():
+        if key == "AND":
+            for part in value if isinstance(value, list) else [value]:
+                nested = _conditions(part, params)
+                if nested is None:
+                    return None
+                conditions.extend(nested)
+        elif key in ("OR", "NOT"):
+            return None
+        else:
+            condition = _condition(key, value, params)
+            if condition is None:
+                return None
+            conditions.append(condition)
+    return conditions
+
+
+def sample_sql(shape: Dict[str, Any]) -> Tuple[Optional[str], List[Any]]:
+    """The shape's sample as a SELECT, close to what Prisma sends for the top-level query"""
+    sample = shape["sample"]
+    params: List[Any] = []
+    conditions = _conditions(sample.get("where") or {}, params)
+    if conditions is None:
+        return None, []
+    sql = f"SELECT * FROM {_quote(shape['model'])}"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    if shape["order"]:
+        sql += " ORDER BY " + ", ".join(f"{_quote(column)} {direction.upper()}" for column, direction in shape["order"])
+    if sample.get("take"):
+        sql += f" LIMIT {abs(int(sample['take']))}"
+    elif shape["method"] in ("find_first", "find_first_or_raise", "find_unique", "find_unique_or_raise"):
+        sql += " LIMIT 1"
+    return sql, params
+
+
+# ---------------------------------------------------------------------------
+# Advice
+# ---------------------------------------------------------------------------
+
+def index_for(shape: Dict[str, Any], catalog: Catalog) -> Tuple[List[str], int]:
+    """Columns of the index that serves a shape, and how many of them are equality columns"""
+    table = shape["model"]
+    kinds = defaultdict(set)
+    for column, kind in shape["where"]:
+        kinds[kind].add(column)
+    if "id" in kinds["eq"]:
+        return [], 0  # the primary key
+
+    equality = sorted(kinds["eq"], key=lambda column: -catalog.distinct.get((table, column), 0))
+    columns = equality + sorted(kinds["in"] - kinds["eq"])
+    order = [column for column, _ in shape["order"] if column not in columns]
+    ranges = sorted(kinds["range"] - set(columns))
+    # A range on the sort column is served by the sort; otherwise only one range can use the index
+    if order and (not ranges or ranges == order[:1]):
+        columns += order
+    elif ranges:
+        columns.append(ranges[0])
+    return columns, len(equality)
+
+
+class Suggestion:
+    def __init__(self, table: str, columns: List[str], equality: int):
+        self.table = table
+        self.columns = columns
+        self.equality = equality
+        self.shapes: List[Tuple[str, Dict[str, Any], Dict[str, Any]]] = []
+
+    @property
+    def count(self) -> int:
+        return sum(shape["count"] for _, shape, _ in self.shapes)
+
+    @property
+    def total_ms(self) -> float:
+        return sum(shape["total_ms"] for _, shape, _ in self.shapes)
+
+    def prisma(self) -> str:
+        return f"@@index([{', '.join(self.columns)}])"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "table": self.table,
+            "prisma": self.prisma(),
+            "queries": self.count,
+            "total_ms": round(self.total_ms, 1),
+            "shapes": [{"shape": key, "count": shape["count"], "explain": plan} for key, shape, plan in self.shapes],
+        }
+
+
+def advise(shapes: Dict[str, Dict[str, Any]], catalog: Catalog, analyze: bool, min_count: int) -> List[Suggestion]:
+    suggestions: Dict[Tuple[str, Tuple[str, ...]], Suggestion] = {}
+    for key, shape in sorted(shapes.items(), key=lambda item: -item[1]["total_ms"]):
+        if shape["count"] < min_count:
+            continue
+        columns, equality = index_for(shape, catalog)
+        if not columns or catalog.covered_by(shape["model"], columns, equality):
+            continue
+        plan = catalog.explain(shape, analyze)
+        target = suggestions.setdefault(
+            (shape["model"], tuple(columns)), Suggestion(shape["model"], columns, equality)
+        )
+        target.shapes.append((key, shape, plan))
+
+    # An index also serves every shape whose columns are a prefix of its own
+    merged = sorted(suggestions.values(), key=lambda s: -len(s.columns))
+    kept: List[Suggestion] = []
+    for suggestion in merged:
+        for longer in kept:
+            n = len(suggestion.columns)
+            if (longer.table == suggestion.table and n < len(longer.columns)
+                    and set(longer.columns[:suggestion.equality]) == set(suggestion.columns[:suggestion.equality])
+                    and longer.columns[suggestion.equality:n] == suggestion.columns[suggestion.equality:]):
+                longer.shapes.extend(suggestion.shapes)
+                break
+        else:
+            kept.append(suggestion)
+    return sorted(kept, key=lambda s: -s.total_ms)
+
+
+def format_report(suggestions: Sequence[Suggestion], unused: List[Dict[str, Any]], top: int) -> str:
+    lines = []
+    if not suggestions:
+        lines.append("No missing indexes: every recorded shape is covered by an existing index.")
+    for rank, suggestion in enumerate(suggestions[:top], start=1):
+        lines.append(f"{rank}. {suggestion.table} {suggestion.prisma()}  "
+                     f"{suggestion.count:,} queries, {suggestion.total_ms:,.0f} ms in total")
+        for key, shape, plan in suggestion.shapes:
+            lines.append(f"     {shape['count']:>7,}x  {key}")
+            if plan.get("error"):
+                lines.append(f"              EXPLAIN failed: {plan['error']}")
+            elif plan:
+                timing = f"{plan['ms']:.1f} ms, {plan['buffers']:,} buffers, " if plan.get("ms") is not None else ""
+                lines.append(f"              {timing}{'; '.join(plan['scans'])}")
+
+    if suggestions:
+        lines.append("")
+        lines.append("Add to prisma/schema.prisma:")
+        by_table: Dict[str, List[Suggestion]] = defaultdict(list)
+        for suggestion in suggestions[:top]:
+            by_table[suggestion.table].append(suggestion)
+        for table, items in by_table.items():
+            lines.append(f"  model {table} {{")
+            for suggestion in items:
+                lines.append(f"    {suggestion.prisma()}  // {suggestion.count:,} queries, "
+                             f"{suggestion.total_ms:,.0f} ms")
+            lines.append("  }")
+
+    if unused:
+        lines.append("")
+        lines.append(f"Unused indexes (no scans since {unused[0]['since']}):")
+        for index in unused:
+            columns = f"@@index([{', '.join(index['columns'])}])" if index["columns"] else index["index"]
+            lines.append(f"  model {index['table']}: {columns}  {index['bytes'] / 1024 / 1024:,.1f} MB  ({index['index']})")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--shapes", default=settings.QUERY_SHAPES_DIR, help="Directory the workers recorded shapes in")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL, help="Database to EXPLAIN against")
+    parser.add_argument("--no-analyze", action="store_true", help="Plan only, without executing the samples")
+    parser.add_argument("--min-count", type=int, default=1, help="Ignore shapes seen fewer times")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--json", help="Also write the suggestions to this file")
+    args = parser.parse_args()
+
+    if not args.shapes:
+        raise SystemExit("❌ Pass --shapes or set QUERY_SHAPES_DIR")
+    shapes = load_snapshots(args.shapes)
+    if not shapes:
+        raise SystemExit(f"❌ No shapes in {args.shapes}; run the server with QUERY_SHAPES_DIR={args.shapes} first")
+
+    import psycopg2
+    # psycopg2 rejects Prisma-only URL parameters such as ?schema= and connection_limit=
+    conn = psycopg2.connect(urlunsplit(urlsplit(args.database_url)._replace(query="")))
+    try:
+        catalog = Catalog(conn)
+        suggestions = advise(shapes, catalog, analyze=not args.no_analyze, min_count=args.min_count)
+        unused = catalog.unused_indexes()
+    finally:
+        conn.close()
+
+    print(f"{len(shapes)} query shapes, {sum(s['count'] for s in shapes.values()):,} queries\n")
+    print(format_report(suggestions, unused, args.top))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"suggestions": [s.to_dict() for s in suggestions], "unused": unused}, f, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,489 @@
+"""
+Scenario-based HTTP load test.
+
+Drives a running server with a weighted mix of user journeys arriving at a
+fixed rate (open loop, so a slow server builds up work instead of slowing
+the test down) and reports p50/p95/p99 latency and error rate per endpoint.
+
+Users are sampled from the database the server uses, so load it with
+benchmarks.generate_data first; every generated user shares --password.
+
+Run from backend/ with the server up (python run.py --prod):
+  python -m benchmarks.load_test --rate 50 --duration 60
+  python -m benchmarks.load_test --save-baseline benchmarks/baselines/release.json
+  python -m benchmarks.load_test --baseline benchmarks/baselines/release.json
+  python -m benchmarks.load_test --weight agent_query=0 --weight login_storm=40
+
+Results go to benchmarks/results/ as JSON and a text summary. With
+--baseline the run exits with status 1 when an endpoint regressed.
+
+Start the server with AGENT_LLM=fake to keep agent_query offline; the
+scripted model answers after AGENT_FAKE_LLM_LATENCY_MS.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import httpx
+from src.config.settings import settings
+from src.utils.pagination import NEXT_CURSOR_HEADER
+from src.utils.query_stats import parse_server_timing
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+ATTENDANCE_STATUS = ["PRESENT", "ABSENT", "LATE", "EXCUSED"]
+ATTENDANCE_WEIGHTS = [85, 10, 4, 1]
+AGENT_QUESTIONS = [
+    "How many courses does the CSE department offer?",
+    "Which teachers teach in semester 3?",
+    "What is the attendance percentage of the ECE department?",
+    "List the courses taught by the AIML department",
+    "Which room is used most often on Mondays?",
+]
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+class Teacher:
+    __slots__ = ("email", "id", "course_id", "roster")
+
+    def __init__(self, email: str, id: str, course_id: str, roster: List[str]):
+        self.email = email
+        self.id = id
+        self.course_id = course_id
+        self.roster = roster
+
+
+class Fixtures:
+    """Users and ids sampled from the database that the scenarios act on"""
+
+    def __init__(self):
+        self.students: List[Tuple[str, str]] = []
+        self.teachers: List[Teacher] = []
+        self.admins: List[str] = []
+
+    @classmethod
+    async def load(cls, url: str, users: int, roster_size: int) -> "Fixtures":
+        from prisma import Prisma
+        db = Prisma(datasource={"url": url})
+        await db.connect()
+        fixtures = cls()
+        try:
+            students = await db.student.find_many(take=users, include={"user": True})
+            fixtures.students = [(student.user.email, student.id) for student in students]
+
+            teachers = await db.teacher.find_many(
+                take=users,
+                where={"coursesTeaching": {"some": {"enrollments": {"some": {}}}}},
+                include={
+                    "user": True,
+                    "coursesTeaching": {
+                        "take": 1,
+                        "where": {"enrollments": {"some": {}}},
+                        "include": {"enrollments": {"take": roster_size}},
+                    },
+                }
+            )
+            for teacher in teachers:
+                course = teacher.coursesTeaching[0]
+                roster = [enrollment.studentId for enrollment in course.enrollments]
+                fixtures.teachers.append(Teacher(teacher.user.email, teacher.id, course.id, roster))
+
+            admins = await db.admin.find_many(take=users, include={"user": True})
+            fixtures.admins = [admin.user.email for admin in admins]
+        finally:
+            await db.disconnect()
+
+        if not (fixtures.students and fixtures.teachers and fixtures.admins):
+            raise SystemExit("❌ The database needs students, teachers with enrolled courses and admins; "
+                             "run python -m benchmarks.generate_data first")
+        return fixtures
+
+
+# ---------------------------------------------------------------------------
+# Recording
+# ---------------------------------------------------------------------------
+
+class Recorder:
+    """Latency samples and failures per endpoint"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.db_queries: Dict[str, List[int]] = defaultdict(list)
+        self.scenarios: Dict[str, int] = defaultdict(int)
+        self.scenario_failures: Dict[str, int] = defaultdict(int)
+        self.dropped = 0
+
+    def record(self, endpoint: str, seconds: float, outcome: Any, server_timing: Optional[str] = None) -> None:
+        self.latencies[endpoint].append(seconds)
+        if not isinstance(outcome, int) or outcome >= 400:
+            self.errors[endpoint][str(outcome)] += 1
+        if server_timing:
+            try:
+                self.db_queries[endpoint].append(parse_server_timing(server_timing).queries)
+            except AssertionError:
+                pass
+
+
+def _percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(q / 100 * len(values)) - 1)]
+
+
+def summarize(recorder: Recorder, started_at: str, elapsed: float, config: Dict[str, Any]) -> Dict[str, Any]:
+    endpoints = {}
+    for endpoint, samples in sorted(recorder.latencies.items()):
+        samples = sorted(samples)
+        errors = sum(recorder.errors[endpoint].values())
+        queries = recorder.db_queries.get(endpoint)
+        endpoints[endpoint] = {
+            "count": len(samples),
+            "rps": round(len(samples) / elapsed, 2),
+            "errors": errors,
+            "error_rate": round(errors / len(samples), 4),
+            "error_kinds": dict(recorder.errors[endpoint]),
+            "p50_ms": round(_percentile(samples, 50) * 1000, 2),
+            "p95_ms": round(_percentile(samples, 95) * 1000, 2),
+            "p99_ms": round(_percentile(samples, 99) * 1000, 2),
+            "mean_ms": round(sum(samples) / len(samples) * 1000, 2),
+            "max_ms": round(samples[-1] * 1000, 2),
+            "db_queries": round(sum(queries) / len(queries), 1) if queries else None,
+        }
+    return {
+        "started_at": started_at,
+        "elapsed_s": round(elapsed, 2),
+        "config": config,
+        "scenarios": {
+            name: {"count": count, "failed": recorder.scenario_failures.get(name, 0)}
+            for name, count in sorted(recorder.scenarios.items())
+        },
+        "dropped": recorder.dropped,
+        "endpoints": endpoints,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Scenarios
+# ---------------------------------------------------------------------------
+
+class ScenarioFailed(Exception):
+    pass
+
+
+class Client:
+    """httpx client that records every request under an endpoint name"""
+
+    def __init__(self, http: httpx.AsyncClient, recorder: Recorder, password: str):
+        self.http = http
+        self.recorder = recorder
+        self.password = password
+        self.tokens: Dict[str, str] = {}
+
+    async def _send(self, endpoint: str, path: str, token: Optional[str] = None, **kwargs: Any) -> httpx.Response:
+        method = endpoint.split(" ", 1)[0]
+        headers = {"Authorization": f"Bearer {token}"} if token else None
+        started = time.perf_counter()
+        try:
+            response = await self.http.request(method, path, headers=headers, **kwargs)
+        except httpx.HTTPError as e:
+            self.recorder.record(endpoint, time.perf_counter() - started, type(e).__name__)
+            raise ScenarioFailed(endpoint) from e
+        self.recorder.record(
+            endpoint, time.perf_counter() - started, response.status_code, response.headers.get("server-timing")
+        )
+        if response.status_code >= 400:
+            raise ScenarioFailed(endpoint)
+        return response
+
+    async def request(self, endpoint: str, path: str, token: Optional[str] = None, **kwargs: Any) -> Any:
+        response = await self._send(endpoint, path, token, **kwargs)
+        return response.json() if response.content else None
+
+    async def request_page(
+        self, endpoint: str, path: str, token: Optional[str] = None, **kwargs: Any
+    ) -> Tuple[Any, Optional[str]]:
+        """(body, cursor of the next page) of a list route"""
+        response = await self._send(endpoint, path, token, **kwargs)
+        return response.json(), response.headers.get(NEXT_CURSOR_HEADER)
+
+    async def login(self, email: str) -> str:
+        body = await self.request("POST /api/auth/login", "/api/auth/login",
+                                  json={"email": email, "password": self.password})
+        self.tokens[email] = body["access_token"]
+        return self.tokens[email]
+
+    async def token(self, email: str) -> str:
+        return self.tokens.get(email) or await self.login(email)
+
+
+async def login_storm(client: Client, fixtures: Fixtures, rng: random.Random) -> None:
+    """Everyone logs in at 9 am and the frontend loads the profile"""
+    email, _ = rng.choice(fixtures.students)
+    token = await client.login(email)
+    await client.request("GET /api/auth/me", "/api/auth/me", token)
+
+
+async def teacher_marking(client: Client, fixtures: Fixtures, rng: random.Random) -> None:
+    """A teacher opens a session at the start of a period and marks the whole class"""
+    teacher = rng.choice(fixtures.teachers)
+    token = await client.token(teacher.email)
+    now = datetime.now()
+    session = await client.request("POST /api/attendance/sessions", "/api/attendance/sessions", token, json={
+        "courseId": teacher.course_id,
+        "teacherId": teacher.id,
+        "date": now.isoformat(),
+        "startTime": now.strftime("%H:%M"),
+        "endTime": now.strftime("%H:%M"),
+        "status": "CONDUCTED",
+    })
+    statuses = rng.choices(ATTENDANCE_STATUS, ATTENDANCE_WEIGHTS, k=len(teacher.roster))
+    await client.request("POST /api/attendance/bulk", "/api/attendance/bulk", token, json=[
+        {"sessionId": session["id"], "studentId": student_id, "status": status}
+        for student_id, status in zip(teacher.roster, statuses)
+    ])
+
+
+async def student_attendance(client: Client, fixtures: Fixtures, rng: random.Random) -> None:
+    """A student checks their attendance, then pages once"""
+    email, student_id = rng.choice(fixtures.students)
+    token = await client.token(email)
+    path = f"/api/attendance/student/{student_id}"
+    _, cursor = await client.request_page("GET /api/attendance/student/{id}", path, token, params={"limit": 20})
+    if cursor:
+        await client.request("GET /api/attendance/student/{id}", path, token, params={"limit": 20, "cursor": cursor})
+
+
+async def admin_statistics(client: Client, fixtures: Fixtures, rng: random.Random) -> None:
+    """An admin opens the attendance dashboard"""
+    token = await client.token(rng.choice(fixtures.admins))
+    await client.request("GET /api/attendance/statistics/students", "/api/attendance/statistics/students", token)
+    await client.request("GET /api/attendance/statistics/teachers", "/api/attendance/statistics/teachers", token)
+
+
+async def timetable_polling(client: Client, fixtures: Fixtures, rng: random.Random) -> None:
+    """The timetable page refreshing in an open tab"""
+    email, _ = rng.choice(fixtures.students)
+    token = await client.token(email)
+    await client.request("GET /api/schedules/timetable", "/api/schedules/timetable", token)
+
+
+async def agent_query(client: Client, fixtures: Fixtures, rng: random.Random) -> None:
+    """A question to the department agent"""
+    await client.request("POST /api/agent/query", "/api/agent/query", json={"query": rng.choice(AGENT_QUESTIONS)})
+
+
+Scenario = Callable[[Client, Fixtures, random.Random], Awaitable[None]]
+
+# name -> (scenario, default weight)
+SCENARIOS: Dict[str, Tuple[Scenario, float]] = {
+    "login_storm": (login_storm, 15),
+    "teacher_marking": (teacher_marking, 10),
+    "student_attendance": (student_attendance, 40),
+    "admin_statistics": (admin_statistics, 5),
+    "timetable_polling": (timetable_polling, 25),
+    "agent_query": (agent_query, 5),
+}
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+async def _warm_up(client: Client, fixtures: Fixtures, concurrency: int) -> None:
+    """Log every sampled user in before the run so scenarios measure their own endpoints"""
+    emails = [email for email, _ in fixtures.students] + [t.email for t in fixtures.teachers] + fixtures.admins
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login(email: str) -> None:
+        async with semaphore:
+            try:
+                await client.login(email)
+            except ScenarioFailed:
+                pass
+
+    await asyncio.gather(*(login(email) for email in emails))
+    if not client.tokens:
+        raise SystemExit("❌ No user could log in; check --base-url and --password")
+
+
+async def run(args: argparse.Namespace, weights: Dict[str, float]) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    fixtures = await Fixtures.load(settings.DATABASE_URL, args.users, args.roster_size)
+    print(f"Fixtures: {len(fixtures.students)} students, {len(fixtures.teachers)} teachers, "
+          f"{len(fixtures.admins)} admins")
+
+    limits = httpx.Limits(max_connections=args.max_in_flight, max_keepalive_connections=args.max_in_flight)
+    timeout = httpx.Timeout(args.timeout)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=timeout) as http:
+        client = Client(http, Recorder(), args.password)
+        await _warm_up(client, fixtures, concurrency=50)
+        # Warm-up logins are not part of the measurement
+        recorder = client.recorder = Recorder()
+
+        names = [name for name, weight in weights.items() if weight > 0]
+        scenario_weights = [weights[name] for name in names]
+        tasks: set = set()
+
+        async def start(name: str) -> None:
+            recorder.scenarios[name] += 1
+            try:
+                await SCENARIOS[name][0](client, fixtures, random.Random(rng.random()))
+            except ScenarioFailed:
+                recorder.scenario_failures[name] += 1
+
+        print(f"Running {args.rate}/s for {args.duration}s: "
+              + ", ".join(f"{name}={weights[name]:g}" for name in names))
+        started_at = datetime.now().isoformat(timespec="seconds")
+        started = time.perf_counter()
+        next_arrival = started
+        while next_arrival - started < args.duration:
+            # Poisson arrivals, independent of how fast the server answers
+            next_arrival += rng.expovariate(args.rate)
+            await asyncio.sleep(max(0.0, next_arrival - time.perf_counter()))
+            if len(tasks) >= args.max_in_flight:
+                recorder.dropped += 1
+                continue
+            task = asyncio.create_task(start(rng.choices(names, scenario_weights)[0]))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.wait(tasks)
+        elapsed = time.perf_counter() - started
+
+    config = {
+        "base_url": args.base_url,
+        "rate": args.rate,
+        "duration": args.duration,
+        "seed": args.seed,
+        "weights": weights,
+    }
+    return summarize(recorder, started_at, elapsed, config)
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, error_tolerance: float) -> List[str]:
+    """Endpoints whose p95/p99 grew by more than tolerance or whose error rate rose by more than error_tolerance"""
+    regressions = []
+    for endpoint, current in result["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(endpoint)
+        if before is None:
+            continue
+        for key in ("p95_ms", "p99_ms"):
+            # Ignore noise on endpoints that are fast either way
+            if current[key] > before[key] * (1 + tolerance) and current[key] - before[key] > 5:
+                regressions.append(f"{endpoint}: {key} {before[key]:.1f} -> {current[key]:.1f} ms")
+        if current["error_rate"] - before["error_rate"] > error_tolerance:
+            regressions.append(
+                f"{endpoint}: error rate {before['error_rate']:.2%} -> {current['error_rate']:.2%}"
+            )
+    return regressions
+
+
+def format_summary(result: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> str:
+    lines = [
+        f"Load test {result['started_at']}  {result['config']['rate']}/s for {result['elapsed_s']}s "
+        f"against {result['config']['base_url']}",
+        "",
+        f"{'endpoint':<42} {'count':>7} {'rps':>7} {'err%':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'db q':>5}"
+        + ("  p95 vs base" if baseline else ""),
+    ]
+    for endpoint, stats in result["endpoints"].items():
+        line = (
+            f"{endpoint:<42} {stats['count']:>7} {stats['rps']:>7.1f} {stats['error_rate']:>6.1%} "
+            f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f} "
+            f"{'' if stats['db_queries'] is None else stats['db_queries']:>5}"
+        )
+        before = (baseline or {}).get("endpoints", {}).get(endpoint)
+        if before and before["p95_ms"]:
+            line += f"  {(stats['p95_ms'] / before['p95_ms'] - 1):+.0%}"
+        lines.append(line)
+    lines.append("")
+    lines.append("Scenarios: " + ", ".join(
+        f"{name} {s['count']} ({s['failed']} failed)" for name, s in result["scenarios"].items()
+    ))
+    if result["dropped"]:
+        lines.append(f"⚠️ {result['dropped']} arrivals dropped at --max-in-flight, the server could not keep up")
+    return "\n".join(lines)
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def _parse_weights(overrides: List[str]) -> Dict[str, float]:
+    weights = {name: weight for name, (_, weight) in SCENARIOS.items()}
+    for override in overrides:
+        name, _, value = override.partition("=")
+        if name not in SCENARIOS:
+            raise SystemExit(f"❌ Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        weights[name] = float(value)
+    return weights
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--rate", type=float, default=20, help="Scenarios started per second")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds to keep starting scenarios")
+    parser.add_argument("--weight", action="append", default=[], metavar="SCENARIO=WEIGHT",
+                        help=f"Override a scenario weight; scenarios: {', '.join(SCENARIOS)}")
+    parser.add_argument("--users", type=int, default=200, help="Users of each role to sample")
+    parser.add_argument("--roster-size", type=int, default=60, help="Students marked per bulk request")
+    parser.add_argument("--password", default="password123", help="Password of the sampled users")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--max-in-flight", type=int, default=500, help="Concurrent scenarios before arrivals are dropped")
+    parser.add_argument("--out", help="Result path without extension (default benchmarks/results/load-<time>)")
+    parser.add_argument("--baseline", help="Compare against this saved result and fail on regressions")
+    parser.add_argument("--save-baseline", help="Also save this result as a baseline at this path")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p95/p99 growth over the baseline")
+    parser.add_argument("--error-tolerance", type=float, default=0.01, help="Allowed error rate growth")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args, _parse_weights(args.weight)))
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    summary = format_summary(result, baseline)
+
+    out = args.out or os.path.join(RESULTS_DIR, f"load-{result['started_at'].replace(':', '')}")
+    _write_json(out + ".json", result)
+    with open(out + ".txt", "w") as f:
+        f.write(summary + "\n")
+    if args.save_baseline:
+        _write_json(args.save_baseline, result)
+
+    print()
+    print(summary)
+    print(f"\n📄 {out}.json")
+
+    if baseline is not None:
+        regressions = compare(result, baseline, args.tolerance, args.error_tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            raise SystemExit(1)
+        print(f"\n✅ No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+-- Range-partition StudentAttendance by month of "markedAt".
+--
+-- Postgres requires the partition key in the primary key and in every unique
+-- index, so the primary key becomes ("id", "markedAt") and the rule of one mark
+-- per student and session moves from a unique index to a trigger. Prisma keeps
+-- treating "id" alone as the primary key; cuids are unique anyway.
+--
+-- Partitions are named StudentAttendance_YYYY_MM. The API creates upcoming
+-- months at startup and daily (src/services/partition_service.py); rows outside
+-- every month land in StudentAttendance_default, which should stay empty.
+--
+-- This rewrites the table once. On a large database run it in a maintenance window.
+
+-- Move the old table out of the way, freeing its constraint and index names
+ALTER TABLE "StudentAttendance" RENAME TO "StudentAttendance_unpartitioned";
+ALTER TABLE "StudentAttendance_unpartitioned" RENAME CONSTRAINT "StudentAttendance_pkey" TO "StudentAttendance_unpartitioned_pkey";
+ALTER TABLE "StudentAttendance_unpartitioned" DROP CONSTRAINT "StudentAttendance_sessionId_fkey";
+ALTER TABLE "StudentAttendance_unpartitioned" DROP CONSTRAINT "StudentAttendance_studentId_fkey";
+ALTER TABLE "StudentAttendance_unpartitioned" DROP CONSTRAINT "StudentAttendance_courseId_fkey";
+ALTER TABLE "StudentAttendance_unpartitioned" DROP CONSTRAINT "StudentAttendance_markedById_fkey";
+DROP INDEX "StudentAttendance_studentId_idx";
+DROP INDEX "StudentAttendance_courseId_idx";
+DROP INDEX "StudentAttendance_sessionId_idx";
+DROP INDEX "StudentAttendance_status_idx";
+DROP INDEX "StudentAttendance_sessionId_studentId_key";
+
+-- CreateTable
+CREATE TABLE "StudentAttendance" (
+    "id" TEXT NOT NULL,
+    "sessionId" TEXT NOT NULL,
+    "studentId" TEXT NOT NULL,
+    "courseId" TEXT NOT NULL,
+    "status" "AttendanceStatus" NOT NULL,
+    "markedById" TEXT NOT NULL,
+    "remarks" TEXT,
+    "markedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updatedAt" TIMESTAMP(3) NOT NULL,
+
+    CONSTRAINT "StudentAttendance_pkey" PRIMARY KEY ("id", "markedAt")
+) PARTITION BY RANGE ("markedAt");
+
+CREATE TABLE "StudentAttendance_default" PARTITION OF "StudentAttendance" DEFAULT;
+
+-- One partition per month from the oldest row until three months ahead
+DO $$
+DECLARE
+    first_day TIMESTAMP := date_trunc('month', COALESCE(
+        (SELECT min("markedAt") FROM "StudentAttendance_unpartitioned"), LOCALTIMESTAMP
+    ));
+BEGIN
+    WHILE first_day <= date_trunc('month', LOCALTIMESTAMP) + interval '3 months' LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF "StudentAttendance" FOR VALUES FROM (%L) TO (%L)',
+            'StudentAttendance_' || to_char(first_day, 'YYYY_MM'), first_day, first_day + interval '1 month'
+        );
+        first_day := first_day + interval '1 month';
+    END LOOP;
+END $$;
+
+-- CreateIndex
+-- (studentId, markedAt) and (courseId, markedAt) let the newest-first lists
+-- merge per-partition index scans and stop after one page
+CREATE INDEX "StudentAttendance_studentId_markedAt_idx" ON "StudentAttendance"("studentId", "markedAt");
+
+-- CreateIndex
+CREATE INDEX "StudentAttendance_courseId_markedAt_idx" ON "StudentAttendance"("courseId", "markedAt");
+
+-- CreateIndex
+CREATE INDEX "StudentAttendance_sessionId_idx" ON "StudentAttendance"("sessionId");
+
+-- CreateIndex
+CREATE INDEX "StudentAttendance_status_idx" ON "StudentAttendance"("status");
+
+-- Copy the rows before the trigger exists; they are unique already
+INSERT INTO "StudentAttendance" ("id", "sessionId", "studentId", "courseId", "status", "markedById", "remarks", "markedAt", "updatedAt")
+SELECT "id", "sessionId", "studentId", "courseId", "status", "markedById", "remarks", "markedAt", "updatedAt"
+FROM "StudentAttendance_unpartitioned";
+
+DROP TABLE "StudentAttendance_unpartitioned";
+
+-- One mark per student and session, across all partitions
+CREATE FUNCTION "StudentAttendance_unique_mark"() RETURNS trigger AS $$
+BEGIN
+    -- Serialize concurrent marks of the same pair; the sessionId index keeps the check cheap
+    PERFORM pg_advisory_xact_lock(hashtext(NEW."sessionId" || '/' || NEW."studentId"));
+    IF EXISTS (
+        SELECT 1 FROM "StudentAttendance"
+        WHERE "sessionId" = NEW."sessionId" AND "studentId" = NEW."studentId" AND "id" <> NEW."id"
+    ) THEN
+        RAISE EXCEPTION 'Attendance of student % in session % is already marked', NEW."studentId", NEW."sessionId"
+            USING ERRCODE = 'unique_violation', CONSTRAINT = 'StudentAttendance_sessionId_studentId_key';
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER "StudentAttendance_unique_mark"
+BEFORE INSERT OR UPDATE OF "sessionId", "studentId" ON "StudentAttendance"
+FOR EACH ROW EXECUTE FUNCTION "StudentAttendance_unique_mark"();
+
+-- AddForeignKey
+ALTER TABLE "StudentAttendance" ADD CONSTRAINT "StudentAttendance_sessionId_fkey" FOREIGN KEY ("sessionId") REFERENCES "ClassSession"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "StudentAttendance" ADD CONSTRAINT "StudentAttendance_studentId_fkey" FOREIGN KEY ("studentId") REFERENCES "Student"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "StudentAttendance" ADD CONSTRAINT "StudentAttendance_courseId_fkey" FOREIGN KEY ("courseId") REFERENCES "Course"("id") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "StudentAttendance" ADD CONSTRAINT "StudentAttendance_markedById_fkey" FOREIGN KEY ("markedById") REFERENCES "Teacher"("id") ON DELETE RESTRICT ON UPDATE CASCADE;
+
+ANALYZE "StudentAttendance";
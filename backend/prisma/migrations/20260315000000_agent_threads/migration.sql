@@ -0,0 +1,8 @@
+-- Rolling summaries of agent threads are stored as SYSTEM messages
+ALTER TYPE "ChatRole" ADD VALUE 'SYSTEM';
+
+-- Turns of a thread are read newest first; this also serves lookups by threadId alone
+CREATE INDEX "ChatMessage_threadId_createdAt_idx" ON "ChatMessage"("threadId", "createdAt");
+
+-- DropIndex
+DROP INDEX "ChatMessage_threadId_idx";
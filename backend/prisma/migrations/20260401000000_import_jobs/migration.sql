@@ -0,0 +1,13 @@
+-- Background import jobs are polled from any worker, so their reports live in the database
+CREATE TABLE "ImportJob" (
+    "id" TEXT NOT NULL,
+    "kind" TEXT NOT NULL,
+    "report" JSONB NOT NULL,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updatedAt" TIMESTAMP(3) NOT NULL,
+
+    CONSTRAINT "ImportJob_pkey" PRIMARY KEY ("id")
+);
+
+-- Expired jobs are deleted by age
+CREATE INDEX "ImportJob_updatedAt_idx" ON "ImportJob"("updatedAt");
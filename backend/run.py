@@ -1,9 +1,49 @@
+import argparse
+import glob
+import os
+import tempfile
 import uvicorn
+from src.config.settings import settings
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "src.main:app",
-        host="127.0.0.1",
-        port=8000,
-        reload=True
-    )
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the College Management System API")
+    parser.add_argument("--prod", action="store_true", default=settings.APP_ENV == "production",
+                        help="Multiple workers, no reload (default when APP_ENV=production)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=settings.WEB_WORKERS or os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    if args.prod:
+        # Workers inherit this and leave metrics snapshots there for /metrics to add up;
+        # start from an empty directory so a previous run's counters are not counted again
+        metrics_dir = settings.METRICS_DIR or tempfile.mkdtemp(prefix="cms-metrics-")
+        os.makedirs(metrics_dir, exist_ok=True)
+        for path in glob.glob(os.path.join(metrics_dir, "*.json")):
+            os.remove(path)
+        os.environ["METRICS_DIR"] = metrics_dir
+
+        # Workers check the invalidation files there on every cache lookup; they all start
+        # with empty caches, so old files are only in the way
+        cache_sync_dir = settings.CACHE_SYNC_DIR or tempfile.mkdtemp(prefix="cms-cache-sync-")
+        os.makedirs(cache_sync_dir, exist_ok=True)
+        for path in glob.glob(os.path.join(cache_sync_dir, "*.invalidations")):
+            os.remove(path)
+        os.environ["CACHE_SYNC_DIR"] = cache_sync_dir
+
+        # Each worker is its own process with its own Prisma pools of DB_POOL_SIZE
+        uvicorn.run(
+            "src.main:app",
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            timeout_graceful_shutdown=settings.SHUTDOWN_GRACE_SECONDS,
+            proxy_headers=True
+        )
+    else:
+        uvicorn.run(
+            "src.main:app",
+            host=args.host,
+            port=args.port,
+            reload=True
+        )
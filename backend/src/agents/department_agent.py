@@ -4,35 +4,87 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import SystemMessage
 from langgraph.prebuilt import ToolNode
 from src.graph.agent_state import AgentState
+from src.config.settings import settings
+from src.utils.circuit_breaker import CircuitBreaker
 import os
 from dotenv import  load_dotenv
 
 load_dotenv()
 
+SYSTEM_PROMPT = SystemMessage(content="""You are a helpful assistant for managing departments.
+                You have access to tools to list, get, create, update, and delete departments.
+                Always provide clear and concise responses to the user.""")
 
-def create_department_agent():
-    tools=[list_all_departments,delete_existing_department,get_department_by_id,update_existing_department,create_new_department
+READ_ONLY_PROMPT = SystemMessage(content="""You are a helpful assistant for looking up departments.
+                You have access to tools to list departments and get a department by its id.
+                You cannot create, update or delete departments; tell the user to ask an administrator.
+                Always provide clear and concise responses to the user.""")
 
-    ]
-    llm = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    temperature=1.0, 
-    google_api_key=os.getenv("GOOGLE_API_KEY")
+# The compiled graphs and the LLM client keep no state between runs, so one instance serves every request
+_agents = {}
+_llm = None
 
-    )
-    
-    llm_with_tools=llm.bind_tools(tools)
 
-    def call_model(state:AgentState):
-        messages=state["messages"]
+class ModelUnavailable(Exception):
+    """A model call failed, timed out or was refused by the open breaker"""
 
-        if(len(messages)==1):
-            system_msg=SystemMessage(content="""You are a helpful assistant for managing departments.
-                You have access to tools to list, get, create, update, and delete departments.
-                Always provide clear and concise responses to the user.""")
-            messages=[system_msg]+messages
 
-        response=llm_with_tools.invoke(messages)
+# Every call to the model API goes through this breaker, so a slow or failing API fails fast
+model_breaker = CircuitBreaker(
+    "model",
+    failure_threshold=settings.AGENT_BREAKER_FAILURES,
+    slow_call_seconds=settings.AGENT_MODEL_SLOW_CALL_SECONDS,
+    reset_seconds=settings.AGENT_BREAKER_RESET_SECONDS,
+    timeout=settings.AGENT_MODEL_TIMEOUT_SECONDS
+)
+
+
+def message_text(content) -> str:
+    """Message content is a string or, for Gemini, a list of parts"""
+    if isinstance(content, str):
+        return content
+    return "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+
+
+def get_llm():
+    """The shared chat model client, also used without tools to summarize threads"""
+    global _llm
+    if _llm is None and settings.AGENT_LLM == "fake":
+        from src.agents.fake_llm import ScriptedChatModel
+        _llm = ScriptedChatModel.from_settings()
+    if _llm is None:
+        _llm = ChatGoogleGenerativeAI(
+        model="gemini-2.5-flash",
+        temperature=1.0, 
+        google_api_key=os.getenv("GOOGLE_API_KEY")
+
+        )
+    return _llm
+
+
+def create_department_agent(read_only: bool = False):
+    tools=[list_all_departments,delete_existing_department,get_department_by_id,update_existing_department,create_new_department
+
+    ]
+    prompt=SYSTEM_PROMPT
+    if read_only:
+        # Users who may not change departments never get the write tools offered
+        tools=[list_all_departments,get_department_by_id]
+        prompt=READ_ONLY_PROMPT
+    llm_with_tools=get_llm().bind_tools(tools)
+
+    async def call_model(state:AgentState):
+        # Earlier turns of a thread arrive as messages, anything older as a summary
+        system_msg=prompt
+        if state.get("summary"):
+            system_msg=SystemMessage(content=prompt.content+"\n\nSummary of the earlier conversation:\n"+state["summary"])
+        messages=[system_msg]+state["messages"]
+
+        # Async call: the event loop keeps serving other requests while the model answers
+        try:
+            response=await model_breaker.call(lambda: llm_with_tools.ainvoke(messages))
+        except Exception as e:
+            raise ModelUnavailable(str(e) or type(e).__name__) from e
         return {"messages":[response]}
     
     def should_continue(state:AgentState):
@@ -52,4 +104,11 @@ def create_department_agent():
 
     workflow.add_edge("tools","agent")
 
-    return workflow.compile()
\ No newline at end of file
+    return workflow.compile()
+
+
+def get_department_agent(read_only: bool = False):
+    """The shared department agent, built on first use; the LLM client and its connections are reused"""
+    if read_only not in _agents:
+        _agents[read_only] = create_department_agent(read_only)
+    return _agents[read_only]
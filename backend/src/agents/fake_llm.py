@@ -0,0 +1,157 @@
+import asyncio
+import json
+import re
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from src.config.settings import settings
+
+# Offline stand-in for Gemini, selected with AGENT_LLM=fake. A script is a
+# list of rules tried in order against the last user message; the first
+# rule whose pattern matches plays its steps, one per model call of the run:
+# a step with "tool" asks for that tool call, a step with "content" answers.
+# Named groups of the pattern fill {placeholders} in tool arguments.
+# A step may set its own "latency_ms", and a step with "error" fails the call
+# with that message after its latency, which stands in for a slow or failing
+# model API, e.g. [{"pattern": "", "steps": [{"error": "503 overloaded", "latency_ms": 3000}]}]
+DEFAULT_SCRIPT: List[Dict[str, Any]] = [
+    {
+        "pattern": r"department (?P<id>c[a-z0-9]{20,})",
+        "steps": [
+            {"tool": "get_department_by_id", "args": {"department_id": "{id}"}},
+            {"content": "Here are the details of that department."},
+        ],
+    },
+    {
+        "pattern": r"create (?:a )?department (?P<name>[\w ]+?) with code (?P<code>\w+)",
+        "steps": [
+            {"tool": "create_new_department", "args": {"name": "{name}", "code": "{code}"}},
+            {"content": "The department has been created."},
+        ],
+    },
+    {
+        "pattern": r"list|all|show|how many|which",
+        "steps": [
+            {"tool": "list_all_departments", "args": {}},
+            {"content": "These are the departments in the college."},
+        ],
+    },
+    {
+        "pattern": "",
+        "steps": [{"content": "I can list, show, create, update and delete departments."}],
+    },
+]
+
+
+def _tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+class ScriptedModelError(Exception):
+    """The failure of an error step"""
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Deterministic tool-calling chat model that replays a script after a fixed latency"""
+
+    script: List[Dict[str, Any]] = DEFAULT_SCRIPT
+    latency_ms: float = 0.0
+
+    @classmethod
+    def from_settings(cls) -> "ScriptedChatModel":
+        script = DEFAULT_SCRIPT
+        if settings.AGENT_FAKE_LLM_SCRIPT:
+            with open(settings.AGENT_FAKE_LLM_SCRIPT) as f:
+                script = json.load(f)
+        return cls(script=script, latency_ms=settings.AGENT_FAKE_LLM_LATENCY_MS)
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "ScriptedChatModel":
+        # The script names the tools itself
+        return self
+
+    def _reply(self, messages: List[BaseMessage]) -> Tuple[float, AIMessage, Optional[str]]:
+        """Seconds to wait, then the reply, or the error to raise instead"""
+        last_human = max((i for i, message in enumerate(messages) if isinstance(message, HumanMessage)), default=-1)
+        question = messages[last_human].content if last_human >= 0 else ""
+        step_index = sum(1 for message in messages[last_human + 1:] if isinstance(message, AIMessage))
+
+        for rule in self.script:
+            found = re.search(rule["pattern"], question, re.IGNORECASE)
+            if found:
+                break
+        else:
+            return self.latency_ms / 1000, AIMessage(content=""), None
+        step = rule["steps"][min(step_index, len(rule["steps"]) - 1)]
+        latency = step.get("latency_ms", self.latency_ms) / 1000
+        if "error" in step:
+            return latency, AIMessage(content=""), step["error"]
+
+        usage = {
+            "input_tokens": sum(_tokens(str(message.content)) for message in messages),
+            "output_tokens": _tokens(step.get("content", "")),
+        }
+        usage["total_tokens"] = usage["input_tokens"] + usage["output_tokens"]
+        if "tool" in step:
+            groups = {name: value or "" for name, value in found.groupdict().items()}
+            args = {name: value.format(**groups) if isinstance(value, str) else value for name, value in step["args"].items()}
+            return latency, AIMessage(
+                content="",
+                tool_calls=[{"name": step["tool"], "args": args, "id": f"call_{len(messages)}_{step_index}"}],
+                usage_metadata=usage
+            ), None
+        return latency, AIMessage(content=step["content"], usage_metadata=usage), None
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        latency, message, error = self._reply(messages)
+        time.sleep(latency)
+        if error:
+            raise ScriptedModelError(error)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        latency, message, error = self._reply(messages)
+        await asyncio.sleep(latency)
+        if error:
+            raise ScriptedModelError(error)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        latency, message, error = self._reply(messages)
+        time.sleep(latency)
+        if error:
+            raise ScriptedModelError(error)
+        yield from self._chunks(message)
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        # The whole latency goes before the first token, like time to first token of a real model
+        latency, message, error = self._reply(messages)
+        await asyncio.sleep(latency)
+        if error:
+            raise ScriptedModelError(error)
+        for chunk in self._chunks(message):
+            if run_manager and chunk.text:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    def _chunks(self, message: AIMessage) -> Iterator[ChatGenerationChunk]:
+        if message.tool_calls:
+            yield ChatGenerationChunk(message=AIMessageChunk(
+                content="",
+                tool_call_chunks=[
+                    {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": i}
+                    for i, call in enumerate(message.tool_calls)
+                ],
+                usage_metadata=message.usage_metadata
+            ))
+            return
+        words = re.findall(r"\S+\s*", message.content) or [""]
+        for i, word in enumerate(words):
+            # Usage is reported once per message, as streaming APIs do on the last chunk
+            usage = message.usage_metadata if i == len(words) - 1 else None
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word, usage_metadata=usage))
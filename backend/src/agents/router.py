@@ -0,0 +1,266 @@
+import re
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Optional, Tuple
+from prisma import Prisma
+from src.agents.department_agent import get_department_agent
+from src.config.database import reader_for
+from src.services.department_service import DepartmentService
+from src.utils.loaders import load
+from src.utils.pagination import MAX_PAGE_SIZE, PageParams
+
+# Cheap local classifier in front of the LLM agents. A question is answered
+# straight from the services when one intent explains every word of it:
+# intents name the words they understand and the words they need, and any
+# word no intent knows (a filter, a write verb, "why", "compare") sends the
+# question to the model instead. Wrong fast answers are worse than slow ones,
+# so anything ambiguous goes to the model too.
+
+# Longer questions are rarely simple lookups
+MAX_WORDS = 12
+
+_STOPWORDS = {"a", "an", "the", "please", "can", "could", "would", "you", "to", "of", "is", "are", "there",
+              "do", "does", "what", "s", "me", "tell", "let", "know", "in", "for", "our", "all", "every", "total",
+              "currently", "current", "college", "we", "have", "now", "right", "so", "far", "about"}
+_SYNONYMS = {"show": "list", "display": "list", "get": "list", "give": "list", "see": "list", "view": "list",
+             "which": "list", "dept": "department", "depts": "department", "attendence": "attendance",
+             "mine": "my", "am": "i", "taught": "teach", "teaching": "teach", "enrolled": "enroll",
+             "registered": "enroll", "taking": "enroll", "subject": "course", "class": "course"}
+_PHRASES = [(re.compile(r"\bhow many\b|\bnumber of\b|\bcount of\b"), " count ")]
+# Course codes like CD252IA, and department codes like CSE written in capitals
+_COURSE_CODE = re.compile(r"\b(?P<course_code>[A-Za-z]{2,}\d{2,}[A-Za-z]*)\b")
+_DEPARTMENT_CODE = re.compile(r"\b(?P<code>[A-Z]{2,8})\b")
+
+_ENTITIES = {"department": "Department", "course": "Course", "student": "Student", "teacher": "Teacher"}
+
+Handler = Callable[[Prisma, Any, Dict[str, str]], Awaitable[str]]
+
+
+def tokenize(query: str) -> List[str]:
+    """Lower-cased words without filler, with synonyms folded and plurals stemmed"""
+    text = query.lower()
+    for pattern, replacement in _PHRASES:
+        text = pattern.sub(replacement, text)
+    tokens = []
+    for word in re.findall(r"[a-z0-9]+", text):
+        word = _SYNONYMS.get(word, word)
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss") and not any(c.isdigit() for c in word):
+            word = _SYNONYMS.get(word[:-1], word[:-1])
+        if word not in _STOPWORDS:
+            tokens.append(word)
+    return tokens
+
+
+class Intent:
+    """A structured question: the words it needs, the words it allows, who may ask it and its handler"""
+
+    def __init__(
+        self,
+        name: str,
+        handler: Handler,
+        required: FrozenSet[str],
+        allowed: FrozenSet[str],
+        pattern: Optional[re.Pattern] = None,
+        roles: Optional[FrozenSet[str]] = None
+    ):
+        self.name = name
+        self.handler = handler
+        self.required = required
+        self.allowed = allowed | required
+        # Must match when given; named groups become the handler's arguments and count as understood words
+        self.pattern = pattern
+        self.roles = roles
+
+    def match(self, query: str, tokens: List[str], role: Optional[str]) -> Optional[Tuple[float, Dict[str, str]]]:
+        """(score, arguments) when this intent explains the whole question"""
+        if self.roles is not None and role not in self.roles:
+            return None
+        if not self.required.issubset(tokens):
+            return None
+        arguments: Dict[str, str] = {}
+        if self.pattern is not None:
+            # The first match that is not itself one of the intent's words, so "LIST" is not a code
+            found = next((found for found in self.pattern.finditer(query)
+                          if not any(value.lower() in self.allowed for value in found.groupdict().values())), None)
+            if found is None:
+                return None
+            arguments = found.groupdict()
+            consumed = {value.lower() for value in arguments.values()}
+            tokens = [token for token in tokens if token not in consumed]
+        if any(token not in self.allowed for token in tokens):
+            return None
+        # More specific intents, with more required words and arguments, win ties
+        return len(self.required) + len(arguments), arguments
+
+
+def _counter(entity: str) -> Handler:
+    async def count(db: Prisma, user: Any, arguments: Dict[str, str]) -> str:
+        if entity == "department":
+            total = await DepartmentService(db).count_departments()
+        else:
+            total = await getattr(reader_for(db), _ENTITIES[entity].lower()).count()
+        return f"There {'is' if total == 1 else 'are'} {total} {entity}{'' if total == 1 else 's'}."
+    return count
+
+
+async def _list_departments(db: Prisma, user: Any, arguments: Dict[str, str]) -> str:
+    departments = await DepartmentService(db).list_departments(PageParams(limit=MAX_PAGE_SIZE))
+    if not departments.items:
+        return "There are no departments yet."
+    lines = [f"- {department.name} ({department.code})" for department in departments.items]
+    more = "\n(and more; ask for a department by its code)" if departments.next_cursor else ""
+    return "The departments are:\n" + "\n".join(lines) + more
+
+
+async def _department_by_code(db: Prisma, user: Any, arguments: Dict[str, str]) -> str:
+    department = await DepartmentService(db).get_department_by_code(arguments["code"])
+    if not department:
+        return f"There is no department with code {arguments['code']}."
+    details = [f"{department.name} ({department.code})"]
+    if department.hodName:
+        details.append(f"Head of department: {department.hodName}")
+    if department.description:
+        details.append(department.description)
+    return "\n".join(details)
+
+
+def _percentage(present: int, total: int) -> str:
+    # Same rule as the attendance reports: only PRESENT counts as present
+    return f"{present / total * 100:.1f}%" if total else "no classes yet"
+
+
+async def _my_attendance(db: Prisma, user: Any, arguments: Dict[str, str]) -> str:
+    student = await load(db, "Student", user.id, by="userId")
+    if not student:
+        return "You do not have a student profile."
+    where: Dict[str, Any] = {"studentId": student.id}
+    course = None
+    if arguments.get("course_code"):
+        course = await load(db, "Course", arguments["course_code"].upper(), by="courseCode")
+        if not course:
+            return f"There is no course with code {arguments['course_code'].upper()}."
+        where["courseId"] = course.id
+
+    rows = await reader_for(db).studentattendance.group_by(["courseId", "status"], where=where, count=True)
+    counts: Dict[str, Dict[str, int]] = {}
+    for row in rows:
+        counts.setdefault(row["courseId"], {})[row["status"]] = row["_count"]["_all"]
+
+    if course:
+        statuses = counts.get(course.id, {})
+        total = sum(statuses.values())
+        if not total:
+            return f"No attendance has been marked for you in {course.courseCode} ({course.courseName}) yet."
+        return (f"Your attendance in {course.courseCode} ({course.courseName}): {statuses.get('PRESENT', 0)} of {total} "
+                f"classes present ({_percentage(statuses.get('PRESENT', 0), total)}), {statuses.get('LATE', 0)} late.")
+
+    if not counts:
+        return "No attendance has been marked for you yet."
+    courses = {c.id: c for c in await reader_for(db).course.find_many(where={"id": {"in": list(counts)}})}
+    lines = []
+    for course_id, statuses in sorted(counts.items(), key=lambda item: courses[item[0]].courseCode if item[0] in courses else ""):
+        total = sum(statuses.values())
+        code = courses[course_id].courseCode if course_id in courses else course_id
+        lines.append(f"- {code}: {statuses.get('PRESENT', 0)} of {total} ({_percentage(statuses.get('PRESENT', 0), total)})")
+    present = sum(statuses.get("PRESENT", 0) for statuses in counts.values())
+    total = sum(sum(statuses.values()) for statuses in counts.values())
+    return f"Your attendance is {_percentage(present, total)} overall ({present} of {total} classes present):\n" + "\n".join(lines)
+
+
+async def _my_courses(db: Prisma, user: Any, arguments: Dict[str, str]) -> str:
+    if user.role == "TEACHER":
+        teacher = await load(db, "Teacher", user.id, by="userId")
+        courses = await reader_for(db).course.find_many(
+            where={"teacherId": teacher.id}, order={"courseCode": "asc"}
+        ) if teacher else []
+        empty = "You are not teaching any courses."
+    else:
+        student = await load(db, "Student", user.id, by="userId")
+        enrollments = await reader_for(db).enrollment.find_many(
+            where={"studentId": student.id, "status": "ACTIVE"}, include={"course": True}
+        ) if student else []
+        courses = sorted((enrollment.course for enrollment in enrollments), key=lambda course: course.courseCode)
+        empty = "You are not enrolled in any courses."
+    if not courses:
+        return empty
+    return "Your courses are:\n" + "\n".join(f"- {course.courseCode}: {course.courseName}" for course in courses)
+
+
+_MY_ATTENDANCE_WORDS = frozenset({"list", "percentage", "overall", "course", "how", "much", "good", "i", "at"})
+INTENTS: List[Intent] = [
+    *(Intent(f"count_{entity}s", _counter(entity), frozenset({"count", entity}), frozenset({"list"})) for entity in _ENTITIES),
+    Intent("list_departments", _list_departments, frozenset({"department"}), frozenset({"list", "name", "code"})),
+    Intent(
+        "department_by_code", _department_by_code, frozenset({"department"}),
+        frozenset({"list", "code", "detail", "info", "information"}), pattern=_DEPARTMENT_CODE
+    ),
+    Intent(
+        "my_attendance", _my_attendance, frozenset({"my", "attendance"}), _MY_ATTENDANCE_WORDS,
+        roles=frozenset({"STUDENT"})
+    ),
+    Intent(
+        "my_course_attendance", _my_attendance, frozenset({"my", "attendance"}), _MY_ATTENDANCE_WORDS,
+        pattern=_COURSE_CODE, roles=frozenset({"STUDENT"})
+    ),
+    # Only questions about the user's own courses; "list courses" is about every course and goes to the model
+    Intent(
+        "my_courses", _my_courses, frozenset({"course", "my"}), frozenset({"list"}),
+        roles=frozenset({"STUDENT", "TEACHER"})
+    ),
+    Intent(
+        "my_courses", _my_courses, frozenset({"course", "i", "teach"}), frozenset({"my", "list"}),
+        roles=frozenset({"TEACHER"})
+    ),
+    Intent(
+        "my_courses", _my_courses, frozenset({"course", "i", "enroll"}), frozenset({"my", "list"}),
+        roles=frozenset({"STUDENT"})
+    ),
+]
+
+
+def classify(query: str, role: Optional[str]) -> Optional[Tuple[Intent, Dict[str, str]]]:
+    """The intent that explains every word of query, or None when it needs the model"""
+    tokens = tokenize(query)
+    if not tokens or len(tokens) > MAX_WORDS:
+        return None
+    best: Optional[Tuple[float, Intent, Dict[str, str]]] = None
+    for intent in INTENTS:
+        matched = intent.match(query, tokens, role)
+        if matched and (best is None or matched[0] > best[0]):
+            best = (matched[0], intent, matched[1])
+    return (best[1], best[2]) if best else None
+
+
+async def route(query: str, user: Any, db: Prisma) -> Optional[Tuple[str, str]]:
+    """(intent name, answer) when the question was answered without the model"""
+    matched = classify(query, user.role if user else None)
+    if matched is None:
+        return None
+    intent, arguments = matched
+    return intent.name, await intent.handler(db, user, arguments)
+
+
+async def fallback(query: str, user: Any, db: Prisma) -> str:
+    """
+    The answer while the model cannot be used: department questions still get
+    the department, or the list of departments, straight from the service.
+    """
+    unavailable = "The assistant is unavailable right now, please try again in a little while."
+    if "department" not in tokenize(query):
+        return unavailable
+    code = _DEPARTMENT_CODE.search(query)
+    if code:
+        return unavailable + "\n\n" + await _department_by_code(db, user, code.groupdict())
+    return unavailable + "\n\n" + await _list_departments(db, user, {})
+
+
+def permission_scope(user: Any) -> str:
+    """What the user's agent may do; questions of users in the same scope get the same answers"""
+    return "ADMIN" if user and user.role == "ADMIN" else "READ_ONLY"
+
+
+def agent_for(user: Any):
+    """
+    The LLM agent for an open-ended question. Only the department agent
+    exists so far: administrators get all of its tools, everyone else the
+    read-only version.
+    """
+    return get_department_agent(read_only=permission_scope(user) != "ADMIN")
@@ -1,13 +1,18 @@
-from fastapi import HTTPException, Depends, status
+from typing import Optional
+from fastapi import HTTPException, Depends, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from prisma import Prisma
 from src.config.database import get_db
+from src.utils.loaders import load
 from src.utils.jwt import verify_token
+from src.utils.pagination import PageParams, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from src.utils.fieldsets import FieldSet
 from src.services.user_service import UserService
 from src.models.schemas import UserResponse
 
 
 security =HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
 async def get_current_user(db:Prisma=Depends(get_db),credentials:HTTPAuthorizationCredentials=Depends(security)):
@@ -51,13 +56,21 @@ async def get_current_user(db:Prisma=Depends(get_db),credentials:HTTPAuthorizati
             detail=f"Could not validate credentials: {str(e)}"  # Show actual error
         )
     
+async def get_optional_user(
+    db: Prisma = Depends(get_db),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+):
+    """The current user when a bearer token was sent, None for anonymous requests"""
+    if credentials is None:
+        return None
+    return await get_current_user(db, credentials)
+
+
 async def get_current_student(
     db: Prisma = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user)
 ):
-    student = await db.student.find_first(where={
-        "userId": current_user.id
-    })
+    student = await load(db, "Student", current_user.id, by="userId")
 
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
@@ -68,9 +81,7 @@ async def get_current_teacher(
     db: Prisma = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user)
 ):
-    teacher = await db.teacher.find_first(
-        where={"userId": current_user.id}
-    )
+    teacher = await load(db, "Teacher", current_user.id, by="userId")
     if not teacher:
         raise HTTPException(status_code=404, detail="Teacher not found")
     return teacher
@@ -80,12 +91,27 @@ async def get_current_admin(
     db: Prisma = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user)
 ):
-    admin = await db.admin.find_first(
-        where={"userId": current_user.id}
-    )
+    admin = await load(db, "Admin", current_user.id, by="userId")
     if not admin:
         raise HTTPException(status_code=404, detail="Admin not found")
     return admin
-    
 
 
+def get_page_params(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Id of the last item of the previous page"),
+    skip: int = Query(0, ge=0),
+    with_total: bool = Query(False, description="Include an estimated total in X-Total-Count")
+) -> PageParams:
+    return PageParams(limit=limit, cursor=cursor, skip=skip, with_total=with_total)
+
+
+def _split_csv(value: Optional[str]) -> list:
+    return [part.strip() for part in value.split(",") if part.strip()] if value else []
+
+
+def get_fieldset(
+    fields: Optional[str] = Query(None, description="Comma separated columns to return, e.g. id,studentId,user.name"),
+    include: Optional[str] = Query(None, description="Comma separated relations to load, e.g. user")
+) -> FieldSet:
+    return FieldSet(fields=_split_csv(fields), include=_split_csv(include))
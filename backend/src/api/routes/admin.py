@@ -1,16 +1,19 @@
-from fastapi import HTTPException,APIRouter,Depends,status
+from fastapi import HTTPException,APIRouter,Depends,Response,status
 from typing import List
 from prisma import Prisma
 from src.services.student_service import StudentService
 from src.services.teacher_service import TeacherService
 from src.services.admin_service import AdminService
 from src.services.user_service import UserService
-from src.api.dependencies import get_current_user, get_current_admin, get_db
+from src.api.dependencies import get_current_user, get_current_admin, get_db, get_page_params
+from src.utils.pagination import PageParams, with_page_headers
+from src.utils.serialization import json_response
 from src.models.schemas import (
     UserResponse, 
     UserCreate, 
     UserUpdate,
     AdminResponse,
+    AdminOut,
     StudentResponse,
     TeacherResponse
 )
@@ -19,9 +22,10 @@ router=APIRouter(prefix="/api/admin",tags=["admin"])
 
 #User managemnet 
 @router.get("/users",response_model=List[UserResponse])
-async def get_all_users(db:Prisma=Depends(get_db),currentadmin=Depends(get_current_admin)):
+async def get_all_users(response:Response,page:PageParams=Depends(get_page_params),db:Prisma=Depends(get_db),currentadmin=Depends(get_current_admin)):
     user_service=UserService(db)
-    return await user_service.list_users()
+    users=await user_service.list_users(page)
+    return json_response(response,with_page_headers(response,users),List[UserResponse])
 
 @router.get("/users/{user_id}",response_model=UserResponse)
 async def get_user(user_id:str,db:Prisma=Depends(get_db),currentadmin=Depends(get_current_admin)):
@@ -104,19 +108,38 @@ async def delete_user(
 
 @router.get("/students", response_model=List[StudentResponse])
 async def get_all_students(
+    response: Response,
+    page: PageParams = Depends(get_page_params),
     db: Prisma = Depends(get_db),
     current_admin = Depends(get_current_admin)
 ):
-    """Get all students (Admin only)"""
+    """Get a page of students (Admin only)"""
     student_service = StudentService(db)
-    return await student_service.get_all_students()
+    students = await student_service.list_students(page)
+    return json_response(response, with_page_headers(response, students), List[StudentResponse])
+
+# Admin Management
+@router.get("/admins", response_model=List[AdminOut])
+async def get_all_admins(
+    response: Response,
+    page: PageParams = Depends(get_page_params),
+    db: Prisma = Depends(get_db),
+    current_admin = Depends(get_current_admin)
+):
+    """Get a page of admins, newest first (Admin only)"""
+    admin_service = AdminService(db)
+    admins = await admin_service.list_admins(page)
+    return json_response(response, with_page_headers(response, admins), List[AdminOut])
 
 # Teacher Management
 @router.get("/teachers", response_model=List[TeacherResponse])
 async def get_all_teachers(
+    response: Response,
+    page: PageParams = Depends(get_page_params),
     db: Prisma = Depends(get_db),
     current_admin = Depends(get_current_admin)
 ):
-    """Get all teachers (Admin only)"""
+    """Get a page of teachers (Admin only)"""
     teacher_service = TeacherService(db)
-    return await teacher_service.get_all_teachers()
\ No newline at end of file
+    teachers = await teacher_service.list_teachers(page)
+    return json_response(response, with_page_headers(response, teachers), List[TeacherResponse])
\ No newline at end of file
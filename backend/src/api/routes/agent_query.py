@@ -1,37 +1,326 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from prisma import Prisma
 from pydantic import BaseModel
 from langchain_core.messages import HumanMessage
-from src.agents.department_agent import create_department_agent
+from src.agents.department_agent import ModelUnavailable, message_text, model_breaker
+from src.agents.router import agent_for, fallback, permission_scope, route
+from src.api.dependencies import get_optional_user
+from src.config.database import get_db
+from src.config.settings import settings
+from src.services.agent_thread_service import AgentThreadService, usage_of
+from src.utils.agent_limits import AgentBusy, agent_limiter, single_flight
+from src.utils.answer_cache import answer_cache, is_read_only, normalize
+from src.utils.metrics import AGENT_QUERIES
+from src.utils.tool_cache import TRACE_EVENT
 
 router = APIRouter()
 
 class QueryRequest(BaseModel):
     query: str
+    # Continue a conversation; signed-in users get a new thread id when it is left out
+    thread_id: Optional[str] = None
 
 class QueryResponse(BaseModel):
     answer: str
+    thread_id: Optional[str] = None
+    # True when the answer of an earlier, similar question was reused
+    cached: bool = False
+    # The intent the router answered from the services without the model
+    intent: Optional[str] = None
+    # True when an identical question asked at the same time shared its run
+    coalesced: bool = False
+    # True when the model was unavailable and the answer is a direct lookup or an apology
+    degraded: bool = False
+
+NO_USAGE = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0, "model_calls": 0}
+
+
+def _sse(event: str, data: Dict[str, Any]) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data, default=str) + b"\n\n"
+
+
+async def _graph_input(request: QueryRequest, current_user, db: Prisma) -> Dict[str, Any]:
+    """Thread history and summary for signed-in users, the bare question otherwise"""
+    if current_user is None:
+        if request.thread_id:
+            raise HTTPException(status_code=401, detail="Sign in to continue a thread")
+        return {"thread_id": None, "messages": [HumanMessage(content=request.query)], "summary": None}
+    try:
+        context = await AgentThreadService(db).load(current_user.id, request.thread_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    context["messages"].append(HumanMessage(content=request.query))
+    return context
+
+
+def _cacheable(context: Dict[str, Any]) -> bool:
+    # Follow-up questions depend on the thread, only first questions share answers
+    return len(context["messages"]) == 1 and not context["summary"]
+
+
+def _state(context: Dict[str, Any]) -> Dict[str, Any]:
+    state = {"messages": context["messages"]}
+    if context["summary"]:
+        state["summary"] = context["summary"]
+    return state
+
+
+async def _answer_without_model(request: QueryRequest, context: Dict[str, Any], current_user, db: Prisma) -> Optional[QueryResponse]:
+    """A structured question answered by the router, or an answer from the answer cache"""
+    started = datetime.now(timezone.utc)
+    timer = time.perf_counter()
+    response = None
+    if settings.AGENT_ROUTER:
+        routed = await route(request.query, current_user, db)
+        if routed:
+            response = QueryResponse(answer=routed[1], thread_id=context["thread_id"], intent=routed[0])
+            AGENT_QUERIES.inc(("router",))
+    if response is None and _cacheable(context):
+        hit = answer_cache.lookup(request.query, permission_scope(current_user))
+        if hit:
+            response = QueryResponse(answer=hit[0], thread_id=context["thread_id"], cached=True)
+            AGENT_QUERIES.inc(("cache",))
+    if response and context["thread_id"]:
+        await AgentThreadService(db).record_turn(
+            current_user.id, context["thread_id"], request.query, response.answer, started,
+            time.perf_counter() - timer, NO_USAGE
+        )
+    return response
+
+
+def _flight_key(request: QueryRequest, context: Dict[str, Any], current_user) -> Optional[Tuple[str, str]]:
+    # First questions that only read can share a run with the same question of users who may do the same
+    tokens = normalize(request.query)
+    if not _cacheable(context) or not tokens or not is_read_only(tokens):
+        return None
+    return " ".join(tokens), permission_scope(current_user)
+
+
+async def _join_run(request: QueryRequest, context: Dict[str, Any], current_user, db: Prisma) -> Tuple[Optional[QueryResponse], Optional[asyncio.Future]]:
+    """
+    The answer of an identical question whose run was in progress, or the
+    flight this request now leads and has to settle with its answer.
+    """
+    key = _flight_key(request, context, current_user)
+    if key is None:
+        return None, None
+    started = datetime.now(timezone.utc)
+    timer = time.perf_counter()
+    flight, answer = await single_flight.join(key)
+    if flight is not None:
+        return None, flight
+    AGENT_QUERIES.inc(("coalesced",))
+    if context["thread_id"]:
+        await AgentThreadService(db).record_turn(
+            current_user.id, context["thread_id"], request.query, answer, started,
+            time.perf_counter() - timer, NO_USAGE
+        )
+    return QueryResponse(answer=answer, thread_id=context["thread_id"], coalesced=True), None
+
+
+async def _degraded(request: QueryRequest, context: Dict[str, Any], current_user, db: Prisma) -> QueryResponse:
+    # Not added to the thread, the question was never really answered
+    AGENT_QUERIES.inc(("degraded",))
+    answer = await fallback(request.query, current_user, db)
+    return QueryResponse(answer=answer, thread_id=context["thread_id"], degraded=True)
+
+
+def _client_key(current_user, http_request: Request) -> str:
+    # Anonymous requests are capped per client address
+    if current_user is not None:
+        return current_user.id
+    return "ip:" + (http_request.client.host if http_request.client else "unknown")
+
+
+def _busy(e: AgentBusy) -> HTTPException:
+    return HTTPException(status_code=e.status_code, detail=e.detail, headers={"Retry-After": str(e.retry_after)})
+
 
 @router.post("/query", response_model=QueryResponse)
-async def query_with_agent(request: QueryRequest):
-    
+async def query_with_agent(
+    request: QueryRequest,
+    http_request: Request,
+    current_user=Depends(get_optional_user),
+    db: Prisma = Depends(get_db)
+):
+    context = await _graph_input(request, current_user, db)
+    flight = None
     try:
-        # Create the agent
-        agent = create_department_agent()
+        fast = await _answer_without_model(request, context, current_user, db)
+        if not fast and model_breaker.is_open():
+            return await _degraded(request, context, current_user, db)
+        if fast:
+            return fast
+
+        started = datetime.now(timezone.utc)
+        timer = time.perf_counter()
+        agent = agent_for(current_user)
+        generation = answer_cache.generation
         
-        # Execute the query
-        result = await agent.ainvoke({
-            "messages": [HumanMessage(content=request.query)]
-        })
+        # Execute the query; the deadline covers following an identical run, queueing and the run itself
+        async with asyncio.timeout(settings.AGENT_REQUEST_DEADLINE_SECONDS):
+            fast, flight = await _join_run(request, context, current_user, db)
+            if fast:
+                return fast
+            async with agent_limiter.slot(_client_key(current_user, http_request)):
+                AGENT_QUERIES.inc(("model",))
+                result = await agent.ainvoke(_state(context))
         
         # Extract the final response
         final_message = result["messages"][-1]
-        
-        answer = (final_message.content
-        if isinstance(final_message.content, str)
-        else final_message.content[0]["text"]
-        )
+        answer = message_text(final_message.content)
+        new_messages = result["messages"][len(context["messages"]):]
+        if flight:
+            flight.set_result(answer)
 
-        return QueryResponse(answer=answer)
+        if _cacheable(context):
+            tools_used = [call["name"] for message in new_messages for call in getattr(message, "tool_calls", None) or []]
+            answer_cache.store(request.query, answer, tools_used, generation, permission_scope(current_user))
+        if context["thread_id"]:
+            await AgentThreadService(db).record_turn(
+                current_user.id, context["thread_id"], request.query, answer, started,
+                time.perf_counter() - timer, usage_of(new_messages)
+            )
+        return QueryResponse(answer=answer, thread_id=context["thread_id"])
         
+    except AgentBusy as e:
+        raise _busy(e)
+    except (ModelUnavailable, TimeoutError) as e:
+        # A model call failed or timed out, the breaker opened, or the request ran out of time
+        if flight and not flight.done():
+            # Followers degrade as well instead of each leading another run into the same outage
+            flight.set_exception(ModelUnavailable(str(e) or type(e).__name__))
+        return await _degraded(request, context, current_user, db)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error processing query: {str(e)}")
\ No newline at end of file
+        if flight and not flight.done():
+            flight.set_exception(e)
+        raise HTTPException(status_code=500, detail=f"Error processing query: {str(e)}")
+    finally:
+        # Abandoned or turned away: whoever follows runs the question itself
+        if flight and not flight.done():
+            flight.cancel()
+
+
+async def _agent_events(request: QueryRequest, context: Dict[str, Any], current_user, db: Prisma, http_request: Request) -> AsyncIterator[bytes]:
+    # Sent before the graph starts so the client sees the stream open at once
+    yield _sse("start", {"thread_id": context["thread_id"]})
+    flight = None
+    try:
+        fast = await _answer_without_model(request, context, current_user, db)
+        if not fast and model_breaker.is_open():
+            fast = await _degraded(request, context, current_user, db)
+    except Exception as e:
+        yield _sse("error", {"detail": f"Error processing query: {str(e)}"})
+        return
+    if fast:
+        yield _sse("token", {"text": fast.answer})
+        yield _sse("done", fast.model_dump())
+        return
+
+    started = datetime.now(timezone.utc)
+    timer = time.perf_counter()
+    generation = answer_cache.generation
+    events = None
+    answer = []
+    model_messages = []
+    tools_used = []
+    try:
+        async with asyncio.timeout(settings.AGENT_REQUEST_DEADLINE_SECONDS):
+            fast, flight = await _join_run(request, context, current_user, db)
+            if fast:
+                yield _sse("token", {"text": fast.answer})
+                yield _sse("done", fast.model_dump())
+                return
+            async with agent_limiter.slot(_client_key(current_user, http_request)):
+                AGENT_QUERIES.inc(("model",))
+                events = agent_for(current_user).astream_events(_state(context), version="v2")
+                async for event in events:
+                    if await http_request.is_disconnected():
+                        break
+                    kind = event["event"]
+                    if kind == "on_chat_model_stream":
+                        chunk = event["data"]["chunk"]
+                        text = message_text(chunk.content)
+                        if text:
+                            answer.append(text)
+                            yield _sse("token", {"text": text})
+                    elif kind == "on_chat_model_start":
+                        # Only the last model turn, after all tool results, is the answer
+                        answer.clear()
+                    elif kind == "on_chat_model_end":
+                        model_messages.append(event["data"].get("output"))
+                    elif kind == "on_tool_start":
+                        tools_used.append(event["name"])
+                        yield _sse("tool_start", {"tool": event["name"], "input": event["data"].get("input")})
+                    elif kind == "on_tool_end":
+                        output = event["data"].get("output")
+                        yield _sse("tool_end", {"tool": event["name"], "output": getattr(output, "content", output)})
+                    elif kind == "on_custom_event" and event["name"] == TRACE_EVENT:
+                        yield _sse("tool_cache", event["data"])
+                else:
+                    if flight:
+                        flight.set_result("".join(answer))
+                    if _cacheable(context):
+                        answer_cache.store(request.query, "".join(answer), tools_used, generation, permission_scope(current_user))
+                    if context["thread_id"]:
+                        await AgentThreadService(db).record_turn(
+                            current_user.id, context["thread_id"], request.query, "".join(answer), started,
+                            time.perf_counter() - timer, usage_of(model_messages)
+                        )
+                    yield _sse("done", QueryResponse(answer="".join(answer), thread_id=context["thread_id"]).model_dump())
+    except AgentBusy as e:
+        yield _sse("error", {"detail": e.detail, "status": e.status_code, "retry_after": e.retry_after})
+    except (ModelUnavailable, TimeoutError) as e:
+        if flight and not flight.done():
+            flight.set_exception(ModelUnavailable(str(e) or type(e).__name__))
+        try:
+            fallback_response = await _degraded(request, context, current_user, db)
+        except Exception as e:
+            yield _sse("error", {"detail": f"Error processing query: {str(e)}"})
+        else:
+            yield _sse("token", {"text": fallback_response.answer})
+            yield _sse("done", fallback_response.model_dump())
+    except Exception as e:
+        if flight and not flight.done():
+            flight.set_exception(e)
+        yield _sse("error", {"detail": f"Error processing query: {str(e)}"})
+    finally:
+        if flight and not flight.done():
+            flight.cancel()
+        # Closing the event stream cancels the graph run, including a pending model or tool call
+        if events is not None:
+            await events.aclose()
+
+
+@router.post("/query/stream")
+async def stream_query_with_agent(
+    request: QueryRequest,
+    http_request: Request,
+    current_user=Depends(get_optional_user),
+    db: Prisma = Depends(get_db)
+):
+    """
+    The agent's run as server-sent events: start (with the thread id), token
+    (model text as it is generated), tool_start, tool_cache (whether the
+    tool's result came from the cache), tool_end, then done with the full
+    answer or error. An answer from the router, the answer cache or the run of
+    an identical question asked at the same time arrives as a single token
+    followed by done with intent, cached or coalesced set. When the user or
+    the worker has too many runs going, error carries status 429 or 503.
+    While the model is unavailable (a call failed or timed out, the breaker
+    is open or the request deadline passed) the fallback answer arrives the same way, with
+    degraded set in done. The run is cancelled when the client disconnects, and
+    only completed turns are added to the thread.
+    """
+    context = await _graph_input(request, current_user, db)
+    return StreamingResponse(
+        _agent_events(request, context, current_user, db, http_request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
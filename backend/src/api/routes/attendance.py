@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from typing import List, Optional
 from datetime import datetime
 from src.models.schemas import (
@@ -13,7 +13,10 @@ from src.models.schemas import (
     TeacherAttendanceUpdate
 )
 from src.services.attendance_service import AttendanceService
-from src.api.dependencies import get_current_user, get_db
+from src.api.dependencies import get_current_user, get_db, get_page_params, get_fieldset
+from src.utils.pagination import PageParams, with_page_headers
+from src.utils.fieldsets import FieldSet, fieldset_response
+from src.utils.loaders import load
 from src.models.schemas import UserOut
 from prisma import Prisma
 
@@ -36,15 +39,17 @@ async def create_class_session(
 @router.get("/sessions/{session_id}", response_model=ClassSessionOut)
 async def get_class_session(
     session_id: str,
+    response: Response,
+    fieldset: FieldSet = Depends(get_fieldset),
     current_user: UserOut = Depends(get_current_user),
     db: Prisma = Depends(get_db)
 ):
     """Get a class session by ID."""
     try:
-        session = await AttendanceService.get_class_session_by_id(session_id, db)
+        session = await AttendanceService.get_class_session_by_id(session_id, db, fieldset)
         if not session:
             raise HTTPException(status_code=404, detail="Class session not found")
-        return session
+        return fieldset_response(response, fieldset, session)
     except HTTPException:
         raise
     except Exception as e:
@@ -53,13 +58,17 @@ async def get_class_session(
 @router.get("/sessions/course/{course_id}", response_model=List[ClassSessionOut])
 async def get_course_sessions(
     course_id: str,
+    response: Response,
     date: Optional[datetime] = Query(None),
+    page: PageParams = Depends(get_page_params),
+    fieldset: FieldSet = Depends(get_fieldset),
     current_user: UserOut = Depends(get_current_user),
     db: Prisma = Depends(get_db)
 ):
-    """Get all sessions for a course."""
+    """Get a page of sessions for a course."""
     try:
-        return await AttendanceService.get_course_sessions(course_id, date, db)
+        sessions = await AttendanceService.get_course_sessions(course_id, date, db, page, fieldset)
+        return fieldset_response(response, fieldset, with_page_headers(response, sessions))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -109,9 +118,7 @@ async def mark_attendance(
     """Mark attendance for a student (Teacher only)."""
     try:
         # Get teacher record from current user
-        teacher = await db.teacher.find_unique(
-            where={'userId': current_user.id}
-        )
+        teacher = await load(db, "Teacher", current_user.id, by="userId")
         if not teacher:
             raise HTTPException(status_code=403, detail="Only teachers can mark attendance")
         
@@ -130,9 +137,7 @@ async def bulk_mark_attendance(
     """Mark attendance for multiple students at once (Teacher only)."""
     try:
         # Get teacher record from current user
-        teacher = await db.teacher.find_unique(
-            where={'userId': current_user.id}
-        )
+        teacher = await load(db, "Teacher", current_user.id, by="userId")
         if not teacher:
             raise HTTPException(status_code=403, detail="Only teachers can mark attendance")
         
@@ -145,13 +150,17 @@ async def bulk_mark_attendance(
 @router.get("/course/{course_id}", response_model=List[StudentAttendanceRead])
 async def get_course_attendance(
     course_id: str,
+    response: Response,
     date: Optional[datetime] = Query(None),
+    page: PageParams = Depends(get_page_params),
+    fieldset: FieldSet = Depends(get_fieldset),
     current_user: UserOut = Depends(get_current_user),
     db: Prisma = Depends(get_db)
 ):
-    """Get attendance records for a course (Teacher view)."""
+    """Get a page of attendance records for a course (Teacher view)."""
     try:
-        return await AttendanceService.get_course_attendance(course_id, date, db)
+        records = await AttendanceService.get_course_attendance(course_id, date, db, page, fieldset)
+        return fieldset_response(response, fieldset, with_page_headers(response, records))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -165,9 +174,7 @@ async def update_attendance(
     """Update an attendance record (Teacher only)."""
     try:
         # Get teacher record from current user
-        teacher = await db.teacher.find_unique(
-            where={'userId': current_user.id}
-        )
+        teacher = await load(db, "Teacher", current_user.id, by="userId")
         if not teacher:
             raise HTTPException(status_code=403, detail="Only teachers can update attendance")
         
@@ -200,20 +207,22 @@ async def delete_attendance(
 @router.get("/student/{student_id}", response_model=List[StudentAttendanceRead])
 async def get_student_attendance(
     student_id: str,
+    response: Response,
     course_id: Optional[str] = Query(None),
+    page: PageParams = Depends(get_page_params),
+    fieldset: FieldSet = Depends(get_fieldset),
     current_user: UserOut = Depends(get_current_user),
     db: Prisma = Depends(get_db)
 ):
-    """Get attendance records for a student."""
+    """Get a page of attendance records for a student."""
     try:
         # Authorization: student can only view their own records
-        student = await db.student.find_unique(
-            where={'userId': current_user.id}
-        )
+        student = await load(db, "Student", current_user.id, by="userId")
         if student and student.id != student_id and current_user.role not in ["TEACHER", "ADMIN"]:
             raise HTTPException(status_code=403, detail="You can only view your own attendance")
         
-        return await AttendanceService.get_student_attendance(student_id, course_id, db)
+        records = await AttendanceService.get_student_attendance(student_id, course_id, db, page, fieldset)
+        return fieldset_response(response, fieldset, with_page_headers(response, records))
     except HTTPException:
         raise
     except Exception as e:
@@ -222,15 +231,17 @@ async def get_student_attendance(
 @router.get("/{attendance_id}", response_model=StudentAttendanceRead)
 async def get_attendance(
     attendance_id: str,
+    response: Response,
+    fieldset: FieldSet = Depends(get_fieldset),
     current_user: UserOut = Depends(get_current_user),
     db: Prisma = Depends(get_db)
 ):
     """Get a specific attendance record by ID."""
     try:
-        record = await AttendanceService.get_attendance_by_id(attendance_id, db)
+        record = await AttendanceService.get_attendance_by_id(attendance_id, db, fieldset)
         if not record:
             raise HTTPException(status_code=404, detail="Attendance record not found")
-        return record
+        return fieldset_response(response, fieldset, record)
     except HTTPException:
         raise
     except Exception as e:
@@ -265,9 +276,7 @@ async def mark_teacher_attendance(
             raise HTTPException(status_code=403, detail="Admin access required")
         
         # Get admin record from current user
-        admin = await db.admin.find_unique(
-            where={'userId': current_user.id}
-        )
+        admin = await load(db, "Admin", current_user.id, by="userId")
         if not admin:
             raise HTTPException(status_code=403, detail="Admin profile not found")
         
@@ -280,20 +289,22 @@ async def mark_teacher_attendance(
 @router.get("/teacher/{teacher_id}", response_model=List[TeacherAttendanceRead])
 async def get_teacher_attendance(
     teacher_id: str,
+    response: Response,
     course_id: Optional[str] = Query(None),
+    page: PageParams = Depends(get_page_params),
+    fieldset: FieldSet = Depends(get_fieldset),
     current_user: UserOut = Depends(get_current_user),
     db: Prisma = Depends(get_db)
 ):
-    """Get attendance records for a teacher."""
+    """Get a page of attendance records for a teacher."""
     try:
         # Authorization: teacher can only view their own records unless admin
-        teacher = await db.teacher.find_unique(
-            where={'userId': current_user.id}
-        )
+        teacher = await load(db, "Teacher", current_user.id, by="userId")
         if teacher and teacher.id != teacher_id and current_user.role != "ADMIN":
             raise HTTPException(status_code=403, detail="You can only view your own attendance")
         
-        return await AttendanceService.get_teacher_attendance(teacher_id, course_id, db)
+        records = await AttendanceService.get_teacher_attendance(teacher_id, course_id, db, page, fieldset)
+        return fieldset_response(response, fieldset, with_page_headers(response, records))
     except HTTPException:
         raise
     except Exception as e:
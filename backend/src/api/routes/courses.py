@@ -1,9 +1,13 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from typing import List
 from src.models.schemas import CourseCreate, CourseUpdate
 from prisma.models import Course
 from src.services.course_service import CourseService
 from src.config.database import prisma
+from src.api.dependencies import get_page_params, get_fieldset
+from src.utils.pagination import PageParams, with_page_headers
+from src.utils.fieldsets import FieldSet, fieldset_response
+from src.utils.response_cache import cached_response
 
 router = APIRouter()
 
@@ -13,17 +17,26 @@ async def create_course(course: CourseCreate):
     return await course_service.create_course(course.dict())
 
 @router.get("/", response_model=List[Course])
-async def get_courses():
+async def get_courses(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(get_page_params),
+    fieldset: FieldSet = Depends(get_fieldset)
+):
     course_service = CourseService(prisma)
-    return await course_service.get_all_courses()
+
+    async def build():
+        return with_page_headers(response, await course_service.get_all_courses(page, fieldset))
+
+    return await cached_response(request, response, "courses", List[Course], build, fieldset)
 
 @router.get("/{course_id}", response_model=Course)
-async def get_course(course_id: str):
+async def get_course(course_id: str, response: Response, fieldset: FieldSet = Depends(get_fieldset)):
     course_service = CourseService(prisma)
-    course = await course_service.get_course_by_id(course_id)
+    course = await course_service.get_course_by_id(course_id, fieldset)
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
-    return course
+    return fieldset_response(response, fieldset, course)
 
 @router.put("/{course_id}", response_model=Course)
 async def update_course(course_id: str, course: CourseUpdate):
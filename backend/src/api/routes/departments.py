@@ -1,15 +1,21 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from src.services.department_service import DepartmentService
 from src.models.schemas import DepartmentSchema, DepartmentCreate, DepartmentUpdate
 from src.config.database import prisma
+from src.api.dependencies import get_page_params
+from src.utils.pagination import PageParams, with_page_headers
+from src.utils.response_cache import cached_response
 
 router = APIRouter()
 
 @router.get("", response_model=list[DepartmentSchema])
-async def get_departments():
+async def get_departments(request: Request, response: Response, page: PageParams = Depends(get_page_params)):
     department_service = DepartmentService(prisma)
-    departments = await department_service.list_departments()
-    return departments
+
+    async def build():
+        return with_page_headers(response, await department_service.list_departments(page))
+
+    return await cached_response(request, response, "departments", list[DepartmentSchema], build)
 
 @router.get("/{department_id}", response_model=DepartmentSchema)
 async def get_department(department_id: str):
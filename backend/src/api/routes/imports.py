@@ -0,0 +1,64 @@
+import io
+import shutil
+import tempfile
+from fastapi import APIRouter, Depends, File, HTTPException, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from prisma import Prisma
+from src.api.dependencies import get_current_admin, get_db
+from src.config.settings import settings
+from src.models.schemas import ImportReport
+from src.services.import_service import ImportService, get_import_job, start_import_job
+
+router = APIRouter()
+
+
+def _save_upload(file: UploadFile) -> str:
+    with tempfile.NamedTemporaryFile(prefix="import-", suffix=".csv", delete=False) as out:
+        file.file.seek(0)
+        shutil.copyfileobj(file.file, out)
+        return out.name
+
+
+async def _import(kind: str, file: UploadFile, db: Prisma, response: Response) -> ImportReport:
+    # The upload is gone once the request ends, so background jobs get their own copy
+    if file.size is None or file.size > settings.IMPORT_BACKGROUND_BYTES:
+        path = await run_in_threadpool(_save_upload, file)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return await start_import_job(db, kind, path)
+
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return await ImportService(db).import_csv(kind, lines)
+    finally:
+        lines.detach()
+
+
+@router.post("/students", response_model=ImportReport)
+async def import_students(
+    response: Response,
+    file: UploadFile = File(...),
+    db: Prisma = Depends(get_db),
+    current_admin=Depends(get_current_admin)
+):
+    """Create students from a CSV (Admin only). Large files return 202 with a job id to poll."""
+    return await _import("students", file, db, response)
+
+
+@router.post("/teachers", response_model=ImportReport)
+async def import_teachers(
+    response: Response,
+    file: UploadFile = File(...),
+    db: Prisma = Depends(get_db),
+    current_admin=Depends(get_current_admin)
+):
+    """Create teachers from a CSV (Admin only). Large files return 202 with a job id to poll."""
+    return await _import("teachers", file, db, response)
+
+
+@router.get("/jobs/{job_id}", response_model=ImportReport)
+async def get_import_status(job_id: str, db: Prisma = Depends(get_db), current_admin=Depends(get_current_admin)):
+    """Progress and error report of a background import, kept for IMPORT_JOB_TTL_SECONDS after its last update"""
+    report = await get_import_job(db, job_id)
+    if not report:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return report
@@ -0,0 +1,53 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException
+from prisma import Prisma
+from src.api.dependencies import get_current_admin, get_db
+from src.models.schemas import AttendanceArchive, AttendancePartition, DetachTermRequest
+from src.services.archive_service import ArchiveService
+from src.services.partition_service import PartitionService
+
+router = APIRouter()
+
+
+@router.get("/attendance", response_model=List[AttendancePartition])
+async def list_attendance_partitions(db: Prisma = Depends(get_db), current_admin=Depends(get_current_admin)):
+    """Monthly StudentAttendance partitions with row estimates and sizes (Admin only)"""
+    return await PartitionService(db).list_partitions()
+
+
+@router.post("/attendance/ensure", response_model=List[str])
+async def create_upcoming_partitions(db: Prisma = Depends(get_db), current_admin=Depends(get_current_admin)):
+    """Create the partitions of the coming months now instead of waiting for the daily run (Admin only)"""
+    return await PartitionService(db).ensure_upcoming()
+
+
+@router.post("/attendance/detach", response_model=List[str])
+async def detach_attendance_term(
+    term: DetachTermRequest,
+    db: Prisma = Depends(get_db),
+    current_admin=Depends(get_current_admin)
+):
+    """Detach the partitions of a finished term from StudentAttendance; returns the detached tables (Admin only)"""
+    try:
+        return await PartitionService(db).detach_term(term.start, term.end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/attendance/archives", response_model=List[AttendanceArchive])
+async def list_attendance_archives(db: Prisma = Depends(get_db), current_admin=Depends(get_current_admin)):
+    """Archived attendance terms with their row counts and file sizes (Admin only)"""
+    return ArchiveService(db).list_archives()
+
+
+@router.post("/attendance/archive", response_model=List[AttendanceArchive])
+async def archive_attendance_term(
+    term: DetachTermRequest,
+    db: Prisma = Depends(get_db),
+    current_admin=Depends(get_current_admin)
+):
+    """Move a closed term's student and teacher attendance from the database to archive files (Admin only)"""
+    try:
+        return await ArchiveService(db).archive_term(term.start, term.end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
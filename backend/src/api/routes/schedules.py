@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from typing import List
 from src.models.schemas import (
     ScheduleCreate, 
@@ -7,8 +7,10 @@ from src.models.schemas import (
     SaveScheduleRequest
 )
 from src.services.schedule_service import ScheduleService
-from src.api.dependencies import get_current_user
+from src.api.dependencies import get_current_user, get_page_params, get_fieldset
 from src.config.database import prisma
+from src.utils.pagination import PageParams, with_page_headers
+from src.utils.fieldsets import FieldSet, fieldset_response
 
 router = APIRouter()
 
@@ -58,17 +60,28 @@ async def create_schedule(schedule: ScheduleCreate, current_user: str = Depends(
     return await schedule_service.create_schedule(schedule)
 
 @router.get("/", response_model=List[ScheduleResponse])
-async def get_schedules(current_user: str = Depends(get_current_user)):
+async def get_schedules(
+    response: Response,
+    page: PageParams = Depends(get_page_params),
+    fieldset: FieldSet = Depends(get_fieldset),
+    current_user: str = Depends(get_current_user)
+):
     schedule_service = ScheduleService(prisma)
-    return await schedule_service.get_schedules()
+    schedules = await schedule_service.get_schedules(page=page, fieldset=fieldset)
+    return fieldset_response(response, fieldset, with_page_headers(response, schedules), List[ScheduleResponse])
 
 @router.get("/{schedule_id}", response_model=ScheduleResponse)
-async def get_schedule(schedule_id: str, current_user: str = Depends(get_current_user)):
+async def get_schedule(
+    schedule_id: str,
+    response: Response,
+    fieldset: FieldSet = Depends(get_fieldset),
+    current_user: str = Depends(get_current_user)
+):
     schedule_service = ScheduleService(prisma)
-    schedule = await schedule_service.get_schedule(schedule_id)
+    schedule = await schedule_service.get_schedule(schedule_id, fieldset)
     if not schedule:
         raise HTTPException(status_code=404, detail="Schedule not found")
-    return schedule
+    return fieldset_response(response, fieldset, schedule)
 
 @router.put("/{schedule_id}", response_model=ScheduleResponse)
 async def update_schedule(schedule_id: str, schedule: ScheduleUpdate, current_user: str = Depends(get_current_user)):
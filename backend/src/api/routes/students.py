@@ -1,25 +1,31 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from src.models.schemas import StudentCreate,StudentResponse, StudentUpdate, StudentOut, StudentUserCreate,UserCreate
 from src.services.student_service import StudentService
-from src.api.dependencies import get_current_user
+from src.api.dependencies import get_current_user, get_page_params, get_fieldset
 from src.config.database import prisma
 from src.services.user_service import UserService
+from src.utils.pagination import PageParams, with_page_headers
+from src.utils.fieldsets import FieldSet, fieldset_response
 
 router = APIRouter()
 
 @router.get("/", response_model=list[StudentOut])
-async def get_students(skip: int = 0, limit: int = 10):
+async def get_students(
+    response: Response,
+    page: PageParams = Depends(get_page_params),
+    fieldset: FieldSet = Depends(get_fieldset)
+):
     student_service = StudentService(prisma)
-    students = await student_service.list_students()
-    return students[skip:skip+limit]
+    students = await student_service.list_students(page, fieldset)
+    return fieldset_response(response, fieldset, with_page_headers(response, students), list[StudentOut])
 
 @router.get("/{student_id}", response_model=StudentOut)
-async def get_student(student_id: str):
+async def get_student(student_id: str, response: Response, fieldset: FieldSet = Depends(get_fieldset)):
     student_service = StudentService(prisma)
-    student = await student_service.get_student(student_id)
+    student = await student_service.get_student(student_id, fieldset)
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
-    return student
+    return fieldset_response(response, fieldset, student)
 
 @router.post("/", response_model=StudentOut)
 async def create_student(student: StudentUserCreate):
@@ -1,20 +1,28 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from src.models.schemas import TeacherCreate, TeacherUpdate, TeacherResponse,UserResponse,TeacherOut
 from src.services.teacher_service import TeacherService
-from src.api.dependencies import get_current_user
+from src.api.dependencies import get_current_user, get_page_params, get_fieldset
 from src.config.database import prisma
+from src.utils.pagination import PageParams, with_page_headers
+from src.utils.fieldsets import FieldSet, fieldset_response
+from src.utils.response_cache import cached_response
 
 router = APIRouter()
 
 @router.get("/", response_model=list[TeacherOut])
 async def get_all_teachers(
-    skip: int = 0,
-    limit: int = 100,
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(get_page_params),
+    fieldset: FieldSet = Depends(get_fieldset),
     current_user: UserResponse = Depends(get_current_user)
 ):
     teacher_service = TeacherService(prisma)
-    teachers = await teacher_service.list_teachers()
-    return teachers
+
+    async def build():
+        return with_page_headers(response, await teacher_service.list_teachers(page, fieldset))
+
+    return await cached_response(request, response, "teachers", list[TeacherOut], build, fieldset)
 
 @router.post("/", response_model=TeacherResponse)
 async def create_teacher(teacher: TeacherCreate, current_user: UserResponse = Depends(get_current_user)):
@@ -22,12 +30,17 @@ async def create_teacher(teacher: TeacherCreate, current_user: UserResponse = De
     return await teacher_service.create_teacher(teacher)
 
 @router.get("/{teacher_id}", response_model=TeacherResponse)
-async def get_teacher(teacher_id: str, current_user: UserResponse = Depends(get_current_user)):
+async def get_teacher(
+    teacher_id: str,
+    response: Response,
+    fieldset: FieldSet = Depends(get_fieldset),
+    current_user: UserResponse = Depends(get_current_user)
+):
     teacher_service = TeacherService(prisma)
-    teacher = await teacher_service.get_teacher(teacher_id)
+    teacher = await teacher_service.get_teacher(teacher_id, fieldset)
     if not teacher:
         raise HTTPException(status_code=404, detail="Teacher not found")
-    return teacher
+    return fieldset_response(response, fieldset, teacher)
 
 @router.put("/{teacher_id}", response_model=TeacherResponse)
 async def update_teacher(teacher_id: str, teacher: TeacherUpdate, current_user: UserResponse = Depends(get_current_user)):
@@ -1,16 +1,18 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from src.models.schemas import UserResponse, UserCreate, UserUpdate
 from src.services.user_service import UserService
-from src.api.dependencies import get_current_user
+from src.api.dependencies import get_current_user, get_page_params
 from src.config.database import prisma
+from src.utils.pagination import PageParams, with_page_headers
+from src.utils.serialization import json_response
 
 router = APIRouter()
 
 @router.get("/", response_model=list[UserResponse])
-async def get_users(skip: int = 0, limit: int = 10):
+async def get_users(response: Response, page: PageParams = Depends(get_page_params)):
     user_service = UserService(prisma)
-    users = await user_service.list_users()
-    return users[skip:skip+limit]
+    users = await user_service.list_users(page)
+    return json_response(response, with_page_headers(response, users), list[UserResponse])
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(user_id: str):
@@ -1,7 +1,81 @@
+import hashlib
+import hmac
+import itertools
+import os
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 from prisma import Prisma
+from src.config.settings import settings
+from src.utils.query_stats import InstrumentedPrisma
 
-# Shared database instance
-prisma = Prisma()
+
+def pool_size() -> int:
+    """Connections per client per worker, Prisma's default when unset"""
+    return settings.DB_POOL_SIZE or (os.cpu_count() or 1) * 2 + 1
+
+
+def _pooled(url: str) -> str:
+    """Add Prisma's pool parameters to a URL unless it already sets them"""
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    query.setdefault("connection_limit", str(pool_size()))
+    query.setdefault("pool_timeout", str(settings.DB_POOL_TIMEOUT))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+# Shared writer instance, every write goes through it
+prisma = InstrumentedPrisma(datasource={"url": _pooled(settings.DATABASE_URL)})
+
+# One client per replica, each with its own connection pool
+readers: List[Prisma] = [
+    InstrumentedPrisma(datasource={"url": _pooled(url)}) for url in settings.read_database_urls
+]
+_reader_cycle = itertools.cycle(readers)
+
+# Set per request by the read_your_writes middleware
+reads_use_writer: ContextVar[bool] = ContextVar("reads_use_writer", default=False)
+
+# The pin that keeps a user's reads on the writer travels with the client, so
+# it holds whichever worker serves their next request: "<expiry>.<signature>"
+# with a wall-clock expiry, signed for that user with SECRET_KEY
+
+
+def _pin_signature(user_id: str, expires: int) -> str:
+    message = f"{user_id}.{expires}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+def pin_to_writer(user_id: str) -> str:
+    """A pin for user_id valid for READ_YOUR_WRITES_SECONDS"""
+    expires = int(time.time() + settings.READ_YOUR_WRITES_SECONDS) + 1
+    return f"{expires}.{_pin_signature(user_id, expires)}"
+
+
+def is_pinned(user_id: Optional[str], pin: Optional[str]) -> bool:
+    """Whether pin was issued to user_id and has not expired"""
+    if not user_id or not pin:
+        return False
+    expires, _, signature = pin.partition(".")
+    if not expires.isdigit() or int(expires) <= time.time():
+        return False
+    return hmac.compare_digest(signature, _pin_signature(user_id, int(expires)))
+
+
+def reader_for(db: Prisma) -> Prisma:
+    """
+    Client for a read-only query.
+    Only the shared writer is swapped for a replica; any other client (a
+    transaction, a test database) is returned unchanged.
+    """
+    if db is not prisma or not readers or reads_use_writer.get():
+        return db
+    for _ in range(len(readers)):
+        reader = next(_reader_cycle)
+        if reader.is_connected():
+            return reader
+    return db
 
 async def get_db()->Prisma:
     if not prisma.is_connected():
@@ -9,13 +83,50 @@ async def get_db()->Prisma:
     return prisma
 
 async def connect_db():
-    """Connect to the database"""
-    if not prisma.is_connected():
-        await prisma.connect()
-    print("✅ Database connected")
+    """Connect the writer and every read replica and open a first pooled connection"""
+    for client in [prisma] + readers:
+        if not client.is_connected():
+            await client.connect()
+        await client.query_raw("SELECT 1")
+    print(f"✅ Database connected ({len(readers)} read replica(s), pool size {pool_size()})")
 
 async def disconnect_db():
-    """Disconnect from the database"""
-    if prisma.is_connected():
-        await prisma.disconnect()
-    print("❌ Database disconnected")
\ No newline at end of file
+    """Disconnect the writer and every read replica"""
+    for client in [prisma] + readers:
+        if client.is_connected():
+            await client.disconnect()
+    print("❌ Database disconnected")
+
+
+async def _pool_stats(client: Prisma) -> Optional[Dict[str, Any]]:
+    """Pool gauges from Prisma's metrics preview feature"""
+    try:
+        metrics = await client.get_metrics()
+    except Exception:
+        return None
+    gauges = {gauge.key: gauge.value for gauge in metrics.gauges}
+    busy = int(gauges.get("prisma_pool_connections_busy", 0))
+    return {
+        "size": pool_size(),
+        "open": int(gauges.get("prisma_pool_connections_open", 0)),
+        "busy": busy,
+        "idle": int(gauges.get("prisma_pool_connections_idle", 0)),
+        "waiting": int(gauges.get("prisma_client_queries_wait", 0)),
+        "saturation": round(busy / pool_size(), 3),
+    }
+
+
+async def client_health(client: Prisma) -> Dict[str, Any]:
+    """Round-trip a trivial query and report pool usage for one client"""
+    if not client.is_connected():
+        return {"connected": False}
+    started = time.perf_counter()
+    try:
+        await client.query_raw("SELECT 1")
+    except Exception as e:
+        return {"connected": True, "error": str(e)}
+    return {
+        "connected": True,
+        "ping_ms": round((time.perf_counter() - started) * 1000, 2),
+        "pool": await _pool_stats(client),
+    }
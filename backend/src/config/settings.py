@@ -1,12 +1,102 @@
-from pydantic import BaseSettings
+from typing import List
+from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str
-    SECRET_KEY: str
+    SECRET_KEY: str = "hackmenow"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Comma separated replica URLs, reads fall back to the writer when empty
+    DATABASE_READ_URLS: str = ""
+    # How long a user's reads stay on the writer after they write
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # "production" makes run.py start multiple workers without reload
+    APP_ENV: str = "development"
+    # 0 means one worker per CPU
+    WEB_WORKERS: int = 0
+    # Per worker and per client; 0 keeps Prisma's default (2 * CPUs + 1)
+    DB_POOL_SIZE: int = 0
+    # Seconds a query may wait for a free pool connection
+    DB_POOL_TIMEOUT: int = 10
+    # Seconds in-flight requests get to finish on shutdown
+    SHUTDOWN_GRACE_SECONDS: int = 30
+
+    # Per worker cache of reference data responses (departments, courses, teachers)
+    RESPONSE_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    # Upper bound on a cached response's age; writes drop entries before that
+    RESPONSE_CACHE_TTL_SECONDS: float = 300.0
+
+    # Requests above either budget are logged as likely N+1 patterns
+    QUERY_COUNT_WARN: int = 20
+    DB_TIME_WARN_MS: float = 250.0
+
+    # Shared by all workers of one server so /metrics can add them up; run.py sets it in production
+    METRICS_DIR: str = ""
+    # Shared by all workers of one server so cache invalidations reach every worker; run.py sets
+    # it in production. Unset, other workers only see a write once their cached entries expire
+    CACHE_SYNC_DIR: str = ""
+    METRICS_FLUSH_SECONDS: float = 5.0
+    # Directory to record normalized query shapes in for benchmarks.index_advisor; empty disables
+    QUERY_SHAPES_DIR: str = ""
+
+    # Rows per create_many transaction in CSV imports
+    IMPORT_BATCH_SIZE: int = 500
+    # Uploads larger than this run as a background job
+    IMPORT_BACKGROUND_BYTES: int = 256 * 1024
+    # Processes hashing imported passwords; 0 means one per CPU
+    IMPORT_HASH_WORKERS: int = 0
+    # Background import reports are deleted this long after their last update
+    IMPORT_JOB_TTL_SECONDS: int = 24 * 3600
+
+    # Monthly StudentAttendance partitions kept ready beyond the current month
+    ATTENDANCE_PARTITION_MONTHS_AHEAD: int = 3
+    # Archived attendance terms, one compressed file per table and term
+    ATTENDANCE_ARCHIVE_DIR: str = "archive/attendance"
+    # Rows per read and per delete while archiving
+    ATTENDANCE_ARCHIVE_BATCH_SIZE: int = 5000
+
+    # Build the department agent at startup instead of on the first query
+    AGENT_WARMUP: bool = False
+    # "fake" swaps Gemini for the scripted offline model in src/agents/fake_llm.py
+    AGENT_LLM: str = "gemini"
+    AGENT_FAKE_LLM_LATENCY_MS: float = 0.0
+    # JSON script for the fake model; empty uses its built-in department script
+    AGENT_FAKE_LLM_SCRIPT: str = ""
+    # Answer simple structured questions (counts, lists, my attendance) from the services without the model
+    AGENT_ROUTER: bool = True
+    # Agent runs per worker; more wait in a queue of AGENT_MAX_QUEUED_RUNS for up to the timeout
+    AGENT_MAX_CONCURRENT_RUNS: int = 16
+    AGENT_MAX_QUEUED_RUNS: int = 64
+    AGENT_QUEUE_TIMEOUT_SECONDS: float = 10.0
+    # Runs one user (or anonymous client address) may have at once per worker, more are rejected
+    AGENT_MAX_CONCURRENT_RUNS_PER_USER: int = 2
+    # Seconds one model call may take; calls slower than AGENT_MODEL_SLOW_CALL_SECONDS count as failures
+    AGENT_MODEL_TIMEOUT_SECONDS: float = 20.0
+    AGENT_MODEL_SLOW_CALL_SECONDS: float = 10.0
+    # Consecutive failed or slow model calls that open the breaker, and how long it stays open
+    AGENT_BREAKER_FAILURES: int = 5
+    AGENT_BREAKER_RESET_SECONDS: float = 30.0
+    # Whole agent request, queueing for a slot included
+    AGENT_REQUEST_DEADLINE_SECONDS: float = 45.0
+    # Results of read-only agent tools; writes through the services drop them at once
+    AGENT_TOOL_CACHE_TTL_SECONDS: float = 60.0
+    # Answers to read-only questions, served to questions at least this similar (cosine, 0-1)
+    AGENT_ANSWER_CACHE_SIMILARITY: float = 0.9
+    AGENT_ANSWER_CACHE_TTL_SECONDS: float = 300.0
+    AGENT_ANSWER_CACHE_MAX_ENTRIES: int = 1000
+    # Estimated tokens of earlier turns sent with each thread query; older turns are summarized
+    AGENT_HISTORY_TOKEN_BUDGET: int = 4000
+    # Upper bound on the turns loaded per query, whatever their size
+    AGENT_HISTORY_MAX_MESSAGES: int = 40
+
     class Config:
         env_file = ".env"
+        extra = "ignore"
+
+    @property
+    def read_database_urls(self) -> List[str]:
+        return [url.strip() for url in self.DATABASE_READ_URLS.split(",") if url.strip()]
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
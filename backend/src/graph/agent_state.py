@@ -3,4 +3,6 @@ import operator
 from typing import TypedDict,Annotated
 
 class AgentState(TypedDict):
-    messages:Annotated[list[BaseMessage],operator.add]
\ No newline at end of file
+    messages:Annotated[list[BaseMessage],operator.add]
+    # Rolling summary of the thread's turns that no longer fit in messages
+    summary:str
\ No newline at end of file
@@ -1,7 +1,9 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from contextlib import asynccontextmanager
-from src.config.database import connect_db, disconnect_db
+from src.config.database import connect_db, disconnect_db, client_health, prisma, readers
+from src.config.settings import settings
 from src.api.routes import (
     admin,
     attendance,
@@ -14,15 +16,45 @@ from src.api.routes import (
     students,
     teachers,
     users,
-    agent_query
+    agent_query,
+    imports,
+    partitions
 )
 from src.middleware.error_handler import error_handler
+from src.middleware.read_your_writes import read_your_writes, PIN_HEADER
+from src.middleware.inflight import track_inflight, in_flight, drain
+from src.middleware.query_accounting import account_queries
+from src.middleware.metrics import record_http_metrics
+from src.utils.loaders import request_loaders
+from src.utils import metrics, query_shapes
+from src.utils.response_cache import response_cache
+from src.utils.circuit_breaker import breaker_stats
+from src.utils.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
+from src.services.partition_service import start_partition_maintenance, stop_partition_maintenance
+from src.agents.department_agent import get_department_agent
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifespan - startup and shutdown"""
     await connect_db()
+    metrics.start()
+    query_shapes.start()
+    await start_partition_maintenance(prisma)
+    if settings.AGENT_WARMUP:
+        try:
+            get_department_agent()
+            get_department_agent(read_only=True)
+            print("🤖 Department agents ready")
+        except Exception as e:
+            print(f"⚠️ Could not build the department agent: {e}")
     yield
+    # Let requests that are still running finish before the pools go away
+    remaining = await drain(settings.SHUTDOWN_GRACE_SECONDS)
+    if remaining:
+        print(f"⚠️ Shutting down with {remaining} request(s) still in flight")
+    await stop_partition_maintenance()
+    await query_shapes.stop()
+    await metrics.stop()
     await disconnect_db()
 
 # Initialize FastAPI app
@@ -45,11 +77,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, "ETag", "X-Cache", "Server-Timing", PIN_HEADER],
 )
 
+# Route reads to replicas unless the user has just written
+app.middleware("http")(read_your_writes)
+app.middleware("http")(request_loaders)
+app.middleware("http")(track_inflight)
+app.middleware("http")(account_queries)
+app.middleware("http")(record_http_metrics)
+
 
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
+app.include_router(imports.router, prefix="/api/admin/import", tags=["Admin"])
+app.include_router(partitions.router, prefix="/api/admin/partitions", tags=["Admin"])
 app.include_router(users.router, prefix="/api/users", tags=["Users"])
 app.include_router(students.router, prefix="/api/students", tags=["Students"])
 app.include_router(teachers.router, prefix="/api/teachers", tags=["Teachers"])
@@ -71,11 +113,39 @@ async def root():
         "status": "operational"
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint, covers every worker of this server"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     """Health check endpoint for monitoring"""
-    return {
-        "status": "healthy",
-        "database": "connected"
-    }
\ No newline at end of file
+    writer = await client_health(prisma)
+    replicas = [await client_health(reader) for reader in readers]
+    breakers = breaker_stats()
+
+    if not writer.get("connected") or "error" in writer:
+        status = "unhealthy"
+    elif any(not r.get("connected") or "error" in r for r in replicas):
+        status = "degraded"
+    elif any(breaker["state"] != "closed" for breaker in breakers.values()):
+        # The API still serves everything but open-ended agent questions
+        status = "degraded"
+    else:
+        status = "healthy"
+
+    return JSONResponse(
+        status_code=503 if status == "unhealthy" else 200,
+        content={
+            "status": status,
+            "in_flight": in_flight(),
+            "response_cache": response_cache.stats(),
+            "circuit_breakers": breakers,
+            "database": {
+                "writer": writer,
+                "readers": replicas
+            }
+        }
+    )
\ No newline at end of file
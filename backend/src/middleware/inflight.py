@@ -0,0 +1,31 @@
+import asyncio
+import time
+from fastapi import Request
+from src.utils.metrics import Gauge
+
+_in_flight = 0
+
+
+def in_flight() -> int:
+    return _in_flight
+
+
+Gauge("http_requests_in_flight", "Requests currently being handled", lambda: {(): in_flight()})
+
+
+async def track_inflight(request: Request, call_next):
+    """Count requests currently being handled by this worker"""
+    global _in_flight
+    _in_flight += 1
+    try:
+        return await call_next(request)
+    finally:
+        _in_flight -= 1
+
+
+async def drain(timeout: float) -> int:
+    """Wait for in-flight requests to finish, returns how many were still running at the deadline"""
+    deadline = time.monotonic() + timeout
+    while _in_flight and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+    return _in_flight
@@ -0,0 +1,19 @@
+import time
+from fastapi import Request
+from src.utils.metrics import HTTP_LATENCY, HTTP_REQUESTS
+
+
+async def record_http_metrics(request: Request, call_next):
+    """Latency histogram and status counter per route template"""
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        # Unmatched paths share one label so random URLs cannot blow up the series count
+        path = getattr(route, "path", "unmatched")
+        HTTP_LATENCY.observe(time.perf_counter() - started, (request.method, path))
+        HTTP_REQUESTS.inc((request.method, path, str(status)))
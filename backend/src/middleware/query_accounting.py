@@ -0,0 +1,33 @@
+import logging
+import time
+from fastapi import Request
+from src.config.settings import settings
+from src.utils.query_stats import track_queries
+
+logger = logging.getLogger(__name__)
+
+
+async def account_queries(request: Request, call_next):
+    """
+    Report the request's query count, rows and DB time in a Server-Timing
+    header and warn about requests over the configured budgets, which is
+    usually an N+1 loop.
+    """
+    started = time.perf_counter()
+    with track_queries() as stats:
+        response = await call_next(request)
+    total_ms = (time.perf_counter() - started) * 1000
+
+    response.headers.append("Server-Timing", f"{stats.server_timing()}, app;dur={total_ms:.2f}")
+
+    if stats.queries > settings.QUERY_COUNT_WARN or stats.db_ms > settings.DB_TIME_WARN_MS:
+        route = request.scope.get("route")
+        logger.warning(
+            "%s %s ran %d queries (%d rows) in %.1f ms of DB time",
+            request.method,
+            getattr(route, "path", request.url.path),
+            stats.queries,
+            stats.rows,
+            stats.db_ms
+        )
+    return response
@@ -0,0 +1,47 @@
+import math
+from typing import Optional
+from fastapi import Request, HTTPException
+from src.config.database import reads_use_writer, pin_to_writer, is_pinned
+from src.config.settings import settings
+from src.utils.jwt import verify_token
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+# Browsers send the pin back as a cookie, other clients echo the header
+PIN_COOKIE = "rw_pin"
+PIN_HEADER = "X-Read-Your-Writes"
+
+
+def _user_id(request: Request) -> Optional[str]:
+    header = request.headers.get("Authorization", "")
+    if not header.startswith("Bearer "):
+        return None
+    try:
+        return verify_token(header.split(" ", 1)[1]).get("sub")
+    except HTTPException:
+        return None
+
+
+async def read_your_writes(request: Request, call_next):
+    """
+    Keep reads on the writer for write requests and for users who wrote
+    within the last READ_YOUR_WRITES_SECONDS, so replica lag never hides
+    a user's own changes from them. A successful write hands the client a
+    signed pin, and requests carrying a valid one read from the writer.
+    """
+    user_id = _user_id(request)
+    is_write = request.method not in SAFE_METHODS
+    pin = request.headers.get(PIN_HEADER) or request.cookies.get(PIN_COOKIE)
+
+    token = reads_use_writer.set(is_write or is_pinned(user_id, pin))
+    try:
+        response = await call_next(request)
+    finally:
+        reads_use_writer.reset(token)
+
+    if is_write and user_id and response.status_code < 400:
+        pin = pin_to_writer(user_id)
+        response.headers[PIN_HEADER] = pin
+        response.set_cookie(
+            PIN_COOKIE, pin, max_age=math.ceil(settings.READ_YOUR_WRITES_SECONDS), httponly=True, samesite="lax"
+        )
+    return response
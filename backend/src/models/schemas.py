@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional, List
 
 # User Schemas
@@ -615,4 +615,39 @@ class SaveScheduleRequest(BaseModel):
     timetable: List[List[Optional[List[str]]]]
 
 class GenerateTimeTableRequest(BaseModel):
-    pass
\ No newline at end of file
+    pass
+
+# Bulk Import Schemas
+class ImportRowError(BaseModel):
+    row: int  # line number in the CSV, the header is line 1
+    field: Optional[str] = None
+    message: str
+
+class ImportReport(BaseModel):
+    job_id: Optional[str] = None
+    kind: str  # "students" or "teachers"
+    status: str = "running"  # "running", "completed" or "failed"
+    total_rows: int = 0
+    created: int = 0
+    failed: int = 0
+    errors: List[ImportRowError] = []
+
+# Attendance Partition Schemas
+class AttendancePartition(BaseModel):
+    name: str
+    range_from: Optional[date] = None  # None for the default partition
+    range_to: Optional[date] = None
+    estimated_rows: int
+    bytes: int
+
+class DetachTermRequest(BaseModel):
+    start: date  # first day of the term's first month
+    end: date  # first day of the month after the term
+
+# Attendance Archive Schemas
+class AttendanceArchive(BaseModel):
+    table: str
+    start: date
+    end: date
+    rows: int
+    bytes: int
@@ -1,8 +1,12 @@
 from prisma import Prisma
 from fastapi import HTTPException
-from typing import List, Optional
+from typing import Optional
 from src.models.schemas import AdminCreate, AdminUpdate, AdminOut
 from src.utils.password import hash_password
+from src.config.database import reader_for
+from src.utils.loaders import load, prime_row, forget_row
+from src.utils.pagination import Page, PageParams, paginate
+from prisma.models import Admin
 
 class AdminService:
     def __init__(self, db: Prisma):
@@ -43,6 +47,7 @@ class AdminService:
                 },
                 include={"user": True}
             )
+            prime_row(self.db, "Admin", admin, ("id", "userId"), include={"user": True})
             return admin
         except HTTPException:
             raise
@@ -85,6 +90,8 @@ class AdminService:
                 },
                 include={"user": True}
             )
+            prime_row(self.db, "Admin", admin, ("id", "userId"), include={"user": True})
+            forget_row("User", admin.userId)
             return admin
         except HTTPException:
             raise
@@ -93,37 +100,28 @@ class AdminService:
 
     async def get_admin(self, admin_id: str) -> AdminOut:
         """Get admin by ID"""
-        admin = await self.db.admin.find_unique(
-            where={"id": admin_id},
-            include={"user": True}
-        )
+        admin = await load(self.db, "Admin", admin_id, include={"user": True})
         if not admin:
             raise HTTPException(status_code=404, detail="Admin not found")
         return admin
 
     async def get_admin_by_user_id(self, user_id: str) -> Optional[AdminOut]:
         """Get admin by user ID"""
-        admin = await self.db.admin.find_unique(
-            where={"userId": user_id},
-            include={"user": True}
-        )
+        admin = await load(self.db, "Admin", user_id, by="userId", include={"user": True})
         return admin
 
     async def get_admin_by_admin_id(self, admin_id_str: str) -> Optional[AdminOut]:
         """Get admin by adminId (e.g., 'ADM2024001')"""
-        admin = await self.db.admin.find_unique(
+        admin = await reader_for(self.db).admin.find_unique(
             where={"adminId": admin_id_str},
             include={"user": True}
         )
         return admin
 
-    async def list_admins(self, skip: int = 0, limit: int = 100) -> List[AdminOut]:
-        """List all admins with pagination"""
-        return await self.db.admin.find_many(
-            skip=skip,
-            take=limit,
-            include={"user": True},
-            order={"createdAt": "desc"}
+    async def list_admins(self, page: Optional[PageParams] = None) -> Page[Admin]:
+        """A page of admins with their users, newest first"""
+        return await paginate(
+            reader_for(self.db), "Admin", page, include={"user": True}, order=[{"createdAt": "desc"}]
         )
 
     async def delete_admin(self, admin_id: str) -> bool:
@@ -134,6 +132,8 @@ class AdminService:
                 raise HTTPException(status_code=404, detail="Admin not found")
 
             await self.db.admin.delete(where={"id": admin_id})
+            forget_row("Admin", admin_id)
+            forget_row("User", admin.userId)
             return True
         except HTTPException:
             raise
@@ -142,4 +142,4 @@ class AdminService:
 
     async def count_admins(self) -> int:
         """Get total count of admins"""
-        return await self.db.admin.count()
\ No newline at end of file
+        return await reader_for(self.db).admin.count()
\ No newline at end of file
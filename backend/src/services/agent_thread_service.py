@@ -0,0 +1,173 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set
+from prisma import Json, Prisma
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from src.agents.department_agent import get_llm, message_text, model_breaker
+from src.config.settings import settings
+
+SUMMARIZE_PROMPT = """You keep a running summary of a conversation between a user and a
+department management assistant. Merge the previous summary with the new turns
+into one short summary. Keep names, codes, ids and decisions; drop small talk."""
+
+# Threads with a summary being written by this worker
+_summarizing: Set[str] = set()
+_tasks: Set[asyncio.Task] = set()
+
+
+def estimate_tokens(text: str) -> int:
+    # About four characters per token; only used to size the history, not to bill
+    return len(text) // 4 + 1
+
+
+def usage_of(messages: List[BaseMessage]) -> Dict[str, int]:
+    """Tokens reported by the model for the AI messages of one run"""
+    usage = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0, "model_calls": 0}
+    for message in messages:
+        metadata = getattr(message, "usage_metadata", None)
+        if isinstance(message, AIMessage) and metadata:
+            usage["model_calls"] += 1
+            for key in ("input_tokens", "output_tokens", "total_tokens"):
+                usage[key] += metadata.get(key, 0)
+    return usage
+
+
+class AgentThreadService:
+    """
+    Conversation threads of the department agent, stored as ChatMessage rows.
+    A query sends the newest turns that fit AGENT_HISTORY_TOKEN_BUDGET plus a
+    rolling summary of everything before them, so the cost of a turn does not
+    grow with the length of its thread.
+    """
+
+    def __init__(self, db: Prisma):
+        self.db = db
+
+    async def _summary(self, thread_id: str):
+        return await self.db.chatmessage.find_first(
+            where={'threadId': thread_id, 'role': 'SYSTEM'},
+            order={'createdAt': 'desc'}
+        )
+
+    async def _turns(self, thread_id: str, after: Optional[datetime], newest_first: bool, take: int):
+        where: Dict[str, Any] = {'threadId': thread_id, 'role': {'in': ['USER', 'ASSISTANT']}}
+        if after:
+            where['createdAt'] = {'gt': after}
+        return await self.db.chatmessage.find_many(
+            where=where,
+            order={'createdAt': 'desc' if newest_first else 'asc'},
+            take=take
+        )
+
+    async def load(self, user_id: str, thread_id: Optional[str]) -> Dict[str, Any]:
+        """
+        Graph input for the next turn: the thread id (new if none was given),
+        the kept turns as messages and the summary of older turns.
+        """
+        if not thread_id:
+            return {'thread_id': uuid.uuid4().hex, 'messages': [], 'summary': None}
+
+        summary = await self._summary(thread_id)
+        after = datetime.fromisoformat(summary.metadata['through']) if summary else None
+        # One indexed range read on (threadId, createdAt), bounded however long the thread is
+        recent = await self._turns(thread_id, after, True, settings.AGENT_HISTORY_MAX_MESSAGES)
+        if any(message.userId != user_id for message in recent) or (summary and summary.userId != user_id):
+            raise ValueError("Thread not found")
+
+        kept: List[BaseMessage] = []
+        budget = settings.AGENT_HISTORY_TOKEN_BUDGET
+        for message in recent:
+            budget -= estimate_tokens(message.content)
+            if budget < 0:
+                break
+            kept.append(HumanMessage(content=message.content) if message.role == 'USER' else AIMessage(content=message.content))
+        kept.reverse()
+        return {'thread_id': thread_id, 'messages': kept, 'summary': summary.content if summary else None}
+
+    async def record_turn(
+        self,
+        user_id: str,
+        thread_id: str,
+        question: str,
+        answer: str,
+        started: datetime,
+        elapsed: float,
+        usage: Dict[str, int]
+    ) -> None:
+        """Store the question and the answer; the answer carries the run's token usage and latency"""
+        await self.db.chatmessage.create_many(data=[
+            {
+                'userId': user_id,
+                'role': 'USER',
+                'content': question,
+                'threadId': thread_id,
+                'tokensUsed': estimate_tokens(question),
+                'createdAt': started,
+            },
+            {
+                'userId': user_id,
+                'role': 'ASSISTANT',
+                'content': answer,
+                'threadId': thread_id,
+                'tokensUsed': usage['total_tokens'] or None,
+                'responseTime': round(elapsed, 3),
+                'metadata': Json(usage),
+            },
+        ])
+        if thread_id not in _summarizing:
+            _summarizing.add(thread_id)
+            task = asyncio.create_task(self.summarize(user_id, thread_id))
+            _tasks.add(task)
+            task.add_done_callback(_tasks.discard)
+
+    async def summarize(self, user_id: str, thread_id: str) -> bool:
+        """
+        Fold the oldest unsummarized turns into the summary once they exceed the
+        budget. Runs after a turn has been answered, and keeps only half the
+        budget as turns so it is not needed again on the very next turn.
+        """
+        _summarizing.add(thread_id)
+        try:
+            summary = await self._summary(thread_id)
+            after = datetime.fromisoformat(summary.metadata['through']) if summary else None
+            turns = await self._turns(thread_id, after, False, settings.AGENT_HISTORY_MAX_MESSAGES * 2)
+            sizes = [estimate_tokens(message.content) for message in turns]
+            if sum(sizes) <= settings.AGENT_HISTORY_TOKEN_BUDGET and len(turns) < settings.AGENT_HISTORY_MAX_MESSAGES:
+                return False
+
+            keep = 0
+            kept_tokens = 0
+            for size in reversed(sizes):
+                if kept_tokens + size > settings.AGENT_HISTORY_TOKEN_BUDGET // 2 or keep >= settings.AGENT_HISTORY_MAX_MESSAGES // 2:
+                    break
+                kept_tokens += size
+                keep += 1
+            folded = turns[:len(turns) - keep]
+            if not folded:
+                return False
+
+            transcript = "\n".join(f"{message.role.lower()}: {message.content}" for message in folded)
+            response = await model_breaker.call(lambda: get_llm().ainvoke([
+                SystemMessage(content=SUMMARIZE_PROMPT),
+                HumanMessage(content=f"Previous summary:\n{summary.content if summary else '(none)'}\n\nNew turns:\n{transcript}")
+            ]))
+            content = message_text(response.content)
+            usage = usage_of([response])
+            await self.db.chatmessage.create(
+                data={
+                    'user': {'connect': {'id': user_id}},
+                    'role': 'SYSTEM',
+                    'content': content,
+                    'threadId': thread_id,
+                    'tokensUsed': usage['total_tokens'] or None,
+                    'metadata': Json({'through': folded[-1].createdAt.isoformat(), 'turns': len(folded)}),
+                    'createdAt': datetime.now(timezone.utc),
+                }
+            )
+            return True
+        except Exception as e:
+            print(f"⚠️ Could not summarize agent thread {thread_id}: {e}")
+            return False
+        finally:
+            _summarizing.discard(thread_id)
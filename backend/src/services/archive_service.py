@@ -0,0 +1,351 @@
+import glob
+import gzip
+import json
+import operator
+import os
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple, Type
+from prisma import Prisma, models
+from pydantic import BaseModel
+from src.config.settings import settings
+from src.models.schemas import AttendanceArchive
+from src.services.partition_service import month_start
+from src.utils.fieldsets import _relation_target, delegate_for
+from src.utils.pagination import Page, PageParams, estimate_total, paginate
+
+# Attendance of closed terms moves out of Postgres into one gzip-compressed,
+# column-oriented JSON file per table and term:
+#   ATTENDANCE_ARCHIVE_DIR/<Table>/<YYYY-MM>_<YYYY-MM>.json.gz
+# Terms are archived oldest first, so every live row is newer than every
+# archived one and a read that runs out of live rows simply continues in the
+# archive.
+
+COLUMNS = {
+    "StudentAttendance": ["id", "sessionId", "studentId", "courseId", "status", "markedById", "remarks", "markedAt", "updatedAt"],
+    "TeacherAttendance": ["id", "sessionId", "teacherId", "courseId", "status", "markedById", "remarks", "markedAt", "updatedAt"],
+}
+_DATETIME_COLUMNS = ("markedAt", "updatedAt")
+# Columns with a per-term index of row positions, for equality filters
+_INDEXED_COLUMNS = ("sessionId", "studentId", "teacherId", "courseId")
+_SUFFIX = ".json.gz"
+_COMPARE = {"gt": operator.gt, "gte": operator.ge, "lt": operator.lt, "lte": operator.le}
+
+
+def _month(value: date) -> datetime:
+    return datetime(value.year, value.month, 1, tzinfo=timezone.utc)
+
+
+def _utc(value: Any) -> Any:
+    # Archived timestamps are UTC like Prisma's, naive filter values are read as UTC too
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def archive_path(table: str, start: date, end: date) -> str:
+    return os.path.join(settings.ATTENDANCE_ARCHIVE_DIR, table, f"{start:%Y-%m}_{end:%Y-%m}{_SUFFIX}")
+
+
+def archived_terms(table: str) -> List[Tuple[date, date, str]]:
+    """(start, end, path) of every archived term of table, oldest first"""
+    terms = []
+    for path in glob.glob(os.path.join(settings.ATTENDANCE_ARCHIVE_DIR, table, "*" + _SUFFIX)):
+        start, end = os.path.basename(path)[:-len(_SUFFIX)].split("_")
+        terms.append((date.fromisoformat(start + "-01"), date.fromisoformat(end + "-01"), path))
+    return sorted(terms)
+
+
+def _write(path: str, table: str, start: date, end: date, records: List[BaseModel]) -> None:
+    payload = {
+        "table": table,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "rows": len(records),
+        "columns": {name: [getattr(record, name) for record in records] for name in COLUMNS[table]},
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # The rows are deleted from Postgres next, so the file has to be on disk first
+    with open(path + ".tmp", "wb") as f:
+        with gzip.GzipFile(fileobj=f, mode="wb") as archive:
+            archive.write(json.dumps(payload, default=lambda value: value.isoformat(), separators=(",", ":")).encode())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + ".tmp", path)
+
+
+@lru_cache(maxsize=16)
+def _load(path: str, mtime_ns: int) -> Dict[str, Any]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        payload = json.load(f)
+    columns = payload["columns"]
+    for name in _DATETIME_COLUMNS:
+        columns[name] = [datetime.fromisoformat(value) for value in columns[name]]
+    payload["ids"] = {row_id: index for index, row_id in enumerate(columns["id"])}
+    payload["index"] = {}
+    for name in _INDEXED_COLUMNS:
+        if name in columns:
+            positions: Dict[Any, List[int]] = {}
+            for index, value in enumerate(columns[name]):
+                positions.setdefault(value, []).append(index)
+            payload["index"][name] = positions
+    return payload
+
+
+def read_archive(path: str) -> Dict[str, Any]:
+    """The decoded columns of one archive file, cached per worker until the file changes"""
+    return _load(path, os.stat(path).st_mtime_ns)
+
+
+def _matches(value: Any, condition: Any) -> bool:
+    if not isinstance(condition, dict):
+        return value == _utc(condition)
+    for op, operand in condition.items():
+        if op == "equals":
+            ok = value == _utc(operand)
+        elif op == "in":
+            ok = value in operand
+        elif op == "not_in":
+            ok = value not in operand
+        elif op in _COMPARE:
+            ok = _COMPARE[op](value, _utc(operand))
+        else:
+            raise ValueError(f"Archived attendance cannot be filtered with '{op}'")
+        if not ok:
+            return False
+    return True
+
+
+def _overlaps(start: date, end: date, condition: Any) -> bool:
+    """Whether a markedAt condition can match a row of the term [start, end)"""
+    if condition is None:
+        return True
+    low, high = _month(start), _month(end)
+    for op, operand in (condition if isinstance(condition, dict) else {"equals": condition}).items():
+        operand = _utc(operand)
+        if op == "equals" and not low <= operand < high:
+            return False
+        if op in ("gt", "gte") and operand >= high:
+            return False
+        if (op == "lt" and operand <= low) or (op == "lte" and operand < low):
+            return False
+    return True
+
+
+def _terms(table: str, where: Dict[str, Any]) -> List[str]:
+    """Paths of the archived terms of table that the where's markedAt range reaches; the others are never read"""
+    return [path for start, end, path in archived_terms(table) if _overlaps(start, end, where.get("markedAt"))]
+
+
+def _positions(payload: Dict[str, Any], where: Dict[str, Any]) -> List[int]:
+    """Row positions of one term matching where, narrowed through the index first"""
+    columns = payload["columns"]
+    indexes: Optional[List[int]] = None
+    for column, condition in where.items():
+        if column not in payload["index"]:
+            continue
+        if isinstance(condition, dict) and set(condition) == {"equals"}:
+            condition = condition["equals"]
+        if isinstance(condition, dict) and set(condition) == {"in"}:
+            found = sorted(i for value in set(condition["in"]) for i in payload["index"][column].get(value, []))
+        elif not isinstance(condition, dict):
+            found = payload["index"][column].get(condition, [])
+        else:
+            continue
+        indexes = found if indexes is None else sorted(set(indexes).intersection(found))
+    if indexes is None:
+        indexes = list(range(payload["rows"]))
+    for column, condition in where.items():
+        values = columns[column]
+        indexes = [i for i in indexes if _matches(values[i], condition)]
+    return indexes
+
+
+def archived_count(table: str, where: Dict[str, Any]) -> int:
+    """Number of archived rows of table matching where, without building or sorting them"""
+    terms = _terms(table, where)
+    if not where:
+        return sum(read_archive(path)["rows"] for path in terms)
+    return sum(len(_positions(read_archive(path), where)) for path in terms)
+
+
+def archived_rows(table: str, where: Dict[str, Any], order: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    """Archived rows of table matching a Prisma where on its columns, sorted like the live query"""
+    rows: List[Dict[str, Any]] = []
+    names = COLUMNS[table]
+    for path in _terms(table, where):
+        payload = read_archive(path)
+        columns = payload["columns"]
+        rows.extend({name: columns[name][i] for name in names} for i in _positions(payload, where))
+
+    # Stable sorts from the least significant key up
+    for part in reversed(list(order) + [{"id": "asc"}]):
+        (key, direction), = part.items()
+        rows.sort(key=operator.itemgetter(key), reverse=direction == "desc")
+    return rows
+
+
+def is_archived(table: str, row_id: str, where: Dict[str, Any]) -> bool:
+    return any(row_id in read_archive(path)["ids"] for path in _terms(table, where))
+
+
+async def _hydrate(
+    db: Prisma,
+    table: str,
+    rows: List[Dict[str, Any]],
+    include: Optional[Dict[str, Any]],
+    partial: Optional[Type[BaseModel]]
+) -> List[BaseModel]:
+    """Turn archived rows into the models a live query returns, loading included relations from the live tables"""
+    model_cls = partial or getattr(models, table)
+    related: Dict[str, Dict[str, BaseModel]] = {}
+    for name, spec in (include or {}).items():
+        target, _ = _relation_target(model_cls.model_fields[name].annotation)
+        ids = list({row[name + "Id"] for row in rows})
+        if not ids:
+            continue
+        found = await delegate_for(db, target.__prisma_model__, target if partial else None).find_many(
+            where={"id": {"in": ids}},
+            include=spec.get("include") if isinstance(spec, dict) else None
+        )
+        related[name] = {record.id: record for record in found}
+
+    fields = model_cls.model_fields
+    return [
+        model_cls.model_validate({
+            **{name: value for name, value in row.items() if name in fields},
+            **{name: records.get(row[name + "Id"]) for name, records in related.items()},
+        })
+        for row in rows
+    ]
+
+
+async def paginate_with_archive(
+    db: Prisma,
+    model: str,
+    page: Optional[PageParams] = None,
+    *,
+    where: Optional[Dict[str, Any]] = None,
+    include: Optional[Dict[str, Any]] = None,
+    order: Optional[List[Dict[str, str]]] = None,
+    partial: Optional[Type[BaseModel]] = None
+) -> Page:
+    """
+    paginate() that continues into the archived terms once the live rows run out.
+    The archive is only read for the last live page and beyond, and a cursor
+    pointing into it is recognized by its id.
+    """
+    page = page or PageParams()
+    if not archived_terms(model):
+        return await paginate(db, model, page, where=where, include=include, order=order, partial=partial)
+
+    if page.cursor and is_archived(model, page.cursor, where or {}):
+        archived = archived_rows(model, where or {}, order or [])
+        position = next((i for i, row in enumerate(archived) if row["id"] == page.cursor), len(archived))
+        items: List[BaseModel] = []
+        offset = position + 1 + page.skip
+        live_total = await estimate_total(db, model, where) if page.with_total else None
+    else:
+        live = await paginate(db, model, page, where=where, include=include, order=order, partial=partial)
+        if live.next_cursor:
+            if live.total is not None:
+                live.total += archived_count(model, where or {})
+            return live
+        archived = archived_rows(model, where or {}, order or [])
+        items = list(live.items)
+        live_total = live.total
+        if items:
+            offset = 0
+        elif page.cursor:
+            offset = page.skip
+        else:
+            # Skipped past every live row, skip the rest in the archive
+            offset = max(0, page.skip - await getattr(db, model.lower()).count(where=where))
+
+    remaining = page.limit - len(items)
+    chunk = archived[offset:offset + remaining + 1]
+    more = len(chunk) > remaining
+    items.extend(await _hydrate(db, model, chunk[:remaining], include, partial))
+
+    return Page(
+        items=items,
+        next_cursor=items[-1].id if more and items else None,
+        total=live_total + len(archived) if live_total is not None else None
+    )
+
+
+class ArchiveService:
+    def __init__(self, db: Prisma):
+        self.db = db
+
+    def list_archives(self) -> List[AttendanceArchive]:
+        archives = []
+        for table in COLUMNS:
+            for start, end, path in archived_terms(table):
+                archives.append(AttendanceArchive(
+                    table=table,
+                    start=start,
+                    end=end,
+                    rows=read_archive(path)["rows"],
+                    bytes=os.path.getsize(path)
+                ))
+        return archives
+
+    async def _live_records(self, table: str, span: Dict[str, datetime]) -> List[BaseModel]:
+        delegate = getattr(self.db, table.lower())
+        records: List[BaseModel] = []
+        while True:
+            where: Dict[str, Any] = {"markedAt": span}
+            if records:
+                where["id"] = {"gt": records[-1].id}
+            batch = await delegate.find_many(where=where, order={"id": "asc"}, take=settings.ATTENDANCE_ARCHIVE_BATCH_SIZE)
+            records.extend(batch)
+            if len(batch) < settings.ATTENDANCE_ARCHIVE_BATCH_SIZE:
+                return records
+
+    async def archive_term(self, start: date, end: date) -> List[AttendanceArchive]:
+        """
+        Move the StudentAttendance and TeacherAttendance rows of [start, end) to
+        archive files. Each file is written, read back and compared with the
+        rows before they are deleted in batches. Running it again for the same
+        term finishes an interrupted run. Detached partitions are not visible
+        here and have to be attached again first.
+        """
+        if start != month_start(start) or end != month_start(end) or end <= start:
+            raise ValueError("A term must start and end on the first day of a month")
+        if end > month_start(date.today()):
+            raise ValueError("Only terms that ended before the current month can be archived")
+        for table in COLUMNS:
+            for archived_start, archived_end, _ in archived_terms(table):
+                if archived_start < end and start < archived_end and (archived_start, archived_end) != (start, end):
+                    raise ValueError(f"{table} {archived_start:%Y-%m} to {archived_end:%Y-%m} is already archived and overlaps this term")
+            if await getattr(self.db, table.lower()).count(where={"markedAt": {"lt": _month(start)}}):
+                raise ValueError(f"{table} has rows before {start}, archive older terms first")
+
+        span = {"gte": _month(start), "lt": _month(end)}
+        for table in COLUMNS:
+            delegate = getattr(self.db, table.lower())
+            records = await self._live_records(table, span)
+            live_ids: Set[str] = {record.id for record in records}
+            path = archive_path(table, start, end)
+
+            if os.path.exists(path):
+                missing = live_ids - set(read_archive(path)["ids"])
+                if missing:
+                    raise ValueError(f"{len(missing)} {table} rows of this term are not in {path}")
+            else:
+                _write(path, table, start, end, records)
+                archived = read_archive(path)
+                if archived["rows"] != len(records) or set(archived["ids"]) != live_ids:
+                    os.remove(path)
+                    raise ValueError(f"{path} does not match the {len(records)} {table} rows it was written from")
+
+            ids = sorted(live_ids)
+            for i in range(0, len(ids), settings.ATTENDANCE_ARCHIVE_BATCH_SIZE):
+                # Short transactions, and the markedAt range prunes StudentAttendance to the term's partitions
+                await delegate.delete_many(where={"id": {"in": ids[i:i + settings.ATTENDANCE_ARCHIVE_BATCH_SIZE]}, "markedAt": span})
+            left = await delegate.count(where={"markedAt": span})
+            if left:
+                raise ValueError(f"{left} {table} rows were added to the term while it was archived, run the archive again")
+
+        return [archive for archive in self.list_archives() if (archive.start, archive.end) == (start, end)]
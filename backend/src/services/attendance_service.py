@@ -9,6 +9,15 @@ from src.models.schemas import (
     TeacherAttendanceCreate,
     TeacherAttendanceUpdate
 )
+from src.utils.pagination import PageParams, paginate
+from src.services.archive_service import paginate_with_archive
+from src.utils.fieldsets import FieldSet, select_fields, delegate_for
+from src.config.database import reader_for
+from prisma.models import ClassSession, StudentAttendance, TeacherAttendance
+
+CLASS_SESSION_RELATIONS = {'course', 'teacher', 'teacher.user', 'schedule'}
+STUDENT_ATTENDANCE_RELATIONS = {'student', 'student.user', 'course', 'markedBy', 'markedBy.user', 'session'}
+TEACHER_ATTENDANCE_RELATIONS = {'teacher', 'teacher.user', 'course', 'session'}
 
 class AttendanceService:
     """Service for managing class sessions and attendance (both student and teacher)."""
@@ -43,39 +52,47 @@ class AttendanceService:
         return class_session
 
     @staticmethod
-    async def get_class_session_by_id(session_id: str, db: Prisma):
+    async def get_class_session_by_id(session_id: str, db: Prisma, fieldset: Optional[FieldSet] = None):
         """Get a class session by ID."""
-        return await db.classsession.find_unique(
+        db = reader_for(db)
+        partial, include = select_fields(fieldset, ClassSession, CLASS_SESSION_RELATIONS, {
+            'course': True,
+            'teacher': {
+                'include': {
+                    'user': True
+                }
+            },
+            'schedule': True
+        })
+        return await delegate_for(db, 'ClassSession', partial).find_unique(
             where={'id': session_id},
-            include={
-                'course': True,
-                'teacher': {
-                    'include': {
-                        'user': True
-                    }
-                },
-                'schedule': True
-            }
+            include=include
         )
 
     @staticmethod
-    async def get_course_sessions(course_id: str, date: Optional[datetime], db: Prisma):
-        """Get all sessions for a course, optionally filtered by date."""
+    async def get_course_sessions(course_id: str, date: Optional[datetime], db: Prisma, page: Optional[PageParams] = None, fieldset: Optional[FieldSet] = None):
+        """Get a page of sessions for a course, optionally filtered by date."""
+        db = reader_for(db)
         where_clause = {'courseId': course_id}
         if date:
             where_clause['date'] = date
             
-        return await db.classsession.find_many(
-            where=where_clause,
-            include={
-                'course': True,
-                'teacher': {
-                    'include': {
-                        'user': True
-                    }
+        partial, include = select_fields(fieldset, ClassSession, CLASS_SESSION_RELATIONS, {
+            'course': True,
+            'teacher': {
+                'include': {
+                    'user': True
                 }
-            },
-            order={'date': 'desc'}
+            }
+        })
+        return await paginate(
+            db,
+            'ClassSession',
+            page,
+            where=where_clause,
+            include=include,
+            order=[{'date': 'desc'}],
+            partial=partial
         )
 
     @staticmethod
@@ -170,29 +187,32 @@ class AttendanceService:
         return results
 
     @staticmethod
-    async def get_attendance_by_id(attendance_id: str, db: Prisma):
+    async def get_attendance_by_id(attendance_id: str, db: Prisma, fieldset: Optional[FieldSet] = None):
         """Get a specific student attendance record by ID."""
-        return await db.studentattendance.find_unique(
+        db = reader_for(db)
+        partial, include = select_fields(fieldset, StudentAttendance, STUDENT_ATTENDANCE_RELATIONS, {
+            'student': {
+                'include': {
+                    'user': True
+                }
+            },
+            'course': True,
+            'markedBy': {
+                'include': {
+                    'user': True
+                }
+            },
+            'session': True
+        })
+        return await delegate_for(db, 'StudentAttendance', partial).find_unique(
             where={'id': attendance_id},
-            include={
-                'student': {
-                    'include': {
-                        'user': True
-                    }
-                },
-                'course': True,
-                'markedBy': {
-                    'include': {
-                        'user': True
-                    }
-                },
-                'session': True
-            }
+            include=include
         )
 
     @staticmethod
-    async def get_course_attendance(course_id: str, date: Optional[datetime], db: Prisma):
-        """Get attendance records for a course, optionally filtered by session date."""
+    async def get_course_attendance(course_id: str, date: Optional[datetime], db: Prisma, page: Optional[PageParams] = None, fieldset: Optional[FieldSet] = None):
+        """Get a page of attendance records for a course, optionally filtered by session date, including archived terms."""
+        db = reader_for(db)
         where_clause = {'courseId': course_id}
         
         if date:
@@ -206,49 +226,60 @@ class AttendanceService:
             session_ids = [s.id for s in sessions]
             where_clause['sessionId'] = {'in': session_ids}
         
-        return await db.studentattendance.find_many(
-            where=where_clause,
-            include={
-                'student': {
-                    'include': {
-                        'user': True
-                    }
-                },
-                'course': True,
-                'markedBy': {
-                    'include': {
-                        'user': True
-                    }
-                },
-                'session': True
+        partial, include = select_fields(fieldset, StudentAttendance, STUDENT_ATTENDANCE_RELATIONS, {
+            'student': {
+                'include': {
+                    'user': True
+                }
             },
-            order={'markedAt': 'desc'}
+            'course': True,
+            'markedBy': {
+                'include': {
+                    'user': True
+                }
+            },
+            'session': True
+        })
+        return await paginate_with_archive(
+            db,
+            'StudentAttendance',
+            page,
+            where=where_clause,
+            include=include,
+            order=[{'markedAt': 'desc'}],
+            partial=partial
         )
 
     @staticmethod
-    async def get_student_attendance(student_id: str, course_id: Optional[str], db: Prisma):
-        """Get attendance records for a student, optionally filtered by course."""
+    async def get_student_attendance(student_id: str, course_id: Optional[str], db: Prisma, page: Optional[PageParams] = None, fieldset: Optional[FieldSet] = None):
+        """Get a page of attendance records for a student, optionally filtered by course, including archived terms."""
+        db = reader_for(db)
         where_clause = {'studentId': student_id}
         if course_id:
             where_clause['courseId'] = course_id
             
-        return await db.studentattendance.find_many(
-            where=where_clause,
-            include={
-                'student': {
-                    'include': {
-                        'user': True
-                    }
-                },
-                'course': True,
-                'markedBy': {
-                    'include': {
-                        'user': True
-                    }
-                },
-                'session': True
+        partial, include = select_fields(fieldset, StudentAttendance, STUDENT_ATTENDANCE_RELATIONS, {
+            'student': {
+                'include': {
+                    'user': True
+                }
+            },
+            'course': True,
+            'markedBy': {
+                'include': {
+                    'user': True
+                }
             },
-            order={'markedAt': 'desc'}
+            'session': True
+        })
+        return await paginate_with_archive(
+            db,
+            'StudentAttendance',
+            page,
+            where=where_clause,
+            include=include,
+            order=[{'markedAt': 'desc'}],
+            partial=partial
         )
 
     @staticmethod
@@ -289,6 +320,7 @@ class AttendanceService:
     @staticmethod
     async def get_all_students_attendance(db: Prisma):
         """Get attendance statistics for all students with course-wise breakdown."""
+        db = reader_for(db)
         students = await db.student.find_many(
             include={
                 'user': True,
@@ -378,6 +410,7 @@ class AttendanceService:
     @staticmethod
     async def get_teacher_attendance_by_id(attendance_id: str, db: Prisma):
         """Get a specific teacher attendance record by ID."""
+        db = reader_for(db)
         return await db.teacherattendance.find_unique(
             where={'id': attendance_id},
             include={
@@ -392,24 +425,30 @@ class AttendanceService:
         )
 
     @staticmethod
-    async def get_teacher_attendance(teacher_id: str, course_id: Optional[str], db: Prisma):
-        """Get attendance records for a teacher, optionally filtered by course."""
+    async def get_teacher_attendance(teacher_id: str, course_id: Optional[str], db: Prisma, page: Optional[PageParams] = None, fieldset: Optional[FieldSet] = None):
+        """Get a page of attendance records for a teacher, optionally filtered by course."""
+        db = reader_for(db)
         where_clause = {'teacherId': teacher_id}
         if course_id:
             where_clause['courseId'] = course_id
             
-        return await db.teacherattendance.find_many(
-            where=where_clause,
-            include={
-                'teacher': {
-                    'include': {
-                        'user': True
-                    }
-                },
-                'course': True,
-                'session': True
+        partial, include = select_fields(fieldset, TeacherAttendance, TEACHER_ATTENDANCE_RELATIONS, {
+            'teacher': {
+                'include': {
+                    'user': True
+                }
             },
-            order={'markedAt': 'desc'}
+            'course': True,
+            'session': True
+        })
+        return await paginate(
+            db,
+            'TeacherAttendance',
+            page,
+            where=where_clause,
+            include=include,
+            order=[{'markedAt': 'desc'}],
+            partial=partial
         )
 
     @staticmethod
@@ -445,6 +484,7 @@ class AttendanceService:
     @staticmethod
     async def get_all_teachers_attendance(db: Prisma):
         """Get attendance statistics for all teachers with course-wise breakdown."""
+        db = reader_for(db)
         teachers = await db.teacher.find_many(
             include={
                 'user': True,
@@ -7,6 +7,7 @@ from src.utils.password import verify_password, hash_password
 from prisma.models import User
 from prisma import Prisma
 from src.utils.jwt import create_access_token, verify_token
+from src.utils.response_cache import response_cache
 
 class AuthService:
 
@@ -73,6 +74,7 @@ class AuthService:
             if user.joiningDate:
                 teacher_data["joiningDate"] = user.joiningDate
             await self.db.teacher.create(data=teacher_data)
+            response_cache.invalidate("teachers")
         
         return UserOut.model_validate(created_user)
         
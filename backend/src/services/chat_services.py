@@ -1,6 +1,7 @@
 from typing import List, Optional
 from prisma import Prisma
 from prisma.models import ChatMessage
+from src.config.database import reader_for
 
 class ChatService:
     def __init__(self, db: Prisma):
@@ -26,7 +27,7 @@ class ChatService:
         return message
 
     async def get_messages(self, thread_id: str, limit: int = 50) -> List[ChatMessage]:
-        messages = await self.db.chatmessage.find_many(
+        messages = await reader_for(self.db).chatmessage.find_many(
             where={'threadId': thread_id},
             take=limit,
             order={'createdAt': 'asc'}
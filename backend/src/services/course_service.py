@@ -1,25 +1,44 @@
-from typing import List, Optional
+from typing import Optional
 from prisma import Prisma
 from prisma.models import Course
+from src.utils.pagination import Page, PageParams, paginate
+from src.utils.fieldsets import FieldSet, select_fields, delegate_for
+from src.config.database import reader_for
+from src.utils.loaders import prime_row, forget_row
+from src.utils.response_cache import invalidates
+
+COURSE_RELATIONS = {"department", "teacher", "teacher.user"}
 
 class CourseService:
     def __init__(self, db: Prisma):
         self.db = db
 
-    async def get_all_courses(self) -> List[Course]:
-        return await self.db.course.find_many()
+    async def get_all_courses(self, page: Optional[PageParams] = None, fieldset: Optional[FieldSet] = None) -> Page[Course]:
+        partial, include = select_fields(fieldset, Course, COURSE_RELATIONS)
+        return await paginate(reader_for(self.db), "Course", page, include=include, partial=partial)
 
-    async def get_course_by_id(self, course_id: str) -> Optional[Course]:
-        return await self.db.course.find_unique(where={"id": course_id})
+    async def get_course_by_id(self, course_id: str, fieldset: Optional[FieldSet] = None) -> Optional[Course]:
+        partial, include = select_fields(fieldset, Course, COURSE_RELATIONS)
+        return await delegate_for(reader_for(self.db), "Course", partial).find_unique(where={"id": course_id}, include=include)
 
+    @invalidates("courses")
     async def create_course(self, course_data: dict) -> Course:
-        return await self.db.course.create(data=course_data)
+        course = await self.db.course.create(data=course_data)
+        prime_row(self.db, "Course", course, ("id", "courseCode"))
+        return course
 
+    @invalidates("courses")
     async def update_course(self, course_id: str, course_data: dict) -> Optional[Course]:
-        return await self.db.course.update(
+        course = await self.db.course.update(
             where={"id": course_id},
             data=course_data
         )
+        if course:
+            prime_row(self.db, "Course", course, ("id", "courseCode"))
+        return course
 
+    @invalidates("courses")
     async def delete_course(self, course_id: str) -> Course:
-        return await self.db.course.delete(where={"id": course_id})
\ No newline at end of file
+        course = await self.db.course.delete(where={"id": course_id})
+        forget_row("Course", course_id)
+        return course
\ No newline at end of file
@@ -1,34 +1,59 @@
-from typing import List, Optional
+from typing import Optional
 from prisma import Prisma
 from src.models.schemas import DepartmentCreate, DepartmentUpdate
 from prisma.models import Department
+from src.utils.pagination import Page, PageParams, paginate
+from src.config.database import reader_for
+from src.utils.response_cache import invalidates
+from src.utils.loaders import load, prime_row, forget_row
+
+# Unique columns departments are loaded by
+_KEYS = ("id", "code")
+
 class DepartmentService:
     def __init__(self, db: Prisma):
         self.db = db
 
+    @invalidates("departments", "courses")
     async def create_department(self, department_data: DepartmentCreate) -> Department:
         department = await self.db.department.create(data=department_data.dict())
+        prime_row(self.db, "Department", department, _KEYS)
         return department
 
     async def get_department(self, department_id: str) -> Optional[Department]:
-        department = await self.db.department.find_unique(where={"id": department_id})
+        department = await load(self.db, "Department", department_id)
         return department
 
+    @invalidates("departments", "courses")
     async def update_department(self, department_id: str, department_data: DepartmentUpdate) -> Optional[Department]:
         department = await self.db.department.update(
             where={"id": department_id},
             data=department_data.dict(exclude_unset=True)
         )
+        if department:
+            prime_row(self.db, "Department", department, _KEYS)
         return department
 
+    @invalidates("departments", "courses")
     async def delete_department(self, department_id: str) -> Optional[Department]:
         department = await self.db.department.delete(where={"id": department_id})
+        forget_row("Department", department_id)
         return department
     
+    @invalidates("departments", "courses")
     async def delete_department_by_code(self, department_code: str) -> Optional[Department]:
         department = await self.db.department.delete(where={"code": department_code})
+        if department:
+            forget_row("Department", department.id)
         return department
 
-    async def list_departments(self) -> List[Department]:
-        departments = await self.db.department.find_many()
+    async def get_department_by_code(self, department_code: str) -> Optional[Department]:
+        department = await load(self.db, "Department", department_code, by="code")
+        return department
+
+    async def count_departments(self) -> int:
+        return await reader_for(self.db).department.count()
+
+    async def list_departments(self, page: Optional[PageParams] = None) -> Page[Department]:
+        departments = await paginate(reader_for(self.db), "Department", page)
         return departments
\ No newline at end of file
@@ -1,6 +1,7 @@
 from typing import List, Optional
 from prisma import Prisma
 from src.models.schemas import EnrollmentCreate, EnrollmentUpdate, EnrollmentResponse
+from src.config.database import reader_for
 
 
 class EnrollmentService:
@@ -19,7 +20,7 @@ class EnrollmentService:
         return EnrollmentResponse.model_validate(enrollment)
     
     async def get_enrollment(self,enrollment_id:str)->Optional[EnrollmentResponse]:
-        enrollment=await self.db.enrollment.find_unique(where={
+        enrollment=await reader_for(self.db).enrollment.find_unique(where={
             'id':enrollment_id
         })
         return EnrollmentResponse.model_validate(enrollment) if enrollment else None
@@ -37,5 +38,5 @@ class EnrollmentService:
 
     async def list_enrollments(self, student_id: Optional[str] = None) -> List[EnrollmentResponse]:
         where = {'student_id': student_id} if student_id else {}
-        enrollments = await self.db.enrollment.find_many(where=where)
+        enrollments = await reader_for(self.db).enrollment.find_many(where=where)
         return [EnrollmentResponse.model_validate(e) for e in enrollments]
\ No newline at end of file
@@ -0,0 +1,290 @@
+import asyncio
+import csv
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from prisma import Json, Prisma
+from src.config.settings import settings
+from src.models.schemas import ImportReport, ImportRowError
+from src.utils.password import hash_password
+from src.utils.response_cache import response_cache
+from src.utils.validators import validate_email, validate_password, validate_student_id, validate_teacher_id
+
+
+class _Spec:
+    """How one kind of CSV maps onto a User plus a role profile"""
+
+    def __init__(
+        self,
+        role: str,
+        profile: str,
+        id_column: str,
+        validate_id: Callable[[str], bool],
+        required: Tuple[str, ...],
+        optional: Tuple[str, ...],
+        ints: Tuple[str, ...] = (),
+        dates: Tuple[str, ...] = ()
+    ):
+        self.role = role
+        self.profile = profile
+        self.id_column = id_column
+        self.validate_id = validate_id
+        self.required = required
+        self.optional = optional
+        self.ints = ints
+        self.dates = dates
+
+
+SPECS = {
+    "students": _Spec(
+        role="STUDENT",
+        profile="student",
+        id_column="studentId",
+        validate_id=validate_student_id,
+        required=("email", "name", "password", "studentId", "department", "semester", "batch"),
+        optional=("phoneNumber", "address", "dateOfBirth"),
+        ints=("semester",),
+        dates=("dateOfBirth",)
+    ),
+    "teachers": _Spec(
+        role="TEACHER",
+        profile="teacher",
+        id_column="teacherId",
+        validate_id=validate_teacher_id,
+        required=("email", "name", "password", "teacherId", "department", "designation"),
+        optional=("specialization", "phoneNumber", "officeRoom", "officeHours", "joiningDate"),
+        dates=("joiningDate",)
+    ),
+}
+
+_USER_COLUMNS = ("email", "name", "password")
+
+# bcrypt is CPU bound, so hashing thousands of passwords gets its own processes
+_hash_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _hasher() -> ProcessPoolExecutor:
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = ProcessPoolExecutor(max_workers=settings.IMPORT_HASH_WORKERS or None)
+    return _hash_pool
+
+
+# Running background jobs of this worker; their reports are in the ImportJob
+# table so any worker can answer a poll
+_job_tasks: Set[asyncio.Task] = set()
+
+
+class _Row:
+    __slots__ = ("line", "user", "profile", "password")
+
+    def __init__(self, line: int, user: Dict[str, Any], profile: Dict[str, Any], password: str):
+        self.line = line
+        self.user = user
+        self.profile = profile
+        self.password = password
+
+
+class ImportService:
+    def __init__(self, db: Prisma):
+        self.db = db
+
+    async def import_csv(
+        self,
+        kind: str,
+        lines: Iterable[str],
+        report: Optional[ImportReport] = None,
+        on_batch: Optional[Callable[[ImportReport], Awaitable[None]]] = None
+    ) -> ImportReport:
+        """
+        Validate and insert users with their profiles from CSV text.
+        lines is read lazily, so a file object streams from disk; rows are
+        inserted every IMPORT_BATCH_SIZE rows and bad rows are reported
+        without stopping the import. on_batch is awaited after every batch.
+        """
+        spec = SPECS[kind]
+        report = report or ImportReport(kind=kind)
+        try:
+            reader = csv.DictReader(lines)
+            missing = [c for c in spec.required if c not in (reader.fieldnames or [])]
+            if missing:
+                report.errors.append(ImportRowError(row=1, message=f"Missing columns: {', '.join(missing)}"))
+                report.status = "failed"
+                return report
+
+            seen_emails: Set[str] = set()
+            seen_ids: Set[str] = set()
+            batch: List[_Row] = []
+            for line, raw in enumerate(reader, start=2):
+                report.total_rows += 1
+                row = self._validate(spec, line, raw, seen_emails, seen_ids, report)
+                if row is not None:
+                    batch.append(row)
+                if len(batch) >= settings.IMPORT_BATCH_SIZE:
+                    await self._insert_batch(spec, batch, report)
+                    batch = []
+                    if on_batch:
+                        await on_batch(report)
+            if batch:
+                await self._insert_batch(spec, batch, report)
+            report.status = "completed"
+        except Exception as e:
+            report.errors.append(ImportRowError(row=0, message=f"Import aborted: {str(e)}"))
+            report.status = "failed"
+        finally:
+            if report.created and spec.role == "TEACHER":
+                response_cache.invalidate("teachers")
+        return report
+
+    def _validate(
+        self,
+        spec: _Spec,
+        line: int,
+        raw: Dict[str, Optional[str]],
+        seen_emails: Set[str],
+        seen_ids: Set[str],
+        report: ImportReport
+    ) -> Optional[_Row]:
+        values = {key: (value or "").strip() for key, value in raw.items() if key}
+        errors: List[ImportRowError] = []
+
+        for column in spec.required:
+            if not values.get(column):
+                errors.append(ImportRowError(row=line, field=column, message="Required"))
+
+        email = values.get("email", "").lower()
+        if email and not validate_email(email):
+            errors.append(ImportRowError(row=line, field="email", message="Invalid email"))
+        elif email in seen_emails:
+            errors.append(ImportRowError(row=line, field="email", message="Duplicate email in file"))
+
+        password = values.get("password", "")
+        if password and not validate_password(password):
+            errors.append(ImportRowError(row=line, field="password", message="Password must be at least 8 characters"))
+
+        profile_id = values.get(spec.id_column, "")
+        if profile_id and not spec.validate_id(profile_id):
+            errors.append(ImportRowError(row=line, field=spec.id_column, message=f"Invalid {spec.id_column}"))
+        elif profile_id in seen_ids:
+            errors.append(ImportRowError(row=line, field=spec.id_column, message=f"Duplicate {spec.id_column} in file"))
+
+        profile: Dict[str, Any] = {}
+        for column in spec.required + spec.optional:
+            if column in _USER_COLUMNS or not values.get(column):
+                continue
+            value: Any = values[column]
+            try:
+                if column in spec.ints:
+                    value = int(value)
+                elif column in spec.dates:
+                    value = datetime.fromisoformat(value)
+            except ValueError:
+                errors.append(ImportRowError(row=line, field=column, message=f"Invalid value {value!r}"))
+                continue
+            profile[column] = value
+
+        if errors:
+            report.errors.extend(errors)
+            report.failed += 1
+            return None
+
+        seen_emails.add(email)
+        seen_ids.add(profile_id)
+        user = {"email": email, "name": values["name"], "role": spec.role}
+        return _Row(line, user, profile, password)
+
+    def _reject(self, report: ImportReport, rows: List[_Row], field: Optional[str], message: str) -> None:
+        for row in rows:
+            report.errors.append(ImportRowError(row=row.line, field=field, message=message))
+        report.failed += len(rows)
+
+    async def _insert_batch(self, spec: _Spec, batch: List[_Row], report: ImportReport) -> None:
+        """Skip rows that already exist, hash in parallel, then insert users and profiles in one transaction"""
+        profiles = getattr(self.db, spec.profile)
+        taken_emails = {
+            user.email for user in await self.db.user.find_many(
+                where={"email": {"in": [row.user["email"] for row in batch]}}
+            )
+        }
+        taken_ids = {
+            getattr(profile, spec.id_column) for profile in await profiles.find_many(
+                where={spec.id_column: {"in": [row.profile[spec.id_column] for row in batch]}}
+            )
+        }
+        self._reject(report, [r for r in batch if r.user["email"] in taken_emails], "email", "Email already registered")
+        self._reject(
+            report,
+            [r for r in batch if r.user["email"] not in taken_emails and r.profile[spec.id_column] in taken_ids],
+            spec.id_column,
+            f"{spec.id_column} already exists"
+        )
+        batch = [r for r in batch if r.user["email"] not in taken_emails and r.profile[spec.id_column] not in taken_ids]
+        if not batch:
+            return
+
+        loop = asyncio.get_running_loop()
+        hashes = await asyncio.gather(*(
+            loop.run_in_executor(_hasher(), hash_password, row.password) for row in batch
+        ))
+
+        try:
+            async with self.db.tx(timeout=timedelta(seconds=60)) as tx:
+                await tx.user.create_many(data=[
+                    {**row.user, "password": hashed} for row, hashed in zip(batch, hashes)
+                ])
+                # create_many does not return rows, so read the generated ids back
+                created = await tx.user.find_many(where={"email": {"in": [row.user["email"] for row in batch]}})
+                user_ids = {user.email: user.id for user in created}
+                await getattr(tx, spec.profile).create_many(data=[
+                    {**row.profile, "userId": user_ids[row.user["email"]]} for row in batch
+                ])
+        except Exception as e:
+            self._reject(report, batch, None, f"Batch insert failed: {str(e)}")
+            return
+        report.created += len(batch)
+
+
+async def _save_job(db: Prisma, report: ImportReport) -> None:
+    await db.importjob.update(where={"id": report.job_id}, data={"report": Json(report.model_dump(mode="json"))})
+
+
+async def _expire_jobs(db: Prisma) -> None:
+    # A job not updated for this long has finished, or its worker died with it
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.IMPORT_JOB_TTL_SECONDS)
+    await db.importjob.delete_many(where={"updatedAt": {"lt": cutoff}})
+
+
+async def start_import_job(db: Prisma, kind: str, path: str) -> ImportReport:
+    """Import a CSV saved at path in the background; the file is deleted afterwards"""
+    await _expire_jobs(db)
+    report = ImportReport(job_id=uuid.uuid4().hex, kind=kind)
+    try:
+        await db.importjob.create(data={"id": report.job_id, "kind": kind, "report": Json(report.model_dump(mode="json"))})
+    except Exception:
+        os.remove(path)
+        raise
+
+    async def run():
+        try:
+            with open(path, encoding="utf-8-sig", newline="") as f:
+                await ImportService(db).import_csv(kind, f, report, lambda progress: _save_job(db, progress))
+        except Exception as e:
+            report.errors.append(ImportRowError(row=0, message=f"Import aborted: {str(e)}"))
+            report.status = "failed"
+        finally:
+            os.remove(path)
+            await _save_job(db, report)
+
+    task = asyncio.create_task(run())
+    _job_tasks.add(task)
+    task.add_done_callback(_job_tasks.discard)
+    return report
+
+
+async def get_import_job(db: Prisma, job_id: str) -> Optional[ImportReport]:
+    job = await db.importjob.find_unique(where={"id": job_id})
+    if not job:
+        return None
+    return ImportReport.model_validate(job.report)
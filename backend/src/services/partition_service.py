@@ -0,0 +1,157 @@
+import asyncio
+import re
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+from prisma import Prisma
+from src.config.settings import settings
+from src.models.schemas import AttendancePartition
+
+# StudentAttendance is range-partitioned by month of markedAt, see the
+# partition_student_attendance migration. Partitions are named
+# StudentAttendance_YYYY_MM; the default partition catches anything else.
+PARENT = "StudentAttendance"
+
+_BOUNDS = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+# Any constant works as long as every worker uses the same one
+_LOCK_ID = 7_240_301
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_{month:%Y_%m}"
+
+
+def create_partition_sql(month: date) -> str:
+    """DDL for the partition of one month; names and bounds come from dates only"""
+    month = month_start(month)
+    return (
+        f'CREATE TABLE IF NOT EXISTS "{partition_name(month)}" PARTITION OF "{PARENT}" '
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+class PartitionService:
+    def __init__(self, db: Prisma):
+        self.db = db
+
+    async def is_partitioned(self) -> bool:
+        rows = await self.db.query_raw(
+            "SELECT relkind FROM pg_class WHERE oid = to_regclass($1)", f'"{PARENT}"'
+        )
+        return bool(rows) and rows[0]["relkind"] == "p"
+
+    async def list_partitions(self) -> List[AttendancePartition]:
+        """Attached partitions, oldest first, with the planner's row estimate and size on disk"""
+        rows = await self.db.query_raw(
+            """
+            SELECT c.relname AS name,
+                   pg_get_expr(c.relpartbound, c.oid) AS bound,
+                   greatest(c.reltuples, 0)::bigint AS estimated_rows,
+                   pg_total_relation_size(c.oid) AS bytes
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass($1)
+            ORDER BY c.relname
+            """,
+            f'"{PARENT}"'
+        )
+        partitions = []
+        for row in rows:
+            bounds = _BOUNDS.search(row["bound"] or "")
+            partitions.append(AttendancePartition(
+                name=row["name"],
+                range_from=datetime.fromisoformat(bounds[1]).date() if bounds else None,
+                range_to=datetime.fromisoformat(bounds[2]).date() if bounds else None,
+                estimated_rows=int(row["estimated_rows"]),
+                bytes=int(row["bytes"])
+            ))
+        return partitions
+
+    async def ensure_partitions(self, first: date, last: date) -> List[str]:
+        """Create the missing monthly partitions from first to last inclusive"""
+        existing = {partition.name for partition in await self.list_partitions()}
+        months = []
+        month = month_start(first)
+        while month <= last:
+            if partition_name(month) not in existing:
+                months.append(month)
+            month = add_months(month, 1)
+        if not months:
+            return []
+
+        # Every worker runs this at startup; let one of them do the DDL at a time
+        async with self.db.tx(timeout=timedelta(seconds=60)) as tx:
+            await tx.query_raw("SELECT 1 FROM pg_advisory_xact_lock($1)", _LOCK_ID)
+            for month in months:
+                await tx.execute_raw(create_partition_sql(month))
+        return [partition_name(month) for month in months]
+
+    async def ensure_upcoming(self, months_ahead: Optional[int] = None) -> List[str]:
+        """The current month and the next months_ahead months"""
+        if months_ahead is None:
+            months_ahead = settings.ATTENDANCE_PARTITION_MONTHS_AHEAD
+        today = date.today()
+        return await self.ensure_partitions(today, add_months(month_start(today), months_ahead))
+
+    async def detach_term(self, start: date, end: date) -> List[str]:
+        """
+        Detach the monthly partitions of [start, end), e.g. one academic term.
+        Detaching only updates the catalog, so it takes the same time for any
+        number of rows; the detached tables keep their rows and can be archived,
+        dumped or dropped on their own.
+        """
+        if start != month_start(start) or end != month_start(end) or end <= start:
+            raise ValueError("A term must start and end on the first day of a month")
+        if end > month_start(date.today()):
+            raise ValueError("Only terms that ended before the current month can be detached")
+
+        detached = []
+        for partition in await self.list_partitions():
+            if partition.range_from is None or not (start <= partition.range_from and partition.range_to <= end):
+                continue
+            await self.db.execute_raw(f'ALTER TABLE "{PARENT}" DETACH PARTITION "{partition.name}"')
+            detached.append(partition.name)
+        return detached
+
+
+_tasks: List[asyncio.Task] = []
+
+
+async def _maintain(db: Prisma) -> None:
+    while True:
+        await asyncio.sleep(24 * 60 * 60)
+        try:
+            await PartitionService(db).ensure_upcoming()
+        except Exception as e:
+            print(f"⚠️ Could not create attendance partitions: {e}")
+
+
+async def start_partition_maintenance(db: Prisma) -> None:
+    """Create upcoming attendance partitions now and once a day"""
+    service = PartitionService(db)
+    try:
+        if not await service.is_partitioned():
+            print(f"⚠️ {PARENT} is not partitioned, run prisma migrate deploy")
+            return
+        created = await service.ensure_upcoming()
+    except Exception as e:
+        print(f"⚠️ Could not create attendance partitions: {e}")
+    else:
+        if created:
+            print(f"✅ Created attendance partitions {', '.join(created)}")
+    _tasks.append(asyncio.create_task(_maintain(db)))
+
+
+async def stop_partition_maintenance() -> None:
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
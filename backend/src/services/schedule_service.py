@@ -1,6 +1,12 @@
 from typing import List, Optional, Dict, Any
 from prisma import Prisma
 from src.models.schemas import ScheduleCreate, ScheduleUpdate, ScheduleResponse
+from src.utils.pagination import Page, PageParams, paginate
+from src.utils.fieldsets import FieldSet, select_fields, delegate_for
+from src.config.database import reader_for
+from prisma.models import Schedule
+
+SCHEDULE_RELATIONS = {"course", "teacher", "teacher.user"}
 
 class ScheduleService:
     def __init__(self, db: Prisma):
@@ -9,25 +15,36 @@ class ScheduleService:
     async def get_schedules(
         self, 
         course_id: Optional[str] = None, 
-        teacher_id: Optional[str] = None
-    ) -> List[ScheduleResponse]:
+        teacher_id: Optional[str] = None,
+        page: Optional[PageParams] = None,
+        fieldset: Optional[FieldSet] = None
+    ) -> Page[Schedule]:
         filters = {}
         if course_id:
             filters['courseId'] = course_id
         if teacher_id:
             filters['teacherId'] = teacher_id
         
-        schedules = await self.db.schedule.find_many(
+        partial, include = select_fields(fieldset, Schedule, SCHEDULE_RELATIONS)
+        schedules = await paginate(
+            reader_for(self.db),
+            "Schedule",
+            page,
             where=filters,
+            include=include,
             order=[
                 {'dayOfWeek': 'asc'},
                 {'startTime': 'asc'}
-            ]
+            ],
+            partial=partial
         )
-        return [ScheduleResponse.model_validate(schedule) for schedule in schedules]
+        return schedules
 
-    async def get_schedule(self, schedule_id: str) -> Optional[ScheduleResponse]:
-        schedule = await self.db.schedule.find_unique(where={'id': schedule_id})
+    async def get_schedule(self, schedule_id: str, fieldset: Optional[FieldSet] = None) -> Optional[ScheduleResponse]:
+        partial, include = select_fields(fieldset, Schedule, SCHEDULE_RELATIONS)
+        schedule = await delegate_for(reader_for(self.db), "Schedule", partial).find_unique(where={'id': schedule_id}, include=include)
+        if partial is not None:
+            return schedule
         return ScheduleResponse.model_validate(schedule) if schedule else None
 
     async def create_schedule(self, schedule_data: ScheduleCreate) -> ScheduleResponse:
@@ -61,11 +78,11 @@ class ScheduleService:
         await self.db.schedule.delete(where={'id': schedule_id})
         return True
 
-    async def get_teacher_schedule(self, teacher_id: str) -> List[ScheduleResponse]:
-        return await self.get_schedules(teacher_id=teacher_id)
+    async def get_teacher_schedule(self, teacher_id: str, page: Optional[PageParams] = None) -> Page[Schedule]:
+        return await self.get_schedules(teacher_id=teacher_id, page=page)
 
-    async def get_course_schedule(self, course_id: str) -> List[ScheduleResponse]:
-        return await self.get_schedules(course_id=course_id)
+    async def get_course_schedule(self, course_id: str, page: Optional[PageParams] = None) -> Page[Schedule]:
+        return await self.get_schedules(course_id=course_id, page=page)
 
     def _parse_time_to_period(self, time_str: str) -> Optional[int]:
         """Convert time string like '10:00 AM' to period index (0-8)"""
@@ -126,7 +143,7 @@ class ScheduleService:
         ]
 
         # Fetch schedules with relations
-        schedules = await self.db.schedule.find_many(
+        schedules = await reader_for(self.db).schedule.find_many(
             include={
                 "course": True,
                 "teacher": {
@@ -176,7 +193,8 @@ class ScheduleService:
         """Get subject details with teacher names and room codes"""
         print("Getting subjects details...")
         
-        courses = await self.db.course.find_many(
+        db = reader_for(self.db)
+        courses = await db.course.find_many(
             include={
                 'teacher': {
                     'include': {
@@ -188,6 +206,16 @@ class ScheduleService:
         
         print(f"Found {len(courses)} courses")
         
+        # Room codes of every course from one query instead of one per course
+        rooms: Dict[str, set] = {}
+        if courses:
+            schedules = await db.schedule.find_many(
+                where={'courseId': {'in': [course.id for course in courses]}}
+            )
+            for schedule in schedules:
+                if schedule.room:
+                    rooms.setdefault(schedule.courseId, set()).add(schedule.room)
+
         subjects_details = {}
         
         for course in courses:
@@ -196,12 +224,7 @@ class ScheduleService:
             if course.teacher and course.teacher.user:
                 teacher_name = course.teacher.user.name
             
-            # Get room codes from schedules
-            schedules = await self.db.schedule.find_many(
-                where={'courseId': course.id}
-            )
-            
-            room_codes = list(set([s.room for s in schedules if s.room]))
+            room_codes = list(rooms.get(course.id, ()))
             
             subjects_details[course.courseCode] = {
                 'subjectName': course.courseName,
@@ -1,22 +1,30 @@
-from typing import List, Optional
+from typing import Optional
 from prisma import Prisma
 from src.models.schemas import StudentCreate, StudentUpdate
 from prisma.models import Student as StudentModel
+from src.utils.pagination import Page, PageParams, paginate
+from src.utils.fieldsets import FieldSet, select_fields, delegate_for
+from src.config.database import reader_for
+from src.utils.loaders import prime_row, forget_row
+
+STUDENT_RELATIONS = {"user"}
 
 class StudentService:
     def __init__(self, db: Prisma):
         self.db = db
 
-    async def get_student(self, student_id: str) -> Optional[StudentModel]:
-        student = await self.db.student.find_unique(
+    async def get_student(self, student_id: str, fieldset: Optional[FieldSet] = None) -> Optional[StudentModel]:
+        partial, include = select_fields(fieldset, StudentModel, STUDENT_RELATIONS, {"user": True})
+        student = await delegate_for(reader_for(self.db), "Student", partial).find_unique(
             where={"id": student_id},
-            include={"user": True}
+            include=include
         )
         return student
 
     async def create_student(self, student_data: StudentCreate) -> StudentModel:
     
         student = await self.db.student.create(data=student_data.dict())
+        prime_row(self.db, "Student", student, ("id", "userId"))
         return student
 
     async def update_student(self, student_id: str, student_data: StudentUpdate) -> Optional[StudentModel]:
@@ -24,12 +32,16 @@ class StudentService:
             where={"id": student_id},
             data=student_data.dict(exclude_unset=True)
         )
+        if student:
+            prime_row(self.db, "Student", student, ("id", "userId"))
         return student
 
     async def delete_student(self, student_id: str) -> Optional[StudentModel]:
         student = await self.db.student.delete(where={"id": student_id})
+        forget_row("Student", student_id)
         return student
 
-    async def list_students(self) -> List[StudentModel]:
-        students = await self.db.student.find_many(include={"user": True})
+    async def list_students(self, page: Optional[PageParams] = None, fieldset: Optional[FieldSet] = None) -> Page[StudentModel]:
+        partial, include = select_fields(fieldset, StudentModel, STUDENT_RELATIONS, {"user": True})
+        students = await paginate(reader_for(self.db), "Student", page, include=include, partial=partial)
         return students
\ No newline at end of file
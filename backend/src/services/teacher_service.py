@@ -1,34 +1,50 @@
-from typing import List, Optional
+from typing import Optional
 from prisma import Prisma
 from src.models.schemas import TeacherCreate, TeacherUpdate
 from prisma.models import Teacher
+from src.utils.pagination import Page, PageParams, paginate
+from src.utils.fieldsets import FieldSet, select_fields, delegate_for
+from src.config.database import reader_for
+from src.utils.loaders import prime_row, forget_row
+from src.utils.response_cache import invalidates
+
+TEACHER_RELATIONS = {"user"}
 
 class TeacherService:
     def __init__(self, db: Prisma):
         self.db = db
 
+    @invalidates("teachers", "courses")
     async def create_teacher(self, teacher_data: TeacherCreate) -> Teacher:
         teacher = await self.db.teacher.create(data=teacher_data.dict())
+        prime_row(self.db, "Teacher", teacher, ("id", "userId"))
         return teacher
 
-    async def get_teacher(self, teacher_id: str) -> Optional[Teacher]:
-        teacher = await self.db.teacher.find_unique(
+    async def get_teacher(self, teacher_id: str, fieldset: Optional[FieldSet] = None) -> Optional[Teacher]:
+        partial, include = select_fields(fieldset, Teacher, TEACHER_RELATIONS, {"user": True})
+        teacher = await delegate_for(reader_for(self.db), "Teacher", partial).find_unique(
             where={"id": teacher_id},
-            include={"user": True}
+            include=include
         )
         return teacher
 
+    @invalidates("teachers", "courses")
     async def update_teacher(self, teacher_id: str, teacher_data: TeacherUpdate) -> Optional[Teacher]:
         teacher = await self.db.teacher.update(
             where={"id": teacher_id},
             data=teacher_data.dict(exclude_unset=True)
         )
+        if teacher:
+            prime_row(self.db, "Teacher", teacher, ("id", "userId"))
         return teacher
 
+    @invalidates("teachers", "courses")
     async def delete_teacher(self, teacher_id: str) -> Optional[Teacher]:
         teacher = await self.db.teacher.delete(where={"id": teacher_id})
+        forget_row("Teacher", teacher_id)
         return teacher
 
-    async def list_teachers(self) -> List[Teacher]:
-        teachers = await self.db.teacher.find_many(include={"user": True})
+    async def list_teachers(self, page: Optional[PageParams] = None, fieldset: Optional[FieldSet] = None) -> Page[Teacher]:
+        partial, include = select_fields(fieldset, Teacher, TEACHER_RELATIONS, {"user": True})
+        teachers = await paginate(reader_for(self.db), "Teacher", page, include=include, partial=partial)
         return teachers
\ No newline at end of file
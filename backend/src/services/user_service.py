@@ -1,6 +1,11 @@
-from typing import List, Optional
+from typing import Optional
 from prisma import Prisma
 from src.models.schemas import UserCreate, UserUpdate, UserOut
+from src.utils.pagination import Page, PageParams, paginate
+from src.config.database import reader_for
+from prisma.models import User
+from src.utils.response_cache import invalidates
+from src.utils.loaders import load, prime_row, forget_row
 
 class UserService:
     def __init__(self, db: Prisma):
@@ -11,27 +16,36 @@ class UserService:
         return UserOut.from_orm(user)
 
     async def get_user(self, user_id: str) -> Optional[UserOut]:
-        user = await self.db.user.find_unique(where={"id": user_id})
+        user = await load(self.db, "User", user_id)
         return UserOut.from_orm(user) if user else None
     
     async def get_user_email(self, user_email: str) -> Optional[UserOut]:
-        user = await self.db.user.find_unique(where={"email": user_email})
+        user = await reader_for(self.db).user.find_unique(where={"email": user_email})
         return UserOut.from_orm(user) if user else None
 
+    @invalidates("teachers", "courses")
     async def update_user(self, user_id: str, user_data: UserUpdate) -> Optional[UserOut]:
         user = await self.db.user.update(
             where={"id": user_id},
             data=user_data.dict(exclude_unset=True)
         )
+        if user:
+            prime_row(self.db, "User", user)
         return UserOut.from_orm(user)
 
+    @invalidates("teachers", "courses")
     async def delete_user(self, user_id: str) -> bool:
         try:
             await self.db.user.delete(where={"id": user_id})
+            forget_row("User", user_id)
+            # Profiles go with their user
+            for profile in ("Student", "Teacher", "Admin"):
+                forget_row(profile, user_id, "userId")
             return True
         except Exception:
             return False
 
-    async def list_users(self) -> List[UserOut]:
-        users = await self.db.user.find_many()
-        return [UserOut.from_orm(user) for user in users]
\ No newline at end of file
+    async def list_users(self, page: Optional[PageParams] = None) -> Page[User]:
+        """Raw rows, including the password hash; routes must encode them with a public schema"""
+        users = await paginate(reader_for(self.db), "User", page)
+        return users
\ No newline at end of file
@@ -2,17 +2,21 @@ from langchain_core.tools import tool
 from src.services.department_service import DepartmentService
 from src.models.schemas import DepartmentCreate, DepartmentUpdate,DepartmentSchema
 from src.config.database import prisma
+from src.utils.pagination import PageParams, MAX_PAGE_SIZE
+from src.utils.tool_cache import cached_tool
 from fastapi import Depends
 
 
 @tool
+@cached_tool("departments")
 async def list_all_departments():
     """Get all departments from the database. Use this when user asks to see all departments, list departments, or show departments."""
     service=DepartmentService(prisma)
-    departments=await service.list_departments()
-    return [{"id": d.id, "name": d.name, "code": d.code} for d in departments]
+    departments=await service.list_departments(PageParams(limit=MAX_PAGE_SIZE))
+    return [{"id": d.id, "name": d.name, "code": d.code} for d in departments.items]
 
 @tool
+@cached_tool("departments")
 async def get_department_by_id(department_id: str):
     """Get a specific department by its ID.
     
@@ -0,0 +1,141 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Hashable, Optional, Tuple
+from src.config.settings import settings
+from src.utils.metrics import AGENT_QUEUE_WAIT, AGENT_REJECTED, Gauge
+
+# Admission control for agent runs, per worker. Identical questions asked
+# while one is being answered share that run (single flight), and the runs
+# that do reach the model are capped per user and per worker: a user over
+# their cap is turned away at once, everyone else queues for a free slot
+# until AGENT_QUEUE_TIMEOUT_SECONDS.
+
+
+class AgentBusy(Exception):
+    """No slot for another agent run; status_code is 429 for a user over their cap, 503 for a full worker"""
+
+    def __init__(self, detail: str, status_code: int, retry_after: int):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class SingleFlight:
+    """
+    One execution per key at a time. The first caller leads and settles the
+    flight with its result; callers with the same key meanwhile follow it. A
+    flight that fails passes its error on to the followers; one that is
+    abandoned is cancelled, and its followers run the work themselves.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, asyncio.Future] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def lead(self, key: Hashable) -> asyncio.Future:
+        """Register the caller as the one running key; it must settle the future when done"""
+        flight = asyncio.get_running_loop().create_future()
+        self._flights[key] = flight
+        self.leaders += 1
+        # Retrieve the exception so an unawaited failed flight is not logged
+        flight.add_done_callback(lambda done: done.cancelled() or done.exception())
+        flight.add_done_callback(lambda done: self._flights.pop(key, None) if self._flights.get(key) is done else None)
+        return flight
+
+    async def join(self, key: Hashable) -> Tuple[Optional[asyncio.Future], Any]:
+        """
+        (flight, None) when the caller leads and has to settle the flight,
+        (None, result) when it followed a run that finished.
+        """
+        while True:
+            flight = self._flights.get(key)
+            if flight is None:
+                return self.lead(key), None
+            self.followers += 1
+            try:
+                # A follower giving up must not cancel the run the others wait for
+                return None, await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                if not flight.cancelled():
+                    raise
+                # Its leader went away; lead the next run or follow whoever does
+
+    def stats(self) -> Dict[str, Any]:
+        return {"in_flight": len(self._flights), "leaders": self.leaders, "followers": self.followers}
+
+
+class AgentLimiter:
+    def __init__(self, max_runs: int, max_runs_per_user: int, max_queued: int, queue_timeout: float):
+        self.max_runs = max_runs
+        self.max_runs_per_user = max_runs_per_user
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self._slots = asyncio.Semaphore(max_runs)
+        self._per_user: Dict[str, int] = {}
+        self.running = 0
+        self.queued = 0
+
+    def _reject(self, reason: str, detail: str, status_code: int, retry_after: int) -> AgentBusy:
+        AGENT_REJECTED.inc((reason,))
+        return AgentBusy(detail, status_code, retry_after)
+
+    @asynccontextmanager
+    async def slot(self, user_key: str) -> AsyncIterator[None]:
+        """Hold one of the worker's agent slots for the block, queueing for it if they are all taken"""
+        if self._per_user.get(user_key, 0) >= self.max_runs_per_user:
+            raise self._reject(
+                "user", f"You already have {self.max_runs_per_user} questions being answered, wait for them to finish",
+                429, 5
+            )
+        if self._slots.locked() and self.queued >= self.max_queued:
+            raise self._reject("queue_full", "The assistant is busy, try again shortly", 503, 10)
+
+        self._per_user[user_key] = self._per_user.get(user_key, 0) + 1
+        try:
+            self.queued += 1
+            started = time.perf_counter()
+            try:
+                # asyncio.timeout cancels acquire() itself, so a permit is never taken and then dropped
+                async with asyncio.timeout(self.queue_timeout):
+                    await self._slots.acquire()
+            except TimeoutError:
+                raise self._reject("queue_timeout", "The assistant is busy, try again shortly", 503, 10)
+            finally:
+                self.queued -= 1
+                AGENT_QUEUE_WAIT.observe(time.perf_counter() - started)
+
+            self.running += 1
+            try:
+                yield
+            finally:
+                self.running -= 1
+                self._slots.release()
+        finally:
+            self._per_user[user_key] -= 1
+            if not self._per_user[user_key]:
+                del self._per_user[user_key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "queued": self.queued,
+            "max_runs": self.max_runs,
+            "max_runs_per_user": self.max_runs_per_user,
+        }
+
+
+single_flight = SingleFlight()
+agent_limiter = AgentLimiter(
+    max_runs=settings.AGENT_MAX_CONCURRENT_RUNS,
+    max_runs_per_user=settings.AGENT_MAX_CONCURRENT_RUNS_PER_USER,
+    max_queued=settings.AGENT_MAX_QUEUED_RUNS,
+    queue_timeout=settings.AGENT_QUEUE_TIMEOUT_SECONDS
+)
+Gauge(
+    "agent_runs", "Agent runs holding a slot or queued for one",
+    lambda: {("running",): agent_limiter.running, ("queued",): agent_limiter.queued}, ("state",)
+)
+Gauge("agent_runs_in_flight", "Distinct agent runs that identical questions can join", lambda: {(): single_flight.stats()["in_flight"]})
@@ -0,0 +1,200 @@
+import math
+import re
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+from src.config.settings import settings
+from src.utils.metrics import register_cache
+from src.utils.response_cache import response_cache
+
+# Answers of the department agent to read-only questions, per worker.
+# Questions are normalized and embedded locally with the hashing trick
+# (words, word pairs and character trigrams, no model and no network), and a
+# new question is served the answer of the most similar cached one above
+# AGENT_ANSWER_CACHE_SIMILARITY that also names exactly the same codes,
+# names and negations, asked by a user of the same permission scope. Like
+# the tool cache, entries belong to the "departments" namespace of the
+# response cache and are dropped by every department write, in any worker.
+
+NAMESPACE = "departments"
+# Tools that only read; an answer is cached only if its run called nothing else
+READ_TOOLS = {"list_all_departments", "get_department_by_id"}
+
+_WRITE_WORDS = {"create", "add", "new", "make", "update", "change", "rename", "edit", "modify", "set",
+                "delete", "remove", "drop", "insert"}
+_STOPWORDS = {"a", "an", "the", "me", "my", "please", "can", "could", "would", "you", "i", "we", "us", "to",
+              "of", "for", "all", "every", "is", "are", "there", "do", "does", "what", "tell", "let",
+              "know", "in", "our", "current", "currently", "existing", "available"}
+_SYNONYMS = {"show": "list", "display": "list", "get": "list", "give": "list", "see": "list", "view": "list",
+             "fetch": "list", "which": "list", "dept": "department", "depts": "department"}
+# Words that may differ between two questions with the same answer; any other
+# word (a code, a name, a filter value) has to match exactly
+_VOCABULARY = {"list", "count", "department", "name", "code", "description", "detail", "info", "information",
+               "head", "hod", "creation", "date", "created", "id", "including", "include", "with", "whose", "its",
+               "their", "and", "or", "by", "sorted", "sort", "order", "alphabetical", "alphabetically", "how",
+               "total", "each", "exist", "here", "have", "has", "please", "now", "them", "ha"}
+_NEGATIONS = {"not", "no", "none", "without", "never", "nor", "except", "excluding", "missing", "empty", "unset",
+              "isn", "aren", "doesn", "don", "hasn", "haven", "t", "non"}
+_PHRASES = [(re.compile(r"\bhow many\b|\bnumber of\b|\bcount of\b"), " count ")]
+_DIMENSIONS = 1 << 18
+
+Vector = Dict[int, float]
+
+
+def normalize(query: str) -> List[str]:
+    """Lower-cased words without filler, with synonyms folded and plurals stemmed"""
+    text = query.lower()
+    for pattern, replacement in _PHRASES:
+        text = pattern.sub(replacement, text)
+    tokens = []
+    for word in re.findall(r"[a-z0-9_-]+", text):
+        word = _SYNONYMS.get(word, word)
+        if word in _STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss") and not any(c.isdigit() for c in word):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+def is_read_only(tokens: List[str]) -> bool:
+    return not _WRITE_WORDS.intersection(tokens)
+
+
+def _feature(name: str) -> int:
+    # crc32 rather than hash(): the same question must map the same way in every worker
+    return zlib.crc32(name.encode()) % _DIMENSIONS
+
+
+def embed(tokens: List[str]) -> Vector:
+    """L2-normalized sparse hashing vector of words, word pairs and character trigrams"""
+    vector: Vector = {}
+
+    def add(name: str, weight: float) -> None:
+        index = _feature(name)
+        vector[index] = vector.get(index, 0.0) + weight
+
+    for token in tokens:
+        add("w:" + token, 1.0)
+        padded = f"#{token}#"
+        for i in range(len(padded) - 2):
+            add("c:" + padded[i:i + 3], 0.2)
+    for first, second in zip(tokens, tokens[1:]):
+        add(f"b:{first} {second}", 0.5)
+    norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+    return {index: weight / norm for index, weight in vector.items()}
+
+
+def similarity(a: Vector, b: Vector) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(index, 0.0) for index, weight in a.items())
+
+
+def _identifiers(query: str, tokens: List[str]) -> FrozenSet[str]:
+    """
+    Words that must match exactly, however similar the rest is: ids and codes
+    with digits, words written in capitals (CSE, ECE), words outside the
+    vocabulary and negations.
+    """
+    capitals = {word.lower() for word in re.findall(r"\b[A-Z]{2,}\b", query)}
+    return frozenset(
+        token for token in tokens
+        if any(c.isdigit() for c in token) or token in capitals or token in _NEGATIONS or token not in _VOCABULARY
+    )
+
+
+class _Entry:
+    __slots__ = ("scope", "answer", "vector", "identifiers", "expires")
+
+    def __init__(self, scope: str, answer: str, vector: Vector, identifiers: FrozenSet[str], expires: float):
+        self.scope = scope
+        self.answer = answer
+        self.vector = vector
+        self.identifiers = identifiers
+        self.expires = expires
+
+
+class AnswerCache:
+    def __init__(self, max_entries: int, ttl: float, threshold: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.threshold = threshold
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def generation(self) -> int:
+        response_cache.sync(NAMESPACE)
+        return self._generation
+
+    def lookup(self, query: str, scope: str) -> Optional[Tuple[str, float]]:
+        """
+        (answer, similarity) of the closest cached read-only question, if close
+        enough; scope is the asker's permission scope, answers never cross scopes
+        """
+        response_cache.sync(NAMESPACE)
+        tokens = normalize(query)
+        if not tokens or not is_read_only(tokens):
+            return None
+        now = time.monotonic()
+        identifiers = _identifiers(query, tokens)
+        entry = self._entries.get(f"{scope}:{' '.join(tokens)}")
+        score = 1.0
+        if entry is None or entry.expires <= now or entry.identifiers != identifiers:
+            vector = embed(tokens)
+            entry, score = None, 0.0
+            for candidate in self._entries.values():
+                if candidate.expires <= now or candidate.scope != scope or candidate.identifiers != identifiers:
+                    continue
+                candidate_score = similarity(vector, candidate.vector)
+                if candidate_score > score:
+                    entry, score = candidate, candidate_score
+            if entry is None or score < self.threshold:
+                self.misses += 1
+                return None
+        self.hits += 1
+        return entry.answer, round(score, 3)
+
+    def store(self, query: str, answer: str, tools_used: List[str], generation: int, scope: str) -> bool:
+        """Cache the answer of a run that only read; generation is the one seen before the run started"""
+        tokens = normalize(query)
+        if (not tokens or not answer or not is_read_only(tokens) or not READ_TOOLS.issuperset(tools_used)
+                or generation != self.generation):
+            return False
+        key = f"{scope}:{' '.join(tokens)}"
+        self._entries.pop(key, None)
+        self._entries[key] = _Entry(scope, answer, embed(tokens), _identifiers(query, tokens), time.monotonic() + self.ttl)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return True
+
+    def invalidate(self, namespace: str) -> None:
+        if namespace != NAMESPACE:
+            return
+        self._generation += 1
+        self._entries.clear()
+        self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+
+answer_cache = AnswerCache(
+    max_entries=settings.AGENT_ANSWER_CACHE_MAX_ENTRIES,
+    ttl=settings.AGENT_ANSWER_CACHE_TTL_SECONDS,
+    threshold=settings.AGENT_ANSWER_CACHE_SIMILARITY
+)
+register_cache("agent_answers", answer_cache.stats)
+response_cache.on_invalidate(answer_cache.invalidate)
@@ -0,0 +1,114 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+from src.utils.metrics import CIRCUIT_CALLS, Gauge
+
+# Circuit breakers for slow or failing dependencies, per worker. After
+# failure_threshold consecutive failed or slow calls the breaker opens and
+# calls fail at once with CircuitOpen instead of piling up; reset_seconds
+# later one trial call is let through (half open) and its outcome closes or
+# reopens the breaker.
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpen(Exception):
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} is unavailable, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int, slow_call_seconds: float, reset_seconds: float, timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        # A call that succeeds slower than this still counts as a failure
+        self.slow_call_seconds = slow_call_seconds
+        self.reset_seconds = reset_seconds
+        # Per call; the call is cancelled and counts as failed when it runs out
+        self.timeout = timeout
+        self.failures = 0
+        self.opened = 0
+        self._opened_at = 0.0
+        self._open = False
+        self._trial = False
+        _breakers[name] = self
+
+    @property
+    def state(self) -> str:
+        if not self._open:
+            return CLOSED
+        return HALF_OPEN if time.monotonic() - self._opened_at >= self.reset_seconds else OPEN
+
+    def retry_after(self) -> float:
+        return max(0.0, self._opened_at + self.reset_seconds - time.monotonic()) if self._open else 0.0
+
+    def is_open(self) -> bool:
+        """True while calls are refused; a half-open breaker with its trial call running counts as open"""
+        state = self.state
+        return state == OPEN or (state == HALF_OPEN and self._trial)
+
+    def _record(self, outcome: str) -> None:
+        CIRCUIT_CALLS.inc((self.name, outcome))
+        if outcome == "ok":
+            self.failures = 0
+            self._open = False
+            return
+        self.failures += 1
+        if self._open or self.failures >= self.failure_threshold:
+            # A failed trial reopens for another full reset period
+            if not self._open:
+                self.opened += 1
+            self._open = True
+            self._opened_at = time.monotonic()
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        if self.is_open():
+            CIRCUIT_CALLS.inc((self.name, "rejected"))
+            raise CircuitOpen(self.name, self.retry_after())
+        trial = self._open
+        if trial:
+            self._trial = True
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(fn(), self.timeout)
+        except asyncio.TimeoutError:
+            self._record("timeout")
+            raise
+        except asyncio.CancelledError:
+            # The caller went away; that says nothing about the dependency
+            raise
+        except Exception:
+            self._record("error")
+            raise
+        finally:
+            if trial:
+                self._trial = False
+        self._record("slow" if time.monotonic() - started > self.slow_call_seconds else "ok")
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "times_opened": self.opened,
+            "retry_after": round(self.retry_after(), 1),
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def breaker_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: breaker.stats() for name, breaker in _breakers.items()}
+
+
+Gauge(
+    "circuit_breaker_state", "Circuit breaker state: 0 closed, 1 half open, 2 open",
+    lambda: {(name,): _STATE_VALUES[breaker.state] for name, breaker in _breakers.items()}, ("breaker",)
+)
@@ -0,0 +1,161 @@
+from typing import Any, Dict, List, Optional, Set, Tuple, Type, Union, get_args, get_origin
+from fastapi import HTTPException, Response, status
+from prisma import Prisma, bases
+from pydantic import BaseModel, create_model
+from src.utils.serialization import json_response
+
+
+class FieldSet(BaseModel):
+    fields: List[str] = []
+    include: List[str] = []
+
+    @property
+    def is_sparse(self) -> bool:
+        return bool(self.fields or self.include)
+
+
+class _Node:
+    """One level of a requested selection: scalar columns plus nested relations"""
+
+    def __init__(self):
+        self.fields: Set[str] = set()
+        self.relations: Dict[str, "_Node"] = {}
+
+    def key(self) -> tuple:
+        return (
+            tuple(sorted(self.fields)),
+            tuple((name, child.key()) for name, child in sorted(self.relations.items()))
+        )
+
+
+# Columns no response may contain; they are never selected, not even when a
+# relation is included whole, and asking for one is a 400
+PRIVATE_FIELDS: Dict[str, Set[str]] = {"User": {"password"}}
+
+# Partial models are expensive to create, so each distinct selection is built once
+_partials: Dict[Tuple[str, tuple], Type[BaseModel]] = {}
+
+
+def _relation_target(annotation: Any) -> Tuple[Optional[type], bool]:
+    """Return the related Prisma model of a field and whether it is a list relation"""
+    for arg in get_args(annotation) or (annotation,):
+        is_list = get_origin(arg) in (list, List)
+        if is_list:
+            arg = get_args(arg)[0]
+        if hasattr(arg, "__prisma_model__"):
+            return arg, is_list
+    return None, False
+
+
+def _scalar_fields(model_cls: Type[BaseModel]) -> List[str]:
+    """The public scalar columns of a model"""
+    private = PRIVATE_FIELDS.get(model_cls.__prisma_model__, set())
+    return [
+        name for name, info in model_cls.model_fields.items()
+        if _relation_target(info.annotation)[0] is None and name not in private
+    ]
+
+
+def _parse(fieldset: FieldSet, relations: Set[str]) -> _Node:
+    root = _Node()
+
+    def walk(path: List[str]) -> _Node:
+        if path and ".".join(path) not in relations:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown relation '{'.'.join(path)}'. Allowed: {', '.join(sorted(relations)) or 'none'}"
+            )
+        node = root
+        for part in path:
+            node = node.relations.setdefault(part, _Node())
+        return node
+
+    for path in fieldset.include:
+        walk(path.split("."))
+    for path in fieldset.fields:
+        *relation_path, name = path.split(".")
+        walk(relation_path).fields.add(name)
+    return root
+
+
+def _materialize(model_cls: Type[BaseModel], node: _Node) -> Tuple[Type[BaseModel], Optional[Dict[str, Any]]]:
+    model_name = model_cls.__prisma_model__
+    scalars = _scalar_fields(model_cls)
+    private = node.fields & PRIVATE_FIELDS.get(model_name, set())
+    if private:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{model_name} field(s) not available: {', '.join(sorted(private))}"
+        )
+    unknown = node.fields - set(scalars)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown {model_name} field(s): {', '.join(sorted(unknown))}"
+        )
+
+    # id is always selected, cursor pagination depends on it
+    selected = [name for name in scalars if not node.fields or name in node.fields or name == "id"]
+    definitions: Dict[str, Any] = {
+        name: (model_cls.model_fields[name].annotation, model_cls.model_fields[name])
+        for name in selected
+    }
+
+    include: Dict[str, Any] = {}
+    for name, child in node.relations.items():
+        target, is_list = _relation_target(model_cls.model_fields[name].annotation)
+        child_model, child_include = _materialize(target, child)
+        annotation = List[child_model] if is_list else child_model
+        definitions[name] = (Optional[annotation], None)
+        include[name] = {"include": child_include} if child_include else True
+
+    cache_key = (model_name, node.key())
+    if cache_key not in _partials:
+        _partials[cache_key] = create_model(
+            f"{model_name}Partial",
+            __base__=getattr(bases, f"Base{model_name}"),
+            **definitions
+        )
+    return _partials[cache_key], include or None
+
+
+def select_fields(
+    fieldset: Optional[FieldSet],
+    model_cls: Type[BaseModel],
+    relations: Set[str],
+    default_include: Optional[Dict[str, Any]] = None
+) -> Tuple[Optional[Type[BaseModel]], Optional[Dict[str, Any]]]:
+    """
+    Compile ?fields= and ?include= into a partial model and a Prisma include.
+    The partial model drives the columns Prisma selects, so unrequested
+    columns and relations are never fetched. Returns (None, default_include)
+    when nothing sparse was asked for.
+    """
+    if not fieldset or not fieldset.is_sparse:
+        return None, default_include
+    return _materialize(model_cls, _parse(fieldset, relations))
+
+
+def delegate_for(db: Prisma, model: str, partial: Optional[Type[BaseModel]] = None):
+    """Model actions of the client, bound to the partial model when one is given"""
+    delegate = getattr(db, model.lower())
+    if partial is None:
+        return delegate
+    return type(delegate)(db, partial)
+
+
+def fieldset_response(
+    response: Response,
+    fieldset: Optional[FieldSet],
+    data: Any,
+    response_model: Any = None
+) -> Union[Any, Response]:
+    """
+    Sparse results bypass response_model, which would reject the missing columns;
+    their partial models only hold public columns (see PRIVATE_FIELDS). Passing the route's response_model encodes full results on the fast path too.
+    """
+    if fieldset and fieldset.is_sparse:
+        return json_response(response, data)
+    if response_model is not None:
+        return json_response(response, data, response_model)
+    return data
@@ -0,0 +1,169 @@
+import asyncio
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Set, Tuple
+from fastapi import Request
+from prisma import Prisma
+from src.config.database import reader_for
+
+
+class Loader:
+    """
+    Coalesces lookups of one model by one unique column.
+    Every load() issued in the same event-loop tick is answered by a single
+    find_many(where={by: {"in": [...]}}); results are memoized for the
+    lifetime of the loader, which is one request.
+    """
+
+    def __init__(self, db: Prisma, model: str, by: str = "id", include: Optional[Dict[str, Any]] = None):
+        self.db = db
+        self.model = model
+        self.by = by
+        self.include = include
+        self._results: Dict[Hashable, asyncio.Future] = {}
+        self._queue: List[Hashable] = []
+        # Running fetches; the event loop only keeps weak references to tasks
+        self._tasks: Set[asyncio.Task] = set()
+
+    def load(self, key: Hashable) -> "asyncio.Future[Optional[Any]]":
+        future = self._results.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._results[key] = loop.create_future()
+            if not self._queue:
+                # Let the other coroutines of this tick queue their keys first
+                loop.call_soon(self._dispatch)
+            self._queue.append(key)
+        return future
+
+    async def load_many(self, keys: List[Hashable]) -> List[Optional[Any]]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: Hashable, row: Any) -> None:
+        """Remember a row the caller already has, e.g. one it just wrote"""
+        future = self._results.get(key)
+        if future is not None and not future.done():
+            # Loads already waiting on the pending fetch get the row now; the fetch leaves it alone
+            future.set_result(row)
+            return
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(row)
+        self._results[key] = future
+
+    def forget(self, key: Hashable) -> None:
+        future = self._results.get(key)
+        if future is not None and future.done():
+            del self._results[key]
+
+    def evict(self, column: str, value: Any) -> None:
+        """Forget every loaded row whose column equals value, whatever key it was loaded by"""
+        for key, future in list(self._results.items()):
+            if (future.done() and not future.cancelled() and future.exception() is None
+                    and getattr(future.result(), column, None) == value):
+                del self._results[key]
+
+    def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        task = asyncio.ensure_future(self._fetch(keys))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, keys: List[Hashable]) -> None:
+        try:
+            rows = await getattr(reader_for(self.db), self.model.lower()).find_many(
+                where={self.by: {"in": keys}},
+                include=self.include
+            )
+        except Exception as e:
+            for key in keys:
+                # Drop failed lookups so a later load() can retry them
+                future = self._results.get(key)
+                if future is not None and not future.done():
+                    del self._results[key]
+                    future.set_exception(e)
+            return
+        found = {getattr(row, self.by): row for row in rows}
+        for key in keys:
+            future = self._results.get(key)
+            if future is not None and not future.done():
+                future.set_result(found.get(key))
+
+
+_LoaderKey = Tuple[int, str, str, str]
+
+# Set per request by the request_loaders middleware
+_loaders: ContextVar[Optional[Dict[_LoaderKey, Loader]]] = ContextVar("loaders", default=None)
+
+
+@contextmanager
+def loader_scope() -> Iterator[None]:
+    """Share and memoize loaders for everything that runs inside the block"""
+    token = _loaders.set({})
+    try:
+        yield
+    finally:
+        _loaders.reset(token)
+
+
+async def request_loaders(request: Request, call_next):
+    """One set of loaders per request"""
+    with loader_scope():
+        return await call_next(request)
+
+
+def loader(db: Prisma, model: str, by: str = "id", include: Optional[Dict[str, Any]] = None) -> Loader:
+    """
+    The request's loader for model looked up by the unique column by.
+    Outside a request scope (agent tools, scripts) a fresh loader is
+    returned, which still batches but does not memoize across calls.
+    """
+    loaders = _loaders.get()
+    if loaders is None:
+        return Loader(db, model, by, include)
+    key = (id(db), model, by, json.dumps(include, sort_keys=True))
+    if key not in loaders:
+        loaders[key] = Loader(db, model, by, include)
+    return loaders[key]
+
+
+def _model_loaders(model: str) -> List[Loader]:
+    loaders = _loaders.get() or {}
+    return [found for (_, name, _, _), found in loaders.items() if name == model]
+
+
+def prime_row(
+    db: Prisma,
+    model: str,
+    row: Any,
+    by: Tuple[str, ...] = ("id",),
+    include: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    After a create or update: drop the request's memoized copies of the row,
+    including those loaded with relations or under a key it no longer has,
+    and remember the written row under each unique column in by, in the
+    loaders for the relations it was written with.
+    """
+    for found in _model_loaders(model):
+        found.evict("id", row.id)
+    if _loaders.get() is None:
+        return
+    for column in by:
+        loader(db, model, column, include).prime(getattr(row, column), row)
+
+
+def forget_row(model: str, value: Any, column: str = "id") -> None:
+    """After a delete: drop the request's memoized rows of model whose column equals value"""
+    for found in _model_loaders(model):
+        found.evict(column, value)
+
+
+async def load(
+    db: Prisma,
+    model: str,
+    key: Hashable,
+    by: str = "id",
+    include: Optional[Dict[str, Any]] = None
+) -> Optional[Any]:
+    return await loader(db, model, by, include).load(key)
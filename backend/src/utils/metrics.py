@@ -0,0 +1,325 @@
+import asyncio
+import glob
+import json
+import os
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+from src.config.settings import settings
+
+# Everything here is updated from the event loop thread only, so plain ints
+# and floats are enough and the hot path takes no locks.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+Labels = Tuple[str, ...]
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        _registry.append(self)
+
+    def samples(self) -> Dict[Labels, Any]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> Dict[Labels, Any]:
+        return dict(self._values)
+
+
+class Gauge(_Metric):
+    """Read at collection time from a callback returning {labels: value}"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, collect: Callable[[], Dict[Labels, float]], labelnames: Iterable[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._collect = collect
+
+    def samples(self) -> Dict[Labels, Any]:
+        try:
+            return self._collect()
+        except Exception:
+            return {}
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: Tuple[float, ...], labelnames: Iterable[str] = ()):
+        super().__init__(name, help, labelnames)
+        self.buckets = buckets
+        # labels -> [count per bucket..., count above the last bucket, sum]
+        self._series: Dict[Labels, List[float]] = {}
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def samples(self) -> Dict[Labels, Any]:
+        return {labels: list(series) for labels, series in self._series.items()}
+
+
+_registry: List[_Metric] = []
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route and status code", ("method", "route", "status")
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", LATENCY_BUCKETS, ("method", "route")
+)
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds", "Prisma query latency by model and action", DB_BUCKETS, ("model", "action")
+)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds", "How late the event loop woke up a periodic timer", LAG_BUCKETS
+)
+AGENT_QUERIES = Counter(
+    "agent_queries_total", "Agent queries by what answered them: router, cache or model", ("route",)
+)
+AGENT_QUEUE_WAIT = Histogram(
+    "agent_queue_wait_seconds", "Time agent runs waited for a free slot", LATENCY_BUCKETS
+)
+AGENT_REJECTED = Counter(
+    "agent_rejected_total", "Agent runs turned away: user over their cap, queue full or queue timeout", ("reason",)
+)
+CIRCUIT_CALLS = Counter(
+    "circuit_breaker_calls_total", "Calls through circuit breakers by outcome: ok, slow, error, timeout, rejected",
+    ("breaker", "outcome")
+)
+
+_caches: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+def register_cache(name: str, stats: Callable[[], Dict[str, Any]]) -> None:
+    """Export a cache whose stats() returns hits, misses and optionally entries and bytes"""
+    _caches[name] = stats
+
+
+def _cache_samples(key: str) -> Dict[Labels, float]:
+    samples = {}
+    for name, stats in _caches.items():
+        value = stats().get(key)
+        if value is not None:
+            samples[(name,)] = value
+    return samples
+
+
+class _CacheCounter(Counter):
+    """Counter whose value is owned by the cache object itself"""
+
+    def __init__(self, name: str, help: str, key: str):
+        super().__init__(name, help, ("cache",))
+        self._key = key
+
+    def samples(self) -> Dict[Labels, Any]:
+        return _cache_samples(self._key)
+
+
+_CacheCounter("cache_hits_total", "Cache hits; hit ratio is hits / (hits + misses)", "hits")
+_CacheCounter("cache_misses_total", "Cache misses", "misses")
+Gauge("cache_entries", "Entries currently cached", lambda: _cache_samples("entries"), ("cache",))
+Gauge("cache_bytes", "Bytes currently cached", lambda: _cache_samples("bytes"), ("cache",))
+
+
+def _executor_queue_depth() -> Dict[Labels, float]:
+    samples: Dict[Labels, float] = {}
+    try:
+        from anyio.to_thread import current_default_thread_limiter
+        statistics = current_default_thread_limiter().statistics()
+        samples[("anyio",)] = statistics.tasks_waiting
+    except Exception:
+        pass
+    executor = getattr(asyncio.get_running_loop(), "_default_executor", None)
+    if executor is not None:
+        samples[("default",)] = executor._work_queue.qsize()
+    return samples
+
+
+def _executor_busy() -> Dict[Labels, float]:
+    from anyio.to_thread import current_default_thread_limiter
+    return {("anyio",): current_default_thread_limiter().borrowed_tokens}
+
+
+Gauge("executor_queue_depth", "Calls waiting for a worker thread", _executor_queue_depth, ("executor",))
+Gauge("executor_threads_busy", "Worker threads currently running sync code", _executor_busy, ("executor",))
+
+
+# ---------------------------------------------------------------------------
+# Multi-worker aggregation
+# ---------------------------------------------------------------------------
+# Each uvicorn worker keeps its own metrics. With METRICS_DIR set (run.py does
+# this in production) workers periodically write a snapshot there, and the
+# worker that answers /metrics merges its live values with the other files.
+# Counters and histograms of exited workers are kept so totals never go back;
+# gauges only count live workers.
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    return {
+        metric.name: {json.dumps(labels): value for labels, value in metric.samples().items()}
+        for metric in _registry
+    }
+
+
+def _snapshot_path(pid: int) -> str:
+    return os.path.join(settings.METRICS_DIR, f"{pid}.json")
+
+
+def write_snapshot() -> None:
+    if not settings.METRICS_DIR:
+        return
+    path = _snapshot_path(os.getpid())
+    with open(path + ".tmp", "w") as f:
+        json.dump(snapshot(), f)
+    os.replace(path + ".tmp", path)
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _other_workers() -> List[Tuple[bool, Dict[str, Dict[str, Any]]]]:
+    if not settings.METRICS_DIR:
+        return []
+    snapshots = []
+    for path in glob.glob(os.path.join(settings.METRICS_DIR, "*.json")):
+        pid = int(os.path.basename(path).split(".")[0])
+        if pid == os.getpid():
+            continue
+        try:
+            with open(path) as f:
+                snapshots.append((_alive(pid), json.load(f)))
+        except (OSError, ValueError):
+            continue
+    return snapshots
+
+
+def _merge(into: Dict[str, Any], values: Dict[str, Any]) -> None:
+    for labels, value in values.items():
+        current = into.get(labels)
+        if current is None:
+            into[labels] = list(value) if isinstance(value, list) else value
+        elif isinstance(value, list):
+            into[labels] = [a + b for a, b in zip(current, value)]
+        else:
+            into[labels] = current + value
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_str(names: Tuple[str, ...], values: List[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render() -> str:
+    """All metrics of all workers in the Prometheus text exposition format"""
+    others = _other_workers()
+    local = snapshot()
+    lines: List[str] = []
+    for metric in _registry:
+        merged: Dict[str, Any] = {}
+        _merge(merged, local.get(metric.name, {}))
+        for alive, other in others:
+            if metric.kind == "gauge" and not alive:
+                continue
+            _merge(merged, other.get(metric.name, {}))
+
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for key, value in sorted(merged.items()):
+            labels = json.loads(key)
+            if metric.kind != "histogram":
+                lines.append(f"{metric.name}{_label_str(metric.labelnames, labels)} {_format(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(metric.buckets, value):
+                cumulative += count
+                le = _label_str(metric.labelnames, labels, f'le="{bound}"')
+                lines.append(f"{metric.name}_bucket{le} {_format(cumulative)}")
+            cumulative += value[-2]
+            le = _label_str(metric.labelnames, labels, 'le="+Inf"')
+            lines.append(f"{metric.name}_bucket{le} {_format(cumulative)}")
+            lines.append(f"{metric.name}_sum{_label_str(metric.labelnames, labels)} {_format(value[-1])}")
+            lines.append(f"{metric.name}_count{_label_str(metric.labelnames, labels)} {_format(cumulative)}")
+    return "\n".join(lines) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# Background tasks
+# ---------------------------------------------------------------------------
+
+_tasks: List[asyncio.Task] = []
+
+
+async def _watch_loop_lag(interval: float = 0.5) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, loop.time() - expected))
+
+
+async def _flush_snapshots() -> None:
+    while True:
+        await asyncio.sleep(settings.METRICS_FLUSH_SECONDS)
+        try:
+            write_snapshot()
+        except OSError as e:
+            print(f"⚠️ Could not write metrics snapshot: {e}")
+
+
+def start() -> None:
+    _tasks.append(asyncio.create_task(_watch_loop_lag()))
+    if settings.METRICS_DIR:
+        os.makedirs(settings.METRICS_DIR, exist_ok=True)
+        _tasks.append(asyncio.create_task(_flush_snapshots()))
+
+
+async def stop() -> None:
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
+    try:
+        write_snapshot()
+    except OSError:
+        pass
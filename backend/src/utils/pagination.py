@@ -0,0 +1,93 @@
+from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
+from fastapi import Response
+from prisma import Prisma
+from pydantic import BaseModel, Field
+from src.utils.fieldsets import delegate_for
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+class PageParams(BaseModel):
+    limit: int = Field(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    cursor: Optional[str] = None
+    skip: int = Field(0, ge=0)
+    with_total: bool = False
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+
+async def estimate_total(db: Prisma, model: str, where: Optional[Dict[str, Any]] = None) -> int:
+    """Planner estimate for unfiltered tables, exact count otherwise"""
+    delegate = getattr(db, model.lower())
+    if not where:
+        row = await db.query_first(
+            "SELECT reltuples::bigint AS estimate FROM pg_class WHERE oid = to_regclass($1)",
+            f'"{model}"'
+        )
+        # reltuples is -1 until the table has been analyzed at least once
+        if row and row["estimate"] is not None and row["estimate"] >= 0:
+            return int(row["estimate"])
+    return await delegate.count(where=where)
+
+
+async def paginate(
+    db: Prisma,
+    model: str,
+    page: Optional[PageParams] = None,
+    *,
+    where: Optional[Dict[str, Any]] = None,
+    include: Optional[Dict[str, Any]] = None,
+    order: Optional[List[Dict[str, str]]] = None,
+    partial: Optional[Type[BaseModel]] = None
+) -> Page:
+    """
+    Keyset pagination pushed down to Prisma.
+    Fetches one row past the limit to know whether another page exists and
+    always orders by id last so the cursor position is stable.
+    A partial model from select_fields narrows the selected columns.
+    """
+    page = page or PageParams()
+    delegate = delegate_for(db, model, partial)
+
+    query: Dict[str, Any] = {
+        "take": page.limit + 1,
+        "skip": page.skip,
+        "order": list(order or []) + [{"id": "asc"}],
+    }
+    if where:
+        query["where"] = where
+    if include:
+        query["include"] = include
+    if page.cursor:
+        # Skip the cursor row itself, it was the last item of the previous page
+        query["cursor"] = {"id": page.cursor}
+        query["skip"] = page.skip + 1
+
+    rows = await delegate.find_many(**query)
+
+    next_cursor = None
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        next_cursor = rows[-1].id
+
+    total = await estimate_total(db, model, where) if page.with_total else None
+    return Page(items=rows, next_cursor=next_cursor, total=total)
+
+
+def with_page_headers(response: Response, page: Page) -> List[Any]:
+    """Expose the cursor and total as headers and return the bare item list"""
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    if page.total is not None:
+        response.headers[TOTAL_COUNT_HEADER] = str(page.total)
+    return page.items
@@ -0,0 +1,185 @@
+import asyncio
+import glob
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+from src.config.settings import settings
+
+# Normalized shapes of the Prisma queries this worker ran, for the index
+# advisor (python -m benchmarks.index_advisor). A shape is the model, the
+# action, the filtered columns with their kind of comparison and the sort
+# order; values are dropped except for one sample per shape to EXPLAIN.
+# Capture is off unless QUERY_SHAPES_DIR is set.
+
+Column = Tuple[str, str]
+
+_RELATION_FILTERS = {"is", "is_not", "some", "every", "none"}
+_RANGE_FILTERS = {"gt", "gte", "lt", "lte"}
+_TEXT_FILTERS = {"contains", "startswith", "endswith"}
+
+
+def _filter_kind(value: Any) -> str:
+    if not isinstance(value, dict):
+        return "eq"
+    ops = set(value) - {"mode"}
+    if ops & _RELATION_FILTERS:
+        return "relation"
+    if "equals" in ops:
+        return "eq"
+    if "in" in ops:
+        return "in"
+    if ops & _RANGE_FILTERS:
+        return "range"
+    if ops & _TEXT_FILTERS:
+        return "text"
+    return "other"
+
+
+def where_columns(where: Optional[Dict[str, Any]]) -> List[Column]:
+    """(column, kind) pairs of a Prisma where, e.g. [("courseId", "eq"), ("markedAt", "range")]"""
+    columns: List[Column] = []
+    for key, value in (where or {}).items():
+        if key == "AND":
+            for part in value if isinstance(value, list) else [value]:
+                columns.extend(where_columns(part))
+        elif key in ("OR", "NOT"):
+            # Alternatives and negations cannot lead an index
+            for part in value if isinstance(value, list) else [value]:
+                columns.extend((column, "or") for column, _ in where_columns(part))
+        else:
+            columns.append((key, _filter_kind(value)))
+    return sorted(set(columns))
+
+
+def order_columns(order: Any) -> List[Column]:
+    if not order:
+        return []
+    columns = []
+    for part in order if isinstance(order, list) else [order]:
+        for key, direction in part.items():
+            columns.append((key, direction if isinstance(direction, str) else "asc"))
+    return columns
+
+
+def shape_key(model: str, method: str, where: List[Column], order: List[Column], paged: bool) -> str:
+    key = f"{model}.{method}"
+    if where:
+        key += " where(" + ", ".join(f"{column} {kind}" for column, kind in where) + ")"
+    if order:
+        key += " order(" + ", ".join(f"{column} {direction}" for column, direction in order) + ")"
+    if paged:
+        key += " take"
+    return key
+
+
+class Shape:
+    __slots__ = ("model", "method", "where", "order", "paged", "count", "total_ms", "sample")
+
+    def __init__(self, model: str, method: str, where: List[Column], order: List[Column], paged: bool, sample: Dict):
+        self.model = model
+        self.method = method
+        self.where = where
+        self.order = order
+        self.paged = paged
+        self.count = 0
+        self.total_ms = 0.0
+        self.sample = sample
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "method": self.method,
+            "where": self.where,
+            "order": self.order,
+            "paged": self.paged,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "sample": self.sample,
+        }
+
+
+_shapes: Dict[str, Shape] = {}
+
+
+def enabled() -> bool:
+    return bool(settings.QUERY_SHAPES_DIR)
+
+
+def record(model: str, method: str, arguments: Optional[Dict[str, Any]], elapsed_ms: float) -> None:
+    """Count one query; called by InstrumentedPrisma for every model action with a filter or order"""
+    arguments = arguments or {}
+    where = where_columns(arguments.get("where"))
+    order = order_columns(arguments.get("order_by"))
+    if not where and not order:
+        return
+    paged = arguments.get("take") is not None
+    key = shape_key(model, method, where, order, paged)
+    shape = _shapes.get(key)
+    if shape is None:
+        sample = {
+            "where": arguments.get("where"),
+            "order_by": arguments.get("order_by"),
+            "take": arguments.get("take"),
+        }
+        # Values may be datetimes or enums; the sample only has to survive a round trip as text
+        sample = json.loads(json.dumps(sample, default=str))
+        shape = _shapes[key] = Shape(model, method, where, order, paged, sample)
+    shape.count += 1
+    shape.total_ms += elapsed_ms
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    return {key: shape.to_dict() for key, shape in _shapes.items()}
+
+
+def write_snapshot() -> None:
+    if not enabled() or not _shapes:
+        return
+    path = os.path.join(settings.QUERY_SHAPES_DIR, f"shapes-{os.getpid()}.json")
+    with open(path + ".tmp", "w") as f:
+        json.dump(snapshot(), f)
+    os.replace(path + ".tmp", path)
+
+
+def load_snapshots(directory: str) -> Dict[str, Dict[str, Any]]:
+    """Shapes of every worker that wrote to directory, with counts and times added up"""
+    merged: Dict[str, Dict[str, Any]] = {}
+    for path in glob.glob(os.path.join(directory, "shapes-*.json")):
+        with open(path) as f:
+            for key, shape in json.load(f).items():
+                if key in merged:
+                    merged[key]["count"] += shape["count"]
+                    merged[key]["total_ms"] += shape["total_ms"]
+                else:
+                    merged[key] = shape
+    return merged
+
+
+_tasks: List[asyncio.Task] = []
+
+
+async def _flush() -> None:
+    while True:
+        await asyncio.sleep(settings.METRICS_FLUSH_SECONDS)
+        try:
+            write_snapshot()
+        except OSError as e:
+            print(f"⚠️ Could not write query shapes: {e}")
+
+
+def start() -> None:
+    if enabled():
+        os.makedirs(settings.QUERY_SHAPES_DIR, exist_ok=True)
+        _tasks.append(asyncio.create_task(_flush()))
+        print(f"📐 Recording query shapes in {settings.QUERY_SHAPES_DIR}")
+
+
+async def stop() -> None:
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
+    try:
+        write_snapshot()
+    except OSError:
+        pass
@@ -0,0 +1,111 @@
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+from prisma import Prisma
+from src.utils import query_shapes
+from src.utils.metrics import DB_QUERY_LATENCY
+
+
+class QueryStats:
+    """Queries, rows and database time accumulated by one request"""
+
+    __slots__ = ("queries", "rows", "db_ms")
+
+    def __init__(self):
+        self.queries = 0
+        self.rows = 0
+        self.db_ms = 0.0
+
+    def server_timing(self) -> str:
+        return f'db;desc="{self.queries} queries, {self.rows} rows";dur={self.db_ms:.2f}'
+
+
+current_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Count every Prisma query run inside the block, including concurrent ones it awaits"""
+    stats = QueryStats()
+    token = current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_stats.reset(token)
+
+
+def _row_count(response: Any) -> int:
+    result = response.get("data", {}).get("result") if isinstance(response, dict) else None
+    if result is None:
+        return 0
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, int):
+        return result
+    if isinstance(result, dict):
+        # query_raw returns columns/types/rows, *_many writes return a count
+        if isinstance(result.get("rows"), list):
+            return len(result["rows"])
+        if isinstance(result.get("count"), int):
+            return result["count"]
+        return 1
+    return 0
+
+
+class InstrumentedPrisma(Prisma):
+    """
+    Prisma client that records every query in the current request's
+    QueryStats, in the db_query_duration_seconds histogram and, when
+    QUERY_SHAPES_DIR is set, in the query shape log. Every model
+    action and raw query goes through _execute; transactions are copies of
+    the client and are counted too.
+    """
+
+    async def _execute(self, **kwargs: Any) -> Any:
+        stats = current_stats.get()
+        started = time.perf_counter()
+        try:
+            response = await super()._execute(**kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            model = getattr(kwargs.get("model"), "__prisma_model__", "raw")
+            DB_QUERY_LATENCY.observe(elapsed, (model, kwargs.get("method", "")))
+            if model != "raw" and query_shapes.enabled():
+                query_shapes.record(model, kwargs.get("method", ""), kwargs.get("arguments"), elapsed * 1000)
+            if stats is not None:
+                stats.queries += 1
+                stats.db_ms += elapsed * 1000
+        if stats is not None:
+            stats.rows += _row_count(response)
+        return response
+
+
+_SERVER_TIMING_DB = re.compile(r'db;desc="(\d+) queries, (\d+) rows";dur=([\d.]+)')
+
+
+def parse_server_timing(header: str) -> QueryStats:
+    """Read the db metric back from a Server-Timing header"""
+    match = _SERVER_TIMING_DB.search(header or "")
+    if not match:
+        raise AssertionError(f"No db metric in Server-Timing header: {header!r}")
+    stats = QueryStats()
+    stats.queries, stats.rows, stats.db_ms = int(match[1]), int(match[2]), float(match[3])
+    return stats
+
+
+def assert_max_queries(response: Any, max_queries: int) -> QueryStats:
+    """
+    Test helper: fail when an endpoint ran more than max_queries queries.
+    Works on any response object with headers, e.g. from TestClient:
+
+        response = client.get("/api/schedules/subjects-details")
+        assert_max_queries(response, 3)
+    """
+    stats = parse_server_timing(response.headers.get("server-timing"))
+    assert stats.queries <= max_queries, (
+        f"{stats.queries} queries ({stats.rows} rows, {stats.db_ms:.1f} ms), "
+        f"expected at most {max_queries}"
+    )
+    return stats
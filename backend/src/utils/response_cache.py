@@ -0,0 +1,218 @@
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from fastapi import Request, Response
+from src.config.settings import settings
+from src.utils.fieldsets import FieldSet
+from src.utils.metrics import register_cache
+from src.utils.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
+from src.utils.serialization import dumps
+
+# Headers set by the route that belong to the cached representation
+_KEPT_HEADERS = (NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER)
+
+
+class _Entry:
+    __slots__ = ("body", "etag", "headers", "namespace", "expires")
+
+    def __init__(self, body: bytes, etag: str, headers: Dict[str, str], namespace: str, expires: float):
+        self.body = body
+        self.etag = etag
+        self.headers = headers
+        self.namespace = namespace
+        self.expires = expires
+
+
+class ResponseCache:
+    """
+    In-process LRU of serialized GET responses for reference data.
+    Entries are grouped by namespace and dropped as a whole when a service
+    write touching that namespace runs. With CACHE_SYNC_DIR set every
+    invalidation also appends a byte to the namespace's file there, and each
+    worker drops its own entries when it sees the file grow on its next
+    lookup; without it the TTL bounds staleness across workers.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        # Size of each namespace's shared file when this worker last caught up with it
+        self._seen: Dict[str, int] = {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+        # Other caches of the same data, told about every invalidation
+        self._listeners: List[Callable[[str], None]] = []
+
+    def on_invalidate(self, listener: Callable[[str], None]) -> None:
+        self._listeners.append(listener)
+
+    def generation(self, namespace: str) -> int:
+        self.sync(namespace)
+        return self._generations.get(namespace, 0)
+
+    def _shared_path(self, namespace: str) -> str:
+        return os.path.join(settings.CACHE_SYNC_DIR, f"{namespace}.invalidations")
+
+    def sync(self, namespace: str) -> None:
+        """Apply the invalidations other workers made to namespace since the last look"""
+        if not settings.CACHE_SYNC_DIR:
+            return
+        try:
+            size = os.stat(self._shared_path(namespace)).st_size
+        except FileNotFoundError:
+            size = 0
+        if size != self._seen.get(namespace, 0):
+            self._seen[namespace] = size
+            self._invalidate_local(namespace)
+
+    def get(self, key: str) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self.sync(entry.namespace)
+        if key not in self._entries:
+            return None
+        if entry.expires <= time.monotonic():
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, entry: _Entry, generation: int) -> None:
+        # A write that ran while this response was built makes it stale already
+        if generation != self.generation(entry.namespace) or len(entry.body) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = entry
+        self.size += len(entry.body)
+        while self.size > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+
+    def invalidate(self, *namespaces: str) -> None:
+        for namespace in namespaces:
+            self._invalidate_local(namespace)
+            if settings.CACHE_SYNC_DIR:
+                # O_APPEND writes never overwrite each other, so every worker's bump counts. This
+                # worker drops its entries once more when it sees its own byte, never missing a
+                # bump another worker made just before
+                fd = os.open(self._shared_path(namespace), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    os.write(fd, b".")
+                finally:
+                    os.close(fd)
+
+    def _invalidate_local(self, namespace: str) -> None:
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+        for key in [k for k, e in self._entries.items() if e.namespace == namespace]:
+            self._drop(key)
+        self.invalidations += 1
+        for listener in self._listeners:
+            listener(namespace)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self.size -= len(entry.body)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+
+response_cache = ResponseCache(
+    max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS
+)
+register_cache("response", response_cache.stats)
+
+
+def invalidates(*namespaces: str):
+    """Drop the cached responses of the given namespaces once the decorated write succeeds"""
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            result = await func(*args, **kwargs)
+            response_cache.invalidate(*namespaces)
+            return result
+        return wrapper
+    return decorator
+
+
+def _cache_key(request: Request) -> str:
+    query = sorted(request.query_params.multi_items())
+    return f"{request.url.path}?{query}"
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so a W/ prefix still matches
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in candidates
+
+
+def _respond(request: Request, entry: _Entry, status: str) -> Response:
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache", "X-Cache": status, **entry.headers}
+    if _matches(request, entry.etag):
+        response_cache.not_modified += 1
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+async def cached_response(
+    request: Request,
+    response: Response,
+    namespace: str,
+    response_model: Any,
+    build: Callable[[], Awaitable[Any]],
+    fieldset: Optional[FieldSet] = None
+) -> Response:
+    """
+    Serve a GET route from the response cache.
+    On a miss build() runs the route's normal query; its result is serialized
+    with response_model and stored together with the pagination headers it
+    set on response.
+    """
+    key = _cache_key(request)
+    entry = response_cache.get(key)
+    if entry is not None:
+        response_cache.hits += 1
+        return _respond(request, entry, "HIT")
+
+    response_cache.misses += 1
+    generation = response_cache.generation(namespace)
+    # Sparse selections are partial models that response_model would reject
+    sparse = fieldset is not None and fieldset.is_sparse
+    body = dumps(await build(), None if sparse else response_model)
+    headers = {name: response.headers[name] for name in _KEPT_HEADERS if name in response.headers}
+    entry = _Entry(body, _etag(body), headers, namespace, time.monotonic() + response_cache.ttl)
+    response_cache.put(key, entry, generation)
+    return _respond(request, entry, "MISS")
@@ -0,0 +1,84 @@
+from typing import Any, Dict, List, Optional, Tuple, get_args, get_origin
+import orjson
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+# Building a TypeAdapter compiles a serializer, so do it once per type
+_adapters: Dict[Any, TypeAdapter] = {}
+_includes: Dict[Any, Dict[str, Any]] = {}
+
+
+def adapter_for(tp: Any) -> TypeAdapter:
+    adapter = _adapters.get(tp)
+    if adapter is None:
+        adapter = _adapters[tp] = TypeAdapter(tp)
+    return adapter
+
+
+def _model_in(annotation: Any) -> Tuple[Optional[type], bool]:
+    """The pydantic model inside an annotation and whether it is a list of them"""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    for arg in get_args(annotation):
+        model, is_list = _model_in(arg)
+        if model is not None:
+            return model, is_list or get_origin(annotation) in (list, List)
+    return None, False
+
+
+def include_for(response_model: Any) -> Dict[str, Any]:
+    """
+    The columns, by their Prisma names, that a response schema exposes,
+    as an include mapping for model_dump. Nested schemas narrow relations.
+    """
+    model, _ = _model_in(response_model)
+    if model in _includes:
+        return _includes[model]
+    include: Dict[str, Any] = {}
+    for name, field in model.model_fields.items():
+        nested, is_list = _model_in(field.annotation)
+        value = include_for(nested) if nested is not None else True
+        include[field.alias or name] = {"__all__": value} if is_list else value
+    _includes[model] = include
+    return include
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(by_alias=True)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(data: Any, response_model: Any = None) -> bytes:
+    """
+    Encode rows straight from Prisma to JSON bytes in a single pass.
+    With a response_model, rows are dumped through a precompiled adapter of
+    their own Prisma type, keeping only the columns the schema exposes
+    (so e.g. password hashes never leave). The rows are trusted as they
+    come from the database and are not validated again.
+    Anything else, like sparse partial models, is encoded with orjson.
+    """
+    if response_model is None:
+        return orjson.dumps(data, default=_default)
+    is_list = isinstance(data, list)
+    sample = data[0] if is_list and data else data
+    if not isinstance(sample, BaseModel):
+        return orjson.dumps(data, default=_default)
+    row_type = type(sample)
+    include = include_for(response_model)
+    if is_list:
+        return adapter_for(List[row_type]).dump_json(data, include={"__all__": include})
+    return adapter_for(row_type).dump_json(data, include=include)
+
+
+def json_response(response: Response, data: Any, response_model: Any = None) -> Response:
+    """
+    Return data as a ready encoded response, keeping headers already set on
+    response. Returning a Response makes FastAPI skip its own response_model
+    pass, so the route's response_model only documents the schema.
+    """
+    headers = {
+        key: value for key, value in response.headers.items()
+        if key not in ("content-length", "content-type")
+    }
+    return Response(content=dumps(data, response_model), media_type="application/json", headers=headers)
@@ -0,0 +1,105 @@
+import copy
+import time
+from functools import wraps
+from typing import Any, Dict, Tuple
+from langchain_core.callbacks import adispatch_custom_event
+from src.config.settings import settings
+from src.utils.metrics import register_cache
+from src.utils.response_cache import response_cache
+
+# Results of read-only agent tools, per worker. Entries belong to the same
+# namespaces as the response cache, so the service writes that invalidate
+# cached API responses drop cached tool results too, whether the write came
+# from a REST route or from one of the agent's own tools, in this worker or,
+# through the response cache's sync, in another.
+
+TRACE_EVENT = "tool_cache"
+
+
+class ToolCache:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[Any, str, float]] = {}
+        self._generations: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def generation(self, namespace: str) -> int:
+        response_cache.sync(namespace)
+        return self._generations.get(namespace, 0)
+
+    def get(self, key: str) -> Tuple[bool, Any, float]:
+        """(found, value, age in seconds)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None, 0.0
+        response_cache.sync(entry[1])
+        if key not in self._entries:
+            return False, None, 0.0
+        value, _, stored = entry
+        age = time.monotonic() - stored
+        if age >= self.ttl:
+            del self._entries[key]
+            return False, None, 0.0
+        return True, value, age
+
+    def put(self, key: str, value: Any, namespace: str, generation: int) -> None:
+        # A write that ran while the tool was querying makes the result stale already
+        if generation == self.generation(namespace):
+            self._entries[key] = (value, namespace, time.monotonic())
+
+    def invalidate(self, namespace: str) -> None:
+        self._generations[namespace] = self.generation(namespace) + 1
+        for key in [k for k, (_, ns, _) in self._entries.items() if ns == namespace]:
+            del self._entries[key]
+        self.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+
+tool_cache = ToolCache(ttl=settings.AGENT_TOOL_CACHE_TTL_SECONDS)
+register_cache("agent_tools", tool_cache.stats)
+response_cache.on_invalidate(tool_cache.invalidate)
+
+
+async def _trace(tool: str, hit: bool, age: float) -> None:
+    """Report the lookup as a custom event of the current run (astream_events, LangSmith)"""
+    try:
+        await adispatch_custom_event(TRACE_EVENT, {"tool": tool, "hit": hit, "age_seconds": round(age, 3)})
+    except RuntimeError:
+        # Called outside an agent run, e.g. directly from a test or script
+        pass
+
+
+def cached_tool(namespace: str):
+    """Cache an async read tool's result by its arguments; goes below @tool"""
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = f"{func.__name__}:{args!r}:{sorted(kwargs.items())!r}"
+            found, value, age = tool_cache.get(key)
+            if found:
+                tool_cache.hits += 1
+                await _trace(func.__name__, True, age)
+                return copy.deepcopy(value)
+
+            tool_cache.misses += 1
+            await _trace(func.__name__, False, 0.0)
+            generation = tool_cache.generation(namespace)
+            value = await func(*args, **kwargs)
+            tool_cache.put(key, copy.deepcopy(value), namespace, generation)
+            return value
+        return wrapper
+    return decorator
@@ -0,0 +1,7 @@
+import os
+
+# Settings need a database URL to load. Only tests that need a database use it,
+# and they are skipped unless TEST_DATABASE_URL points at one they may write to
+os.environ.setdefault("DATABASE_URL", os.environ.get("TEST_DATABASE_URL", "postgresql://localhost:5432/test"))
+# Agents are built with the scripted model, no API key or network
+os.environ.setdefault("AGENT_LLM", "fake")
@@ -0,0 +1,77 @@
+import asyncio
+from types import SimpleNamespace
+from src.services.department_service import DepartmentService
+from src.utils.loaders import load, loader_scope
+
+
+class _Departments:
+    """The department table of a fake client, counting the finds that reach it"""
+
+    def __init__(self, rows):
+        self.rows = {row.id: row for row in rows}
+        self.finds = 0
+
+    async def find_many(self, where, include=None):
+        self.finds += 1
+        (column, condition), = where.items()
+        return [row for row in self.rows.values() if getattr(row, column) in condition["in"]]
+
+    async def update(self, where, data):
+        row = self.rows[where["id"]] = SimpleNamespace(**{**vars(self.rows[where["id"]]), **data})
+        return row
+
+    async def delete(self, where):
+        (column, value), = where.items()
+        row = next(row for row in self.rows.values() if getattr(row, column) == value)
+        return self.rows.pop(row.id)
+
+
+class _Update:
+    def __init__(self, **data):
+        self.data = data
+
+    def dict(self, exclude_unset=False):
+        return self.data
+
+
+def _service():
+    db = SimpleNamespace(department=_Departments([SimpleNamespace(id="d1", code="CSE", name="Computer Science")]))
+    return DepartmentService(db), db.department
+
+
+def test_reads_after_an_update_see_the_new_row():
+    async def run():
+        service, table = _service()
+        with loader_scope():
+            assert (await service.get_department("d1")).name == "Computer Science"
+            assert (await service.get_department_by_code("CSE")).name == "Computer Science"
+            await service.update_department("d1", _Update(name="Computing", code="CS"))
+            assert (await service.get_department("d1")).name == "Computing"
+            assert (await service.get_department_by_code("CS")).name == "Computing"
+            # The old code is not served from the memo either
+            assert await service.get_department_by_code("CSE") is None
+            return table.finds
+    # The reads by the new id and code are answered by the primed row
+    assert asyncio.run(run()) == 3
+
+
+def test_reads_after_a_delete_miss():
+    async def run():
+        service, _ = _service()
+        with loader_scope():
+            assert await service.get_department("d1") is not None
+            assert await service.get_department_by_code("CSE") is not None
+            await service.delete_department_by_code("CSE")
+            assert await service.get_department("d1") is None
+            assert await service.get_department_by_code("CSE") is None
+    asyncio.run(run())
+
+
+def test_loads_in_one_tick_share_a_query():
+    async def run():
+        service, table = _service()
+        with loader_scope():
+            rows = await asyncio.gather(*(load(service.db, "Department", "d1") for _ in range(5)))
+        return rows, table.finds
+    rows, finds = asyncio.run(run())
+    assert finds == 1 and all(row.code == "CSE" for row in rows)
@@ -0,0 +1,78 @@
+import os
+import uuid
+import pytest
+from types import SimpleNamespace
+from src.utils.query_stats import QueryStats, assert_max_queries, parse_server_timing
+
+
+def _response(header):
+    return SimpleNamespace(headers={"server-timing": header} if header is not None else {})
+
+
+def test_parse_server_timing_reads_back_the_db_metric():
+    stats = QueryStats()
+    stats.queries, stats.rows, stats.db_ms = 3, 42, 1.5
+    parsed = parse_server_timing(f"{stats.server_timing()}, app;dur=12.30")
+    assert (parsed.queries, parsed.rows, parsed.db_ms) == (3, 42, 1.5)
+
+
+@pytest.mark.parametrize("header", [None, "", "app;dur=1.00", 'db;desc="many queries";dur=1'])
+def test_parse_server_timing_without_a_db_metric_fails(header):
+    with pytest.raises(AssertionError):
+        parse_server_timing(header)
+
+
+def test_assert_max_queries():
+    response = _response('db;desc="4 queries, 10 rows";dur=2.00, app;dur=5.00')
+    assert assert_max_queries(response, 4).queries == 4
+    with pytest.raises(AssertionError, match="4 queries"):
+        assert_max_queries(response, 3)
+
+
+@pytest.mark.skipif(not os.environ.get("TEST_DATABASE_URL"), reason="needs TEST_DATABASE_URL")
+def test_subjects_details_query_count_does_not_grow_with_courses():
+    from fastapi.testclient import TestClient
+    from src.config.database import prisma
+    from src.main import app
+    from src.utils.jwt import create_access_token
+
+    tag = uuid.uuid4().hex[:8]
+
+    async def seed():
+        user = await prisma.user.create(data={
+            "email": f"qs-{tag}@example.com", "password": "x", "role": "TEACHER", "name": "Query Stats"
+        })
+        teacher = await prisma.teacher.create(data={
+            "userId": user.id, "teacherId": f"QS{tag}", "department": "CSE", "designation": "Lecturer"
+        })
+        department = await prisma.department.create(data={"code": f"QS{tag}", "name": "Query Stats"})
+        for i in range(5):
+            course = await prisma.course.create(data={
+                "courseCode": f"QS{tag}{i}", "courseName": f"Course {i}", "credits": 3, "semester": 1,
+                "departmentId": department.id, "teacherId": teacher.id
+            })
+            await prisma.schedule.create(data={
+                "courseId": course.id, "teacherId": teacher.id, "dayOfWeek": "MONDAY",
+                "startTime": "09:00", "endTime": "10:00", "room": f"R{i}"
+            })
+        return user, department
+
+    async def cleanup(user, department):
+        await prisma.course.delete_many(where={"departmentId": department.id})
+        await prisma.department.delete(where={"id": department.id})
+        # Takes the teacher and its schedules with it
+        await prisma.user.delete(where={"id": user.id})
+
+    with TestClient(app) as client:
+        user, department = client.portal.call(seed)
+        try:
+            response = client.get(
+                "/api/schedules/subjects-details",
+                headers={"Authorization": f"Bearer {create_access_token({'sub': user.id})}"}
+            )
+            assert response.status_code == 200
+            assert response.json()[f"QS{tag}0"]["roomCodes"] == ["R0"]
+            # The current user, the courses with their teachers, and every course's schedules
+            assert_max_queries(response, 3)
+        finally:
+            client.portal.call(cleanup, user, department)
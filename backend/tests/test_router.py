@@ -0,0 +1,42 @@
+import pytest
+from src.agents.router import classify
+
+ROLES = ["ADMIN", "STUDENT", "TEACHER", None]
+
+
+def _intent(query, role):
+    matched = classify(query, role)
+    return matched[0].name if matched else None
+
+
+@pytest.mark.parametrize("role", ROLES)
+@pytest.mark.parametrize("query", [
+    "show me all courses",
+    "list courses",
+    "which courses are there",
+    "list all courses",
+])
+def test_course_lists_are_not_answered_with_my_courses(query, role):
+    assert _intent(query, role) is None
+
+
+@pytest.mark.parametrize("query, role, expected", [
+    ("show my courses", "STUDENT", "my_courses"),
+    ("show my courses", "TEACHER", "my_courses"),
+    ("show my courses", "ADMIN", None),
+    ("show my courses", None, None),
+    ("which courses am I enrolled in", "STUDENT", "my_courses"),
+    ("which courses am I enrolled in", "TEACHER", None),
+    ("which courses am I enrolled in", "ADMIN", None),
+    ("what courses do I teach", "TEACHER", "my_courses"),
+    ("what courses do I teach", "STUDENT", None),
+    ("what courses do I teach", "ADMIN", None),
+    ("what courses do I teach", None, None),
+])
+def test_my_courses_needs_the_user_as_subject(query, role, expected):
+    assert _intent(query, role) == expected
+
+
+@pytest.mark.parametrize("role", ROLES)
+def test_course_count_is_not_my_courses(role):
+    assert _intent("how many courses are there", role) == "count_courses"